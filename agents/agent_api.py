@@ -1,31 +1,47 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Literal
 
 from dotenv import load_dotenv
 
-from agents.chatbot.agent import AgentChatbot
-from agents.chatbot.llms.google import GoogleLLM
-from agents.chatbot.llms.prompts.prompts import (
-    get_detector_prompt,
-    get_detector_prompt_as_str,
-)
-from agents.chatbot.plain_chatbot import PlainChatbot
-from agents.chatbot.tools import get_tools
+from agents.cache.single_flight import SingleFlight
+from agents.cache.verdict_cache import chatbot_fingerprint, normalize_claim
+from agents.chatbot.chatbot_pool import ChatbotPool
+from agents.chatbot.llms.priority import Priority, PriorityGate, priority_class
+from agents.chatbot.session_manager import SessionManager
 from agents.logger.logger import get_logger
-from agents.models.detector_model import DetectorModel
+from agents.models.detector_model import DetectorModel, ScoredDetectorModel
+from agents.settings import get_settings
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import (
+        AsyncGenerator,
+        AsyncIterable,
+        Generator,
+        Iterable,
+    )
 
     from langchain_core.language_models import BaseChatModel
     from pydantic import BaseModel
 
+    from agents.cache.cache_interface import VerdictCacheInterface
+    from agents.chatbot.cassette import Cassette
     from agents.chatbot.chatbot_interface import ChatbotInterface
+    from agents.chatbot.streaming import VerdictEvent
 
 load_dotenv(override=True)
 
 logger = get_logger()
+settings = get_settings()
+chatbot_pool = ChatbotPool(max_size=settings.chatbot_pool_size)
+single_flight = SingleFlight()
+session_manager = SessionManager()
+priority_gate = PriorityGate()
 
 MODEL_MAP = {
     "Gemini 2.5 Flash": ("google", "gemini-2.5-flash"),
@@ -33,36 +49,109 @@ MODEL_MAP = {
 }
 
 
+@dataclass
+class VerificationResult:
+    """Outcome of verifying a single claim in a bulk run."""
+
+    index: int
+    claim: str
+    response: str | BaseModel | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the claim was verified without an error."""
+        return self.error is None
+
+
 def create_chatbot(
-    chatbot_type: Literal["agent", "plain"],
+    chatbot_type: Literal["agent", "plain", "cascade"],
     model_name: str,
     schema: type[BaseModel] | None = DetectorModel,
     vectorstore_collection_name: str | None = None,
     selected_tools: list[str] | None = None,
+    *,
+    stateless: bool = False,
+    hedge: bool = False,
+    cassette: Cassette | None = None,
 ) -> ChatbotInterface:
     """Create and return a Chatbot instance.
 
+    A "cascade" chatbot answers with a plain chatbot on
+    ``Settings.cascade_model`` first and escalates to an agent on
+    ``model_name`` only when the verdict is unclear or of low confidence.
+
     Args:
-        chatbot_type: The type of chatbot ("agent" or "plain").
+        chatbot_type: The type of chatbot ("agent", "plain" or "cascade").
         model_name: The model name (e.g., "Claude Sonnet 3.7",
             "Gemini 2.5 Flash").
         schema: Optional Pydantic schema for structured output.
             Defaults to DetectorModel. If None, no schema is used.
         vectorstore_collection_name: Name of vectorstore collection
-            (required for agent).
+            (required for agent and cascade).
         selected_tools: List of tool names to include (only for agent
-            chatbot).
+            and cascade chatbots).
+        stateless: Answer every claim from a fresh state instead of one
+            growing conversation. Use it for batch verification of
+            independent claims.
+        hedge: Resend slow or failing model calls to a backup model, see
+            ``HedgedChatModel``.
+        cassette: Record the model and tool calls to a cassette, or replay
+            them from it without network access.
 
     Returns:
         ChatbotInterface: An instance of the chatbot class configured
             with the specified model.
 
     """
-    model = _get_model(model_name)
+    # Chatbots and tools pull in LangGraph, Chroma and arXiv, so they are
+    # imported here rather than at module level.
+    from agents.chatbot.llms.prompts.prompts import (
+        get_detector_prompt,
+        get_detector_prompt_as_str,
+    )
+
+    if chatbot_type == "cascade":
+        from agents.chatbot.cascade import CascadeChatbot
+        from agents.chatbot.plain_chatbot import PlainChatbot
+
+        if schema is None:
+            msg = "schema must be provided for cascade chatbot"
+            logger.error(msg)
+            raise ValueError(msg)
+        logger.info(
+            f"Creating cascade chatbot from {settings.cascade_model} "
+            f"to {model_name}",
+        )
+        cheap = PlainChatbot(
+            model=_get_model(
+                settings.cascade_model, hedge=hedge, cassette=cassette,
+            ),
+            prompt=get_detector_prompt(),
+            schema=ScoredDetectorModel,
+            stateless=stateless,
+        )
+        strong = create_chatbot(
+            "agent",
+            model_name,
+            schema=schema,
+            vectorstore_collection_name=vectorstore_collection_name,
+            selected_tools=selected_tools,
+            stateless=stateless,
+            hedge=hedge,
+            cassette=cassette,
+        )
+        return CascadeChatbot(cheap=cheap, strong=strong)
+    model = _get_model(model_name, hedge=hedge, cassette=cassette)
     if chatbot_type == "plain":
+        from agents.chatbot.plain_chatbot import PlainChatbot
+
         logger.info(f"Creating plain chatbot with model: {model_name}")
         return PlainChatbot(
-            model=model, prompt=get_detector_prompt(), schema=schema,
+            model=model,
+            prompt=get_detector_prompt(),
+            schema=schema,
+            stateless=stateless,
         )
     if chatbot_type == "agent":
         if vectorstore_collection_name is None:
@@ -72,24 +161,103 @@ def create_chatbot(
             )
             logger.error(msg)
             raise ValueError(msg)
+        from agents.chatbot.agent import AgentChatbot
+        from agents.chatbot.tools import get_tools
+
         logger.info(f"Creating agent chatbot with model: {model_name}")
         tools = get_tools(selected_tools)
+        if cassette is not None:
+            tools = cassette.wrap_tools(tools)
         return AgentChatbot(
             model=model,
             prompt=get_detector_prompt_as_str(),
             schema=schema,
             tools=tools,
+            stateless=stateless,
         )
     msg = f"Unknown chatbot type: {chatbot_type}"
     logger.error(msg)
     raise ValueError(msg)
 
 
-def _get_model(model_name: str) -> BaseChatModel:
+def get_pooled_chatbot(
+    chatbot_type: Literal["agent", "plain", "cascade"],
+    model_name: str,
+    schema: type[BaseModel] | None = DetectorModel,
+    vectorstore_collection_name: str | None = None,
+    selected_tools: list[str] | None = None,
+    thread_id: str | None = None,
+    *,
+    hedge: bool = False,
+) -> ChatbotInterface:
+    """Get a warm chatbot from the pool, bound to its own conversation.
+
+    The chatbot is built with ``create_chatbot`` the first time a
+    configuration is requested. Later requests reuse its model client,
+    tools and compiled graph and only get a new conversation id. The
+    conversation is tracked by the session manager, which deletes its
+    history once it is idle for longer than ``Settings.session_ttl``.
+
+    Args:
+        chatbot_type: The type of chatbot ("agent", "plain" or "cascade").
+        model_name: The model name (e.g., "Gemini 2.5 Flash").
+        schema: Optional Pydantic schema for structured output.
+        vectorstore_collection_name: Name of vectorstore collection
+            (required for agent).
+        selected_tools: List of tool names to include (only for agent
+            chatbot).
+        thread_id: Id of the conversation. Defaults to a new UUID.
+        hedge: Resend slow or failing model calls to a backup model.
+
+    Returns:
+        ChatbotInterface: A chatbot bound to the conversation.
+
+    """
+    key = (
+        chatbot_type,
+        model_name,
+        schema.__qualname__ if schema is not None else None,
+        vectorstore_collection_name,
+        tuple(selected_tools) if selected_tools is not None else None,
+        _prompt_hash(),
+        hedge,
+    )
+    chatbot = chatbot_pool.acquire(
+        key,
+        lambda: create_chatbot(
+            chatbot_type,
+            model_name,
+            schema=schema,
+            vectorstore_collection_name=vectorstore_collection_name,
+            selected_tools=selected_tools,
+            hedge=hedge,
+        ),
+        id_=thread_id,
+    )
+    return session_manager.open(chatbot, chatbot.id)
+
+
+def _prompt_hash() -> str:
+    from agents.chatbot.llms.prompts.prompts import get_detector_prompt_as_str
+
+    prompt = get_detector_prompt_as_str()
+    return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+
+def _get_model(
+    model_name: str,
+    *,
+    hedge: bool = False,
+    cassette: Cassette | None = None,
+) -> BaseChatModel:
     """Get the language model based on the model name.
 
     Args:
         model_name: The model name (e.g., "Claude Sonnet 3.7", "Gemini 2.5 Flash").
+        hedge: Wrap the model in a ``HedgedChatModel`` whose backup is
+            ``Settings.hedge_models[model_name]``, or the model itself.
+        cassette: Route the model's calls through a cassette. In replay
+            mode no provider client is created.
 
     Raises:
         ValueError: If the model name is unknown.
@@ -102,32 +270,79 @@ def _get_model(model_name: str) -> BaseChatModel:
         msg = f"Unknown model: {model_name}"
         raise ValueError(msg)
 
+    if cassette is not None:
+        live = (
+            None if cassette.mode == "replay"
+            else _get_model(model_name, hedge=hedge)
+        )
+        return cassette.wrap_model(live, model_name=model_name)
+
+    if hedge:
+        from agents.chatbot.llms.hedging import HedgedChatModel
+
+        backup_name = settings.hedge_models.get(model_name)
+        return HedgedChatModel(
+            primary=_get_model(model_name),
+            secondary=_get_model(backup_name) if backup_name else None,
+        )
+
     provider, model_id = MODEL_MAP[model_name]
 
     if provider == "google":
+        from agents.chatbot.llms.google import GoogleLLM
+
         return GoogleLLM.get_chat_model(model_id)
 
     msg = f"Unknown provider: {provider}"
     raise ValueError(msg)
 
 
-def get_response(chatbot: ChatbotInterface, user_input: str) -> str | BaseModel:
+def get_response(
+    chatbot: ChatbotInterface,
+    user_input: str,
+    cache: VerdictCacheInterface | None = None,
+    *,
+    coalesce: bool = False,
+) -> str | BaseModel:
     """Get a response from the chatbot for the given user input.
 
     Args:
         chatbot (PlainChatbot): The PlainChatbot instance to use for
             generating the response.
         user_input (str): The input message from the user.
+        cache (VerdictCacheInterface | None): Optional cache of earlier
+            verdicts. On a hit the chatbot is not called.
+        coalesce (bool): Share one execution between concurrent
+            identical requests to the same chatbot configuration.
 
     Returns:
         str: The content of the chatbot's response.
 
     """
-    return chatbot.chat(user_input)
+    if cache is not None:
+        cached = cache.get(chatbot, user_input)
+        if cached is not None:
+            logger.info(f"Verdict cache hit for input: {user_input}")
+            return cached
+
+    def respond() -> str | BaseModel:
+        with priority_gate.slot():
+            response = chatbot.chat(user_input)
+        session_manager.touch(chatbot.id)
+        if cache is not None and response:
+            cache.put(chatbot, user_input, response)
+        return response
+
+    if coalesce:
+        return single_flight.do(_coalescing_key(chatbot, user_input), respond)
+    return respond()
 
 
 def stream_response(
-    chatbot: ChatbotInterface, user_input: str,
+    chatbot: ChatbotInterface,
+    user_input: str,
+    *,
+    coalesce: bool = False,
 ) -> Generator[str, None, None]:
     """Stream the response from the chatbot word by word.
 
@@ -135,9 +350,320 @@ def stream_response(
         chatbot (PlainChatbot): The PlainChatbot instance to use for
             generating the response.
         user_input (str): The input message from the user.
+        coalesce (bool): Share one stream between concurrent identical
+            requests to the same chatbot configuration. Late subscribers
+            receive all chunks from the beginning.
+
+    Yields:
+        str: The next word in the chatbot's response.
+
+    """
+    with priority_gate.slot():
+        if coalesce:
+            yield from single_flight.stream(
+                ("stream", *_coalescing_key(chatbot, user_input)),
+                lambda: chatbot.stream_chat(user_input),
+            )
+        else:
+            yield from chatbot.stream_chat(user_input)
+    session_manager.touch(chatbot.id)
+
+
+def stream_verdict(
+    chatbot: ChatbotInterface, user_input: str,
+) -> Generator[VerdictEvent, None, None]:
+    """Stream the chatbot's structured verdict field by field.
+
+    The label is emitted as soon as the model decides it, before the
+    explanation is generated.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot instance to use for
+            generating the verdict.
+        user_input (str): The input message from the user.
+
+    Yields:
+        VerdictEvent: The label, then increments of the explanation.
+
+    """
+    with priority_gate.slot():
+        yield from chatbot.stream_verdict(user_input)
+    session_manager.touch(chatbot.id)
+
+
+async def aget_response(
+    chatbot: ChatbotInterface,
+    user_input: str,
+    cache: VerdictCacheInterface | None = None,
+    *,
+    coalesce: bool = False,
+) -> str | BaseModel:
+    """Asynchronously get a response from the chatbot for the given input.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot instance to use for
+            generating the response.
+        user_input (str): The input message from the user.
+        cache (VerdictCacheInterface | None): Optional cache of earlier
+            verdicts. On a hit the chatbot is not called.
+        coalesce (bool): Share one execution between concurrent
+            identical requests to the same chatbot configuration.
+
+    Returns:
+        str: The content of the chatbot's response.
+
+    """
+    if cache is not None:
+        cached = cache.get(chatbot, user_input)
+        if cached is not None:
+            logger.info(f"Verdict cache hit for input: {user_input}")
+            return cached
+
+    async def respond() -> str | BaseModel:
+        async with priority_gate.aslot():
+            response = await chatbot.achat(user_input)
+        session_manager.touch(chatbot.id)
+        if cache is not None and response:
+            cache.put(chatbot, user_input, response)
+        return response
+
+    if coalesce:
+        return await single_flight.ado(
+            _coalescing_key(chatbot, user_input), respond,
+        )
+    return await respond()
+
+
+async def astream_response(
+    chatbot: ChatbotInterface,
+    user_input: str,
+    *,
+    coalesce: bool = False,
+) -> AsyncGenerator[str, None]:
+    """Asynchronously stream the response from the chatbot word by word.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot instance to use for
+            generating the response.
+        user_input (str): The input message from the user.
+        coalesce (bool): Share one stream between concurrent identical
+            requests to the same chatbot configuration. Late subscribers
+            receive all chunks from the beginning.
 
     Yields:
         str: The next word in the chatbot's response.
 
     """
-    yield from chatbot.stream_chat(user_input)
+    if coalesce:
+        stream = single_flight.astream(
+            ("stream", *_coalescing_key(chatbot, user_input)),
+            lambda: chatbot.astream_chat(user_input),
+        )
+    else:
+        stream = chatbot.astream_chat(user_input)
+    async with priority_gate.aslot():
+        async for chunk in stream:
+            yield chunk
+    session_manager.touch(chatbot.id)
+
+
+async def astream_verdict(
+    chatbot: ChatbotInterface, user_input: str,
+) -> AsyncGenerator[VerdictEvent, None]:
+    """Asynchronously stream the chatbot's structured verdict field by field.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot instance to use for
+            generating the verdict.
+        user_input (str): The input message from the user.
+
+    Yields:
+        VerdictEvent: The label, then increments of the explanation.
+
+    """
+    async with priority_gate.aslot():
+        async for event in chatbot.astream_verdict(user_input):
+            yield event
+    session_manager.touch(chatbot.id)
+
+
+def get_responses(
+    chatbot: ChatbotInterface,
+    claims: Iterable[str],
+    max_concurrency: int | None = None,
+    *,
+    ordered: bool = True,
+    cache: VerdictCacheInterface | None = None,
+    priority: Priority = Priority.BULK,
+) -> Generator[VerificationResult, None, None]:
+    """Verify many claims concurrently with a bounded number of workers.
+
+    Claims are pulled from the iterable lazily, so at most
+    ``max_concurrency`` of them are in flight at any time. A failing claim
+    does not abort the run; its exception is captured in the result.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot instance shared by all
+            workers. It must be safe to call concurrently.
+        claims (Iterable[str]): The claims to verify.
+        max_concurrency (int | None): Maximum number of claims verified
+            at once. Defaults to ``Settings.max_concurrency``.
+        ordered (bool): Yield results in input order if True, otherwise
+            as soon as they complete.
+        cache (VerdictCacheInterface | None): Optional cache of earlier verdicts.
+        priority (Priority): Priority class of the LLM calls. Bulk runs
+            yield to interactive and API traffic by default.
+
+    Yields:
+        VerificationResult: The outcome of each claim.
+
+    """
+    max_concurrency = _resolve_max_concurrency(max_concurrency)
+    indexed_claims = enumerate(claims)
+    pending: deque[Future[VerificationResult]] = deque()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+        def submit_next() -> None:
+            item = next(indexed_claims, None)
+            if item is not None:
+                pending.append(
+                    executor.submit(_verify, chatbot, *item, cache, priority),
+                )
+
+        for _ in range(max_concurrency):
+            submit_next()
+
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(iter(done))
+                pending.remove(future)
+            submit_next()
+            yield future.result()
+
+
+async def aget_responses(
+    chatbot: ChatbotInterface,
+    claims: Iterable[str] | AsyncIterable[str],
+    max_concurrency: int | None = None,
+    *,
+    ordered: bool = True,
+    cache: VerdictCacheInterface | None = None,
+    priority: Priority = Priority.BULK,
+) -> AsyncGenerator[VerificationResult, None]:
+    """Asynchronously verify many claims with bounded concurrency.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot instance shared by all
+            tasks.
+        claims (Iterable[str] | AsyncIterable[str]): The claims to verify.
+        max_concurrency (int | None): Maximum number of claims verified
+            at once. Defaults to ``Settings.max_concurrency``.
+        ordered (bool): Yield results in input order if True, otherwise
+            as soon as they complete.
+        cache (VerdictCacheInterface | None): Optional cache of earlier verdicts.
+        priority (Priority): Priority class of the LLM calls. Bulk runs
+            yield to interactive and API traffic by default.
+
+    Yields:
+        VerificationResult: The outcome of each claim.
+
+    """
+    max_concurrency = _resolve_max_concurrency(max_concurrency)
+    indexed_claims = _aenumerate(claims)
+    pending: deque[asyncio.Task[VerificationResult]] = deque()
+
+    async def submit_next() -> None:
+        item = await anext(indexed_claims, None)
+        if item is not None:
+            pending.append(
+                asyncio.create_task(_averify(chatbot, *item, cache, priority)),
+            )
+
+    try:
+        for _ in range(max_concurrency):
+            await submit_next()
+
+        while pending:
+            if ordered:
+                task = pending.popleft()
+                await asyncio.wait([task])
+            else:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED,
+                )
+                task = next(iter(done))
+                pending.remove(task)
+            await submit_next()
+            yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _coalescing_key(
+    chatbot: ChatbotInterface, user_input: str,
+) -> tuple[str, ...]:
+    key = (chatbot_fingerprint(chatbot), normalize_claim(user_input))
+    if chatbot.checkpoint_threads():
+        # Stateful chatbots answer from their own conversation history.
+        return (*key, chatbot.id)
+    return key
+
+
+def _resolve_max_concurrency(max_concurrency: int | None) -> int:
+    if max_concurrency is None:
+        return settings.max_concurrency
+    if max_concurrency < 1:
+        msg = "max_concurrency must be at least 1"
+        raise ValueError(msg)
+    return max_concurrency
+
+
+def _verify(
+    chatbot: ChatbotInterface,
+    index: int,
+    claim: str,
+    cache: VerdictCacheInterface | None,
+    priority: Priority,
+) -> VerificationResult:
+    try:
+        with priority_class(priority):
+            response = get_response(chatbot, claim, cache)
+    except Exception as e:
+        logger.exception(f"Error verifying claim {index}")
+        return VerificationResult(index=index, claim=claim, error=e)
+    return VerificationResult(index=index, claim=claim, response=response)
+
+
+async def _averify(
+    chatbot: ChatbotInterface,
+    index: int,
+    claim: str,
+    cache: VerdictCacheInterface | None,
+    priority: Priority,
+) -> VerificationResult:
+    try:
+        with priority_class(priority):
+            response = await aget_response(chatbot, claim, cache)
+    except Exception as e:
+        logger.exception(f"Error verifying claim {index}")
+        return VerificationResult(index=index, claim=claim, error=e)
+    return VerificationResult(index=index, claim=claim, response=response)
+
+
+async def _aenumerate(
+    claims: Iterable[str] | AsyncIterable[str],
+) -> AsyncGenerator[tuple[int, str], None]:
+    index = 0
+    if hasattr(claims, "__aiter__"):
+        async for claim in claims:
+            yield index, claim
+            index += 1
+    else:
+        for claim in claims:
+            yield index, claim
+            index += 1
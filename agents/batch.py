@@ -0,0 +1,317 @@
+import argparse
+import json
+from collections.abc import Generator, Iterable
+from pathlib import Path
+
+from langchain_core.messages import BaseMessage
+
+from agents.agent_api import create_chatbot, get_responses
+from agents.cache.cache_interface import VerdictCacheInterface
+from agents.cache.verdict_cache import VerdictCache
+from agents.chatbot.cassette import Cassette
+from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.logger.logger import get_logger
+from agents.models.detector_model import DetectorModel
+from agents.settings import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+
+def read_claims(
+    input_path: str | Path,
+    id_field: str = "id",
+    claim_field: str = "claim",
+    skip_ids: set[str] | None = None,
+) -> Generator[tuple[str, str], None, None]:
+    """Stream (id, claim) pairs from a JSONL file one line at a time.
+
+    Args:
+        input_path (str | Path): Path to the JSONL file with claims.
+        id_field (str): Name of the field holding the claim id.
+        claim_field (str): Name of the field holding the claim text.
+        skip_ids (set[str] | None): Ids that should not be yielded.
+
+    Yields:
+        tuple[str, str]: The claim id and the claim text.
+
+    """
+    skip_ids = skip_ids or set()
+    with Path(input_path).open(encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                claim_id = str(record[id_field])
+                claim = record[claim_field]
+            except (json.JSONDecodeError, KeyError):
+                logger.exception(f"Skipping malformed input line {line_number}")
+                continue
+            if claim_id in skip_ids:
+                continue
+            yield claim_id, claim
+
+
+def read_done_ids(output_path: str | Path, id_field: str = "id") -> set[str]:
+    """Collect the ids already written to the output file.
+
+    Args:
+        output_path (str | Path): Path to the JSONL file with verdicts.
+        id_field (str): Name of the field holding the claim id.
+
+    Returns:
+        set[str]: Ids of the claims that already have a verdict.
+
+    """
+    done_ids: set[str] = set()
+    output_path = Path(output_path)
+    if not output_path.exists():
+        return done_ids
+    with output_path.open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                done_ids.add(str(json.loads(line)[id_field]))
+            except (json.JSONDecodeError, KeyError):
+                # A torn last line after a crash; the claim is redone.
+                continue
+    return done_ids
+
+
+def truncate_torn_tail(output_path: str | Path, chunk_size: int = 64 * 1024) -> int:
+    """Cut a partially written last line off the output file.
+
+    A crash while writing a verdict leaves a line without its newline.
+    Appending after it would merge the next verdict into the torn line, so
+    the file is truncated back to the end of its last complete line.
+
+    Args:
+        output_path (str | Path): Path to the JSONL file with verdicts.
+        chunk_size (int): Number of bytes read at a time from the end.
+
+    Returns:
+        int: The number of bytes removed.
+
+    """
+    output_path = Path(output_path)
+    if not output_path.exists():
+        return 0
+    with output_path.open("rb+") as file:
+        size = file.seek(0, 2)
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            file.seek(start)
+            newline = file.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            file.truncate(end)
+            logger.warning(f"Removed {size - end} bytes of a torn last line")
+    return size - end
+
+
+def run_batch(
+    chatbot: ChatbotInterface,
+    input_path: str | Path,
+    output_path: str | Path,
+    max_concurrency: int | None = None,
+    id_field: str = "id",
+    claim_field: str = "claim",
+    cache: VerdictCacheInterface | None = None,
+) -> dict:
+    """Verify all claims from the input file and append verdicts to output.
+
+    Claims are streamed from disk and verified concurrently, and each
+    verdict is flushed as soon as it completes. Claims whose ids are
+    already present in the output file are skipped, so an interrupted run
+    can be restarted with the same arguments. A torn last line left by a
+    crash is removed first. Failed claims are logged and not written, so
+    they are retried on the next run. The chatbot must be stateless, so
+    that claims neither share a history nor make it grow.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot used for verification.
+        input_path (str | Path): Path to the JSONL file with claims.
+        output_path (str | Path): Path to the JSONL file with verdicts.
+        max_concurrency (int | None): Maximum number of claims verified
+            at once.
+        id_field (str): Name of the field holding the claim id.
+        claim_field (str): Name of the field holding the claim text.
+        cache (VerdictCacheInterface | None): Optional cache of earlier verdicts.
+
+    Returns:
+        dict: Counts of "skipped", "verified" and "failed" claims.
+
+    Raises:
+        ValueError: If the chatbot keeps a conversation history.
+
+    """
+    if chatbot.checkpoint_threads():
+        msg = (
+            "run_batch needs a stateless chatbot, "
+            "create it with create_chatbot(..., stateless=True)"
+        )
+        raise ValueError(msg)
+    truncate_torn_tail(output_path)
+    done_ids = read_done_ids(output_path, id_field)
+    logger.info(f"Resuming batch, {len(done_ids)} claims already verified")
+    in_flight_ids: dict[int, str] = {}
+
+    def claims() -> Iterable[str]:
+        pairs = read_claims(input_path, id_field, claim_field, done_ids)
+        for index, (claim_id, claim) in enumerate(pairs):
+            in_flight_ids[index] = claim_id
+            yield claim
+
+    stats = {"skipped": len(done_ids), "verified": 0, "failed": 0}
+    with Path(output_path).open("a", encoding="utf-8") as output:
+        for result in get_responses(
+            chatbot, claims(), max_concurrency, ordered=False, cache=cache,
+        ):
+            claim_id = in_flight_ids.pop(result.index)
+            if not result.ok:
+                logger.error(f"Claim {claim_id} failed: {result.error}")
+                stats["failed"] += 1
+                continue
+            try:
+                verdict = _to_verdict(result.response)
+            except ValueError:
+                logger.exception(f"Claim {claim_id} returned invalid verdict")
+                stats["failed"] += 1
+                continue
+            record = {id_field: claim_id, **verdict.model_dump()}
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            stats["verified"] += 1
+
+    logger.info(f"Batch finished: {stats}")
+    return stats
+
+
+def _to_verdict(response: str | BaseMessage | DetectorModel) -> DetectorModel:
+    if isinstance(response, DetectorModel):
+        return response
+    if isinstance(response, BaseMessage):
+        response = response.content
+    if not isinstance(response, str):
+        msg = f"Unsupported response type: {type(response).__name__}"
+        raise ValueError(msg)  # noqa: TRY004
+    return DetectorModel.model_validate_json(response)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Verify claims from a JSONL file and append verdicts.",
+    )
+
+    parser.add_argument(
+        "--input",
+        type=str,
+        required=True,
+        help="Path to the JSONL file with claims.",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="Path to the JSONL file the verdicts are appended to.",
+    )
+
+    parser.add_argument(
+        "--chatbot",
+        type=str,
+        choices=["agent", "plain", "cascade"],
+        default="agent",
+        help="Type of chatbot used for verification.",
+    )
+
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="Gemini 2.5 Flash",
+        help="Name of the language model.",
+    )
+
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of claims verified at once.",
+    )
+
+    parser.add_argument(
+        "--collection_name",
+        type=str,
+        default="mmcovid",
+        help="Name of the vectorstore collection (agent chatbot only).",
+    )
+
+    parser.add_argument(
+        "--id_field",
+        type=str,
+        default="id",
+        help="Name of the field holding the claim id.",
+    )
+
+    parser.add_argument(
+        "--claim_field",
+        type=str,
+        default="claim",
+        help="Name of the field holding the claim text.",
+    )
+
+    parser.add_argument(
+        "--cache_path",
+        type=str,
+        nargs="?",
+        default=None,
+        const=settings.verdict_cache_path,
+        help=(
+            "Path to the SQLite verdict cache. Uses the configured "
+            "verdict_cache_path if given without a value. Disabled if not given."
+        ),
+    )
+
+    parser.add_argument(
+        "--cassette",
+        type=str,
+        default=None,
+        help="Path to a cassette of model and tool calls. Disabled if not given.",
+    )
+
+    parser.add_argument(
+        "--cassette_mode",
+        type=str,
+        choices=["record", "replay", "auto"],
+        default="auto",
+        help="Record calls, replay them offline, or record only the missing ones.",
+    )
+    args = parser.parse_args()
+
+    cassette = (
+        Cassette(args.cassette, mode=args.cassette_mode) if args.cassette else None
+    )
+    chatbot = create_chatbot(
+        args.chatbot,
+        args.model,
+        vectorstore_collection_name=args.collection_name,
+        stateless=True,
+        cassette=cassette,
+    )
+    try:
+        run_batch(
+            chatbot,
+            args.input,
+            args.output,
+            max_concurrency=args.max_concurrency,
+            id_field=args.id_field,
+            claim_field=args.claim_field,
+            cache=VerdictCache(db_path=args.cache_path) if args.cache_path else None,
+        )
+    finally:
+        if cassette is not None:
+            cassette.save()
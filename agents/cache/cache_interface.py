@@ -0,0 +1,101 @@
+import json
+from abc import ABC, abstractmethod
+
+from langchain_core.messages import AIMessage, BaseMessage
+from pydantic import BaseModel
+
+from agents.chatbot.chatbot_interface import ChatbotInterface
+
+
+class VerdictCacheInterface(ABC):
+    """An abstract base class for caches of chatbot verdicts."""
+
+    @abstractmethod
+    def get(
+        self, chatbot: ChatbotInterface, claim: str,
+    ) -> str | BaseMessage | BaseModel | None:
+        """Get the cached verdict of a chatbot for a claim.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot that would answer.
+            claim (str): The claim text.
+
+        Raises:
+            NotImplementedError: When the function is not implemented in the child.
+
+        Returns:
+            str | BaseMessage | BaseModel | None: The cached verdict, or
+            None on a miss.
+
+        """
+        msg = "get method not implemented."
+        raise NotImplementedError(msg)
+
+    @abstractmethod
+    def put(
+        self,
+        chatbot: ChatbotInterface,
+        claim: str,
+        response: str | BaseMessage | BaseModel,
+    ) -> None:
+        """Store the verdict of a chatbot for a claim.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot that answered.
+            claim (str): The claim text.
+            response (str | BaseMessage | BaseModel): The verdict.
+
+        Raises:
+            NotImplementedError: When the function is not implemented in the child.
+
+        """
+        msg = "put method not implemented."
+        raise NotImplementedError(msg)
+
+    @abstractmethod
+    def invalidate(self, chatbot: ChatbotInterface | None = None) -> None:
+        """Drop cached verdicts.
+
+        Args:
+            chatbot (ChatbotInterface | None): Drop only the verdicts of
+                this chatbot configuration. If None, drop everything.
+
+        Raises:
+            NotImplementedError: When the function is not implemented in the child.
+
+        """
+        msg = "invalidate method not implemented."
+        raise NotImplementedError(msg)
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Get cache usage statistics.
+
+        Raises:
+            NotImplementedError: When the function is not implemented in the child.
+
+        Returns:
+            dict: Cache counters, including the "hit_rate".
+
+        """
+        msg = "stats method not implemented."
+        raise NotImplementedError(msg)
+
+    @staticmethod
+    def _serialize(response: str | BaseMessage | BaseModel) -> str:
+        if isinstance(response, BaseModel) and not isinstance(response, BaseMessage):
+            return json.dumps({"kind": "model", "data": response.model_dump()})
+        if isinstance(response, BaseMessage):
+            return json.dumps({"kind": "message", "data": response.content})
+        return json.dumps({"kind": "text", "data": response})
+
+    @staticmethod
+    def _deserialize(
+        chatbot: ChatbotInterface, payload: str,
+    ) -> str | BaseMessage | BaseModel:
+        entry = json.loads(payload)
+        if entry["kind"] == "model":
+            return chatbot.schema.model_validate(entry["data"])
+        if entry["kind"] == "message":
+            return AIMessage(content=entry["data"])
+        return entry["data"]
@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from agents.cache.cache_interface import VerdictCacheInterface
+from agents.cache.verdict_cache import chatbot_fingerprint, normalize_claim
+from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+RECENT_VECTORS_SIZE = 256
+
+
+@dataclass
+class _Partition:
+    """Verified claims of a single chatbot configuration.
+
+    The vectors live in a ring buffer: rows are written in place and, once
+    the partition is full, the oldest row is overwritten. The buffer grows
+    by doubling until it holds ``max_size`` rows, so a put never copies
+    all stored vectors.
+    """
+
+    max_size: int
+    claims: list[str] = field(default_factory=list)
+    payloads: list[str] = field(default_factory=list)
+    expires_at: np.ndarray = field(default_factory=lambda: np.empty(0))
+    matrix: np.ndarray | None = None
+    size: int = 0
+    oldest: int = 0
+    resizes: int = 0
+
+    def add(
+        self, claim: str, payload: str, expires_at: float, vector: np.ndarray,
+    ) -> None:
+        if self.size < self.max_size:
+            if self.matrix is None or self.size == len(self.matrix):
+                self._grow(len(vector))
+            slot = self.size
+            self.claims.append(claim)
+            self.payloads.append(payload)
+            self.size += 1
+        else:
+            slot = self.oldest
+            self.oldest = (self.oldest + 1) % self.max_size
+            self.claims[slot] = claim
+            self.payloads[slot] = payload
+        self.matrix[slot] = vector
+        self.expires_at[slot] = expires_at
+
+    def similarities(self, vector: np.ndarray, now: float) -> np.ndarray:
+        similarities = self.matrix[:self.size] @ vector
+        similarities[self.expires_at[:self.size] <= now] = -1.0
+        return similarities
+
+    def _grow(self, dimensions: int) -> None:
+        capacity = min(self.max_size, max(16, 2 * self.size))
+        matrix = np.empty((capacity, dimensions), dtype=np.float32)
+        expires_at = np.empty(capacity)
+        if self.matrix is not None:
+            matrix[:self.size] = self.matrix[:self.size]
+            expires_at[:self.size] = self.expires_at[:self.size]
+        self.matrix = matrix
+        self.expires_at = expires_at
+        self.resizes += 1
+
+
+class SemanticVerdictCache(VerdictCacheInterface):
+    """A cache returning verdicts of previously verified near-duplicates.
+
+    Claims are embedded and compared by cosine similarity with the claims
+    already verified by the same chatbot configuration. The verdict of the
+    most similar claim is returned if the similarity reaches the threshold.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings | None = None,
+        threshold: float | None = None,
+        max_size: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Initialize the SemanticVerdictCache.
+
+        Args:
+            embedding_model (Embeddings | None): Model used to embed claims.
+                Defaults to the OpenAI embedding model, created on first use.
+            threshold (float | None): Minimum cosine similarity of a hit.
+                Defaults to ``Settings.semantic_cache_threshold``.
+            max_size (int | None): Maximum number of verified claims kept
+                per chatbot configuration. Defaults to
+                ``Settings.verdict_cache_size``.
+            ttl (float | None): Number of seconds a verdict stays valid.
+                Defaults to ``Settings.verdict_cache_ttl``.
+
+        """
+        self._embedding_model = embedding_model
+        self.threshold = threshold or settings.semantic_cache_threshold
+        self.max_size = max_size or settings.verdict_cache_size
+        self.ttl = ttl or settings.verdict_cache_ttl
+        self._partitions: dict[str, _Partition] = {}
+        self._recent_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.hit_similarities: deque[float] = deque(maxlen=1000)
+
+    @property
+    def embedding_model(self) -> Embeddings:
+        """Get the embedding model, creating the default one if needed."""
+        if self._embedding_model is None:
+            from agents.vectorstores.embeddings.openai_embeddings import (
+                OpenAIEmbeddingsWrapper,
+            )
+
+            self._embedding_model = OpenAIEmbeddingsWrapper.get_embedding_model()
+        return self._embedding_model
+
+    def get(
+        self, chatbot: ChatbotInterface, claim: str,
+    ) -> str | BaseMessage | BaseModel | None:
+        """Get the verdict of the most similar previously verified claim.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot that would answer.
+            claim (str): The claim text.
+
+        Returns:
+            str | BaseMessage | BaseModel | None: The cached verdict, or
+            None if no verified claim is similar enough.
+
+        """
+        fingerprint = chatbot_fingerprint(chatbot)
+        vector = self._embed(claim)
+        now = time.time()
+        with self._lock:
+            partition = self._partitions.get(fingerprint)
+            if partition is None or not partition.size:
+                self.misses += 1
+                return None
+            similarities = partition.similarities(vector, now)
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.hit_similarities.append(similarity)
+            matched_claim = partition.claims[best]
+            payload = partition.payloads[best]
+        logger.info(
+            f"Semantic cache hit (similarity={similarity:.3f}): "
+            f"'{claim}' matched '{matched_claim}'",
+        )
+        return self._deserialize(chatbot, payload)
+
+    def put(
+        self,
+        chatbot: ChatbotInterface,
+        claim: str,
+        response: str | BaseMessage | BaseModel,
+    ) -> None:
+        """Store the verdict of a chatbot for a claim.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot that answered.
+            claim (str): The claim text.
+            response (str | BaseMessage | BaseModel): The verdict.
+
+        """
+        fingerprint = chatbot_fingerprint(chatbot)
+        vector = self._embed(claim)
+        payload = self._serialize(response)
+        with self._lock:
+            partition = self._partitions.setdefault(
+                fingerprint, _Partition(self.max_size),
+            )
+            partition.add(
+                normalize_claim(claim), payload, time.time() + self.ttl, vector,
+            )
+
+    def invalidate(self, chatbot: ChatbotInterface | None = None) -> None:
+        """Drop cached verdicts.
+
+        Args:
+            chatbot (ChatbotInterface | None): Drop only the verdicts of
+                this chatbot configuration. If None, drop everything.
+
+        """
+        with self._lock:
+            if chatbot is None:
+                self._partitions.clear()
+            else:
+                self._partitions.pop(chatbot_fingerprint(chatbot), None)
+
+    def stats(self) -> dict:
+        """Get cache usage statistics.
+
+        Returns:
+            dict: The number of "hits" and "misses", the "hit_rate", the
+            "threshold" and the similarities of recent hits under
+            "hit_similarities".
+
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "threshold": self.threshold,
+            "hit_similarities": list(self.hit_similarities),
+            "size": sum(p.size for p in self._partitions.values()),
+        }
+
+    def _embed(self, claim: str) -> np.ndarray:
+        """Embed a normalized claim into a unit vector.
+
+        Vectors of recent claims are remembered, so a miss followed by a
+        put of the same claim embeds it only once.
+        """
+        claim = normalize_claim(claim)
+        with self._lock:
+            vector = self._recent_vectors.get(claim)
+            if vector is not None:
+                self._recent_vectors.move_to_end(claim)
+                return vector
+        vector = np.asarray(self.embedding_model.embed_query(claim), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        with self._lock:
+            self._recent_vectors[claim] = vector
+            while len(self._recent_vectors) > RECENT_VECTORS_SIZE:
+                self._recent_vectors.popitem(last=False)
+        return vector
@@ -0,0 +1,300 @@
+import asyncio
+import contextvars
+import threading
+import weakref
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Hashable,
+    Iterator,
+)
+from typing import Any
+
+from agents.logger.logger import get_logger
+
+logger = get_logger()
+
+
+class _Call:
+    """A blocking call shared by all callers with the same key."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _Broadcast:
+    """Chunks of a blocking stream shared by all subscribers with the same key."""
+
+    def __init__(self) -> None:
+        self.chunks: list = []
+        self.finished = False
+        self.error: BaseException | None = None
+        self.condition = threading.Condition()
+
+
+class _AsyncBroadcast:
+    """Chunks of an async stream shared by all subscribers with the same key."""
+
+    def __init__(self) -> None:
+        self.chunks: list = []
+        self.finished = False
+        self.error: BaseException | None = None
+        self.condition = asyncio.Condition()
+
+
+class SingleFlight:
+    """Coalesces concurrent identical requests into one execution.
+
+    While a call for a key is in flight, later callers with the same key
+    wait for it and get its result instead of starting their own. Stream
+    subscribers that join late first replay the chunks produced so far.
+    A key is forgotten as soon as its execution finishes, so this is not a
+    cache. Async calls are only shared within one event loop.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SingleFlight."""
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._broadcasts: dict[Hashable, _Broadcast] = {}
+        self._tasks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task]
+        ] = weakref.WeakKeyDictionary()
+        self._async_broadcasts: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[Hashable, _AsyncBroadcast]
+        ] = weakref.WeakKeyDictionary()
+        self._producers: set[asyncio.Task] = set()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:  # noqa: ANN401
+        """Run the function once for all concurrent callers with the key.
+
+        Args:
+            key (Hashable): Identifies identical requests.
+            fn (Callable[[], Any]): Executes the request.
+
+        Returns:
+            Any: The result of the shared execution.
+
+        Raises:
+            BaseException: The error raised by the shared execution.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            logger.info(f"Coalescing request with in-flight call: {key}")
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def ado(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+    ) -> Any:  # noqa: ANN401
+        """Await the coroutine once for all concurrent callers with the key.
+
+        Cancelling one caller does not cancel the shared execution.
+
+        Args:
+            key (Hashable): Identifies identical requests.
+            fn (Callable[[], Awaitable[Any]]): Creates the request coroutine.
+
+        Returns:
+            Any: The result of the shared execution.
+
+        """
+        with self._lock:
+            tasks = self._tasks.setdefault(asyncio.get_running_loop(), {})
+            task = tasks.get(key)
+            if task is None:
+                task = tasks[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._forget(tasks, key))
+                self.executions += 1
+            else:
+                self.coalesced += 1
+                logger.info(f"Coalescing request with in-flight call: {key}")
+        return await asyncio.shield(task)
+
+    def stream(
+        self, key: Hashable, fn: Callable[[], Iterator],
+    ) -> Generator[Any, None, None]:
+        """Subscribe to a stream produced once for all callers with the key.
+
+        The stream is consumed by a background thread, so subscribers that
+        stop early do not stall the others.
+
+        Args:
+            key (Hashable): Identifies identical requests.
+            fn (Callable[[], Iterator]): Creates the stream.
+
+        Yields:
+            Any: All chunks of the shared stream, from the first one.
+
+        Raises:
+            BaseException: The error raised by the shared stream.
+
+        """
+        with self._lock:
+            broadcast = self._broadcasts.get(key)
+            if broadcast is None:
+                broadcast = self._broadcasts[key] = _Broadcast()
+                self.executions += 1
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(self._produce, key, broadcast, fn),
+                    daemon=True,
+                ).start()
+            else:
+                self.coalesced += 1
+                logger.info(f"Joining in-flight stream: {key}")
+
+        index = 0
+        while True:
+            with broadcast.condition:
+                broadcast.condition.wait_for(
+                    lambda: len(broadcast.chunks) > index or broadcast.finished,
+                )
+                chunks = broadcast.chunks[index:]
+                finished = broadcast.finished
+            yield from chunks
+            index += len(chunks)
+            if finished and index == len(broadcast.chunks):
+                break
+        if broadcast.error is not None:
+            raise broadcast.error
+
+    async def astream(
+        self, key: Hashable, fn: Callable[[], AsyncIterator],
+    ) -> AsyncGenerator[Any, None]:
+        """Subscribe to an async stream produced once for all callers.
+
+        Args:
+            key (Hashable): Identifies identical requests.
+            fn (Callable[[], AsyncIterator]): Creates the stream.
+
+        Yields:
+            Any: All chunks of the shared stream, from the first one.
+
+        Raises:
+            BaseException: The error raised by the shared stream.
+
+        """
+        with self._lock:
+            broadcasts = self._async_broadcasts.setdefault(
+                asyncio.get_running_loop(), {},
+            )
+            broadcast = broadcasts.get(key)
+            if broadcast is None:
+                broadcast = broadcasts[key] = _AsyncBroadcast()
+                self.executions += 1
+                producer = asyncio.ensure_future(
+                    self._aproduce(broadcasts, key, broadcast, fn),
+                )
+                self._producers.add(producer)
+                producer.add_done_callback(self._producers.discard)
+            else:
+                self.coalesced += 1
+                logger.info(f"Joining in-flight stream: {key}")
+
+        index = 0
+        while True:
+            async with broadcast.condition:
+                await broadcast.condition.wait_for(
+                    lambda: len(broadcast.chunks) > index or broadcast.finished,
+                )
+                chunks = broadcast.chunks[index:]
+                finished = broadcast.finished
+            for chunk in chunks:
+                yield chunk
+            index += len(chunks)
+            if finished and index == len(broadcast.chunks):
+                break
+        if broadcast.error is not None:
+            raise broadcast.error
+
+    def stats(self) -> dict:
+        """Get coalescing statistics.
+
+        Returns:
+            dict: The number of underlying "executions", of "coalesced"
+            requests that joined one, and the number of calls "in_flight".
+
+        """
+        with self._lock:
+            in_flight = (
+                len(self._calls) + len(self._broadcasts)
+                + sum(len(tasks) for tasks in self._tasks.values())
+                + sum(len(b) for b in self._async_broadcasts.values())
+            )
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": in_flight,
+        }
+
+    def _forget(self, in_flight: dict, key: Hashable) -> None:
+        with self._lock:
+            in_flight.pop(key, None)
+
+    def _produce(
+        self, key: Hashable, broadcast: _Broadcast, fn: Callable[[], Iterator],
+    ) -> None:
+        try:
+            for chunk in fn():
+                with broadcast.condition:
+                    broadcast.chunks.append(chunk)
+                    broadcast.condition.notify_all()
+        except BaseException as e:
+            logger.exception(f"Shared stream failed: {key}")
+            broadcast.error = e
+        finally:
+            with self._lock:
+                del self._broadcasts[key]
+            with broadcast.condition:
+                broadcast.finished = True
+                broadcast.condition.notify_all()
+
+    async def _aproduce(
+        self,
+        broadcasts: dict[Hashable, _AsyncBroadcast],
+        key: Hashable,
+        broadcast: _AsyncBroadcast,
+        fn: Callable[[], AsyncIterator],
+    ) -> None:
+        try:
+            async for chunk in fn():
+                async with broadcast.condition:
+                    broadcast.chunks.append(chunk)
+                    broadcast.condition.notify_all()
+        except Exception as e:
+            logger.exception(f"Shared stream failed: {key}")
+            broadcast.error = e
+        finally:
+            self._forget(broadcasts, key)
+            async with broadcast.condition:
+                broadcast.finished = True
+                broadcast.condition.notify_all()
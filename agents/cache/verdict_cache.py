@@ -0,0 +1,260 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from agents.cache.cache_interface import VerdictCacheInterface
+from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+
+def normalize_claim(claim: str) -> str:
+    """Normalize a claim so trivially different copies share a cache key.
+
+    Args:
+        claim (str): The claim text.
+
+    Returns:
+        str: The case-folded claim with collapsed whitespace.
+
+    """
+    return " ".join(claim.casefold().split())
+
+
+def chatbot_fingerprint(chatbot: ChatbotInterface) -> str:
+    """Describe everything about a chatbot that can change its verdicts.
+
+    The fingerprint covers the chatbot type, the models, the tool set,
+    the prompts, the ensemble weights and the cascade stages, so changing
+    any of them yields new cache keys.
+
+    Args:
+        chatbot (ChatbotInterface): The chatbot to describe.
+
+    Returns:
+        str: A short hash identifying the chatbot configuration.
+
+    """
+    model = getattr(chatbot, "model", None)
+    tool_names = sorted(
+        getattr(tool, "name", type(tool).__name__)
+        for tool in getattr(chatbot, "tools", None) or []
+    )
+    prompts = getattr(chatbot, "prompts", None) or [getattr(chatbot, "prompt", None)]
+    schema = getattr(chatbot, "schema", None)
+    description = {
+        "chatbot": type(chatbot).__name__,
+        "model": _model_name(model),
+        "tools": tool_names,
+        "prompts": [repr(prompt) for prompt in prompts],
+        "schema": getattr(schema, "__qualname__", repr(schema)),
+    }
+    specs = getattr(chatbot, "specs", None)
+    if specs:
+        description["agents"] = [
+            [_model_name(spec.model or model), spec.weight, spec.recursion_limit]
+            for spec in specs
+        ]
+    stages = list(getattr(chatbot, "stages", None) or [])
+    if stages:
+        description["stages"] = [chatbot_fingerprint(stage) for stage in stages]
+        description["min_confidence"] = getattr(chatbot, "min_confidence", None)
+    serialized = json.dumps(description, sort_keys=True)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+
+
+def _model_name(model: object) -> str:
+    return str(
+        getattr(model, "model", None)
+        or getattr(model, "model_name", None)
+        or type(model).__name__,
+    )
+
+
+class VerdictCache(VerdictCacheInterface):
+    """A two-tier cache of chatbot verdicts.
+
+    Verdicts are keyed on the normalized claim and the chatbot fingerprint.
+    The first tier is an in-memory LRU with a TTL; the optional second tier
+    is a SQLite database that survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        ttl: float | None = None,
+        db_path: str | Path | None = None,
+    ) -> None:
+        """Initialize the VerdictCache.
+
+        Args:
+            max_size (int | None): Maximum number of verdicts kept in
+                memory. Defaults to ``Settings.verdict_cache_size``.
+            ttl (float | None): Number of seconds a verdict stays valid.
+                Defaults to ``Settings.verdict_cache_ttl``.
+            db_path (str | Path | None): Path to the SQLite database. If
+                None, only the in-memory tier is used.
+
+        """
+        self.max_size = max_size or settings.verdict_cache_size
+        self.ttl = ttl or settings.verdict_cache_ttl
+        self._memory: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "payload TEXT NOT NULL, expires_at REAL NOT NULL)",
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS verdicts_fingerprint "
+                "ON verdicts (fingerprint)",
+            )
+            self._db.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(
+        self, chatbot: ChatbotInterface, claim: str,
+    ) -> str | BaseMessage | BaseModel | None:
+        """Get the cached verdict of a chatbot for a claim.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot that would answer.
+            claim (str): The claim text.
+
+        Returns:
+            str | BaseMessage | BaseModel | None: The cached verdict, or
+            None on a miss.
+
+        """
+        fingerprint = chatbot_fingerprint(chatbot)
+        key = self._key(fingerprint, claim)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._deserialize(chatbot, entry[2])
+            if entry is not None:
+                del self._memory[key]
+
+            row = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT payload, expires_at FROM verdicts "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, row[1], fingerprint, row[0])
+        return self._deserialize(chatbot, row[0])
+
+    def put(
+        self,
+        chatbot: ChatbotInterface,
+        claim: str,
+        response: str | BaseMessage | BaseModel,
+    ) -> None:
+        """Store the verdict of a chatbot for a claim.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot that answered.
+            claim (str): The claim text.
+            response (str | BaseMessage | BaseModel): The verdict.
+
+        """
+        fingerprint = chatbot_fingerprint(chatbot)
+        key = self._key(fingerprint, claim)
+        payload = self._serialize(response)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, fingerprint, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, payload, expires_at),
+                )
+                self._db.commit()
+
+    def invalidate(self, chatbot: ChatbotInterface | None = None) -> None:
+        """Drop cached verdicts.
+
+        Call it after changing prompts or models to free stale entries.
+
+        Args:
+            chatbot (ChatbotInterface | None): Drop only the verdicts of
+                this chatbot configuration. If None, drop everything.
+
+        """
+        fingerprint = (
+            chatbot_fingerprint(chatbot) if chatbot is not None else None
+        )
+        with self._lock:
+            if fingerprint is None:
+                self._memory.clear()
+            else:
+                for key in [
+                    key for key, entry in self._memory.items()
+                    if entry[1] == fingerprint
+                ]:
+                    del self._memory[key]
+            if self._db is not None:
+                if fingerprint is None:
+                    self._db.execute("DELETE FROM verdicts")
+                else:
+                    self._db.execute(
+                        "DELETE FROM verdicts WHERE fingerprint = ?",
+                        (fingerprint,),
+                    )
+                self._db.commit()
+        logger.info(f"Invalidated verdict cache for fingerprint: {fingerprint}")
+
+    def stats(self) -> dict:
+        """Get cache usage statistics.
+
+        Returns:
+            dict: The number of "memory_hits", "disk_hits" and "misses",
+            the overall "hit_rate" and the in-memory "size".
+
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self._memory),
+        }
+
+    @staticmethod
+    def _key(fingerprint: str, claim: str) -> str:
+        text = f"{fingerprint}\n{normalize_claim(claim)}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _remember(
+        self, key: str, expires_at: float, fingerprint: str, payload: str,
+    ) -> None:
+        self._memory[key] = (expires_at, fingerprint, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
@@ -1,15 +1,17 @@
 import uuid
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from langchain.agents import create_agent
 from langchain.agents.structured_output import ToolStrategy
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
-from langchain_core.messages.ai import AIMessageChunk
 from langgraph.checkpoint.memory import InMemorySaver
 from pydantic import BaseModel
 
 from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.chatbot.compaction import HistoryCompactionMiddleware
+from agents.chatbot.llms.token_counter import get_token_counter
+from agents.chatbot.streaming import VerdictEvent, VerdictStreamParser, iter_text
 from agents.logger.logger import get_logger
 
 logger = get_logger()
@@ -24,7 +26,10 @@ class AgentChatbot(ChatbotInterface):
         prompt: str,
         schema: BaseModel | None = None,
         tools: list | None = None,
-        id_: str = str(uuid.uuid4()),
+        id_: str | None = None,
+        *,
+        stateless: bool = False,
+        history_token_budget: int | None = None,
     ) -> None:
         """Create a new chatbot instance.
 
@@ -35,23 +40,43 @@ class AgentChatbot(ChatbotInterface):
             schema (type[BaseModel] | dict | None): Optional Pydantic model
                 class or JSON schema dict to enable structured output.
             tools (list | None): List of tools available to the agent.
-            id_ (str, optional): Id used to distinguish conversations.
-                Defaults to a UUID.
+            id_ (str | None): Id used to distinguish conversations.
+                Defaults to a new UUID.
+            stateless (bool): Answer every call from a fresh state without
+                a checkpointer. Meant for verification workloads, where
+                claims are independent and a shared history would only make
+                every call re-send the messages of all earlier ones.
+            history_token_budget (int | None): Token budget of the
+                conversation history. Old tool outputs are compacted once
+                it is exceeded. Defaults to
+                ``Settings.history_token_budget``. Unused in stateless mode.
 
         """
         if tools is None:
             tools = []
         self.model = model
         self.schema = schema
+        self.prompt = prompt
         self.tools = tools
+        self.stateless = stateless
+        self.checkpointer = None if stateless else InMemorySaver()
+        self.compaction = (
+            None if stateless
+            else HistoryCompactionMiddleware(
+                max_tokens=history_token_budget,
+                token_counter=get_token_counter(model).token_counter,
+            )
+        )
         self.agent = create_agent(
             model,
             system_prompt=prompt,
             tools=tools,
             response_format=ToolStrategy(schema) if schema else None,
-            checkpointer=InMemorySaver(),
+            checkpointer=self.checkpointer,
+            middleware=[self.compaction] if self.compaction else [],
         )
-        self.id = id_
+        self.id = id_ or str(uuid.uuid4())
+        self.retries = 3
 
     def chat(self, user_input: str) -> BaseMessage:
         """Generate a response from the chatbot.
@@ -66,18 +91,36 @@ class AgentChatbot(ChatbotInterface):
             RuntimeError: If failed to get response after retries.
 
         """
-        retries = 3
-        for _i in range(retries):
+        for _i in range(self.retries):
             logger.info(f"User input: {user_input}")
             result = self.agent.invoke(
-                {"messages": [{"role": "user", "content": user_input}]},
-                {"configurable": {"thread_id": self.id}},
+                self._build_input(user_input), self._build_config(),
+            )
+            output = self._extract_output(result)
+            if output:
+                return output
+        msg = "Failed to get response from agent after retries."
+        raise RuntimeError(msg)
+
+    async def achat(self, user_input: str) -> BaseMessage:
+        """Asynchronously generate a response from the chatbot.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Returns:
+            BaseMessage: The chatbot's response message.
+
+        Raises:
+            RuntimeError: If failed to get response after retries.
+
+        """
+        for _i in range(self.retries):
+            logger.info(f"User input: {user_input}")
+            result = await self.agent.ainvoke(
+                self._build_input(user_input), self._build_config(),
             )
-            if self.schema:
-                output = result["structured_response"]
-            else:
-                output = result["messages"][-1].content
-            logger.info(f"AgentChatbot response: {output}")
+            output = self._extract_output(result)
             if output:
                 return output
         msg = "Failed to get response from agent after retries."
@@ -101,28 +144,107 @@ class AgentChatbot(ChatbotInterface):
 
         """
         for step in self.agent.stream(
-            {"messages": [{"role": "user", "content": user_input}]},
-            {"configurable": {"thread_id": self.id}},
+            self._build_input(user_input),
+            self._build_config(),
             stream_mode="messages",
         ):
-            if isinstance(step[0], AIMessageChunk):
-                if step[0].tool_calls or step[0].tool_call_chunks:
-                    continue
-
-                content = step[0].content
-                if isinstance(content, str) and content:
-                    yield content
-                elif isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict):
-                            if block.get("type") == "text" and block.get("text"):
-                                yield block["text"]
-                        elif (
-                            hasattr(block, "type")
-                            and block.type == "text"
-                            and hasattr(block, "text")
-                            and block.text
-                        ):
-                            yield block.text
+            yield from iter_text(step[0])
+
+    async def astream_chat(self, user_input: str) -> AsyncGenerator[str, None]:
+        """Asynchronously generate a response from the chatbot word by word.
 
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[str, None]: The chatbot's response message,
+            one word at a time.
+
+        """
+        async for step in self.agent.astream(
+            self._build_input(user_input),
+            self._build_config(),
+            stream_mode="messages",
+        ):
+            for text in iter_text(step[0]):
+                yield text
+
+    def stream_verdict(
+        self, user_input: str,
+    ) -> Generator[VerdictEvent, None, None]:
+        """Generate the agent's verdict field by field.
+
+        The arguments of the structured output tool call are parsed as
+        they stream in, so the label is emitted as soon as it is decided,
+        followed by increments of the explanation.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            Generator[VerdictEvent, None, None]: The label, then the
+            explanation text.
+
+        """
+        parser = VerdictStreamParser(self.schema)
+        for step in self.agent.stream(
+            self._build_input(user_input),
+            self._build_config(),
+            stream_mode="messages",
+        ):
+            yield from parser.feed(step[0])
+        yield from parser.close()
+
+    async def astream_verdict(
+        self, user_input: str,
+    ) -> AsyncGenerator[VerdictEvent, None]:
+        """Asynchronously generate the agent's verdict field by field.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[VerdictEvent, None]: The label, then the
+            explanation text.
+
+        """
+        parser = VerdictStreamParser(self.schema)
+        async for step in self.agent.astream(
+            self._build_input(user_input),
+            self._build_config(),
+            stream_mode="messages",
+        ):
+            for event in parser.feed(step[0]):
+                yield event
+        for event in parser.close():
+            yield event
+
+    def checkpoint_threads(self) -> list[tuple[InMemorySaver, str]]:
+        """Get the checkpointer thread holding the current conversation.
+
+        Returns:
+            list[tuple[InMemorySaver, str]]: The agent's checkpointer and
+            the conversation id. Empty in stateless mode.
+
+        """
+        if self.checkpointer is None:
+            return []
+        return [(self.checkpointer, self.id)]
+
+    @staticmethod
+    def _build_input(user_input: str) -> dict:
+        return {"messages": [{"role": "user", "content": user_input}]}
+
+    def _build_config(self) -> dict:
+        if self.checkpointer is None:
+            return {}
+        return {"configurable": {"thread_id": self.id}}
+
+    def _extract_output(self, result: dict) -> BaseModel | str:
+        if self.schema:
+            output = result["structured_response"]
+        else:
+            output = result["messages"][-1].content
+        logger.info(f"AgentChatbot response: {output}")
+        return output
 
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from langchain_core.messages import BaseMessage
+from langchain_core.utils.json import parse_json_markdown
+from pydantic import BaseModel
+
+from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.chatbot.streaming import verdict_events
+from agents.logger.logger import get_logger
+from agents.models.detector_model import DetectorModel
+from agents.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Generator
+
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+    from agents.chatbot.streaming import VerdictEvent
+
+logger = get_logger()
+settings = get_settings()
+
+ESCALATION_LABELS = ("Unclear",)
+
+
+class CascadeChatbot(ChatbotInterface):
+    """A chatbot that escalates to a stronger chatbot only when uncertain.
+
+    Every claim is first answered by a cheap chatbot, such as a plain
+    chatbot on a Flash model. Its verdict is kept unless the label is one
+    of the escalation labels or the self-reported confidence is below the
+    threshold, in which case the claim is answered again by the strong
+    chatbot, such as an agent on a Pro model. Either way the verdict is
+    returned as an instance of the strong chatbot's schema.
+    """
+
+    def __init__(
+        self,
+        cheap: ChatbotInterface,
+        strong: ChatbotInterface,
+        min_confidence: float | None = None,
+        escalation_labels: tuple[str, ...] = ESCALATION_LABELS,
+        id_: str | None = None,
+    ) -> None:
+        """Create a new cascade chatbot instance.
+
+        Args:
+            cheap (ChatbotInterface): Chatbot answering every claim first.
+                Its schema should include a ``confidence`` field, e.g.
+                ScoredDetectorModel.
+            strong (ChatbotInterface): Chatbot answering the claims the
+                cheap chatbot is unsure about.
+            min_confidence (float | None): Verdicts with a lower
+                confidence are escalated. Defaults to
+                ``Settings.cascade_min_confidence``.
+            escalation_labels (tuple[str, ...]): Labels that are always
+                escalated.
+            id_ (str | None): Id used to distinguish conversations.
+                Defaults to a new UUID.
+
+        Raises:
+            ValueError: If min_confidence is not between 0 and 1.
+
+        """
+        if min_confidence is None:
+            min_confidence = settings.cascade_min_confidence
+        if not 0 <= min_confidence <= 1:
+            msg = "min_confidence must be between 0 and 1"
+            raise ValueError(msg)
+
+        self.id = id_ or str(uuid.uuid4())
+        self.cheap = cheap.with_id(f"{self.id}_cheap")
+        self.strong = strong.with_id(f"{self.id}_strong")
+        self.stages = [self.cheap, self.strong]
+        self.model = strong.model
+        schema = getattr(strong, "schema", None)
+        self.schema = (
+            schema if isinstance(schema, type) and issubclass(schema, BaseModel)
+            else DetectorModel
+        )
+        self.min_confidence = min_confidence
+        self.escalation_labels = {label.casefold() for label in escalation_labels}
+        self.cascade_stats = Counter()
+
+    def chat(self, user_input: str) -> BaseModel:
+        """Generate a response, escalating to the strong chatbot if needed.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Returns:
+            BaseModel: The verdict of the cheap chatbot, or of the strong
+            chatbot if the claim was escalated, as an instance of
+            ``schema``.
+
+        Raises:
+            ValueError: If the strong chatbot's response is not a verdict.
+
+        """
+        response = self.cheap.chat(user_input)
+        if self._should_escalate(response):
+            response = self.strong.chat(user_input)
+        return self._to_verdict(response)
+
+    async def achat(self, user_input: str) -> BaseModel:
+        """Asynchronously generate a response, escalating if needed.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Returns:
+            BaseModel: The verdict of the cheap chatbot, or of the strong
+            chatbot if the claim was escalated, as an instance of
+            ``schema``.
+
+        Raises:
+            ValueError: If the strong chatbot's response is not a verdict.
+
+        """
+        response = await self.cheap.achat(user_input)
+        if self._should_escalate(response):
+            response = await self.strong.achat(user_input)
+        return self._to_verdict(response)
+
+    def stream_chat(self, user_input: str) -> Generator[str, None, None]:
+        """Generate a response from the chatbot word by word.
+
+        The cheap verdict is needed to decide on escalation, so only the
+        strong chatbot's response is streamed.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            Generator[str, None, None]: The chatbot's response message.
+
+        """
+        response = self.cheap.chat(user_input)
+        if self._should_escalate(response):
+            yield from self.strong.stream_chat(user_input)
+        else:
+            yield _as_text(response)
+
+    async def astream_chat(self, user_input: str) -> AsyncGenerator[str, None]:
+        """Asynchronously generate a response from the chatbot word by word.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[str, None]: The chatbot's response message.
+
+        """
+        response = await self.cheap.achat(user_input)
+        if self._should_escalate(response):
+            async for chunk in self.strong.astream_chat(user_input):
+                yield chunk
+        else:
+            yield _as_text(response)
+
+    def stream_verdict(
+        self, user_input: str,
+    ) -> Generator[VerdictEvent, None, None]:
+        """Generate the verdict field by field.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            Generator[VerdictEvent, None, None]: The label, then the
+            explanation text.
+
+        """
+        response = self.cheap.chat(user_input)
+        if self._should_escalate(response):
+            yield from self.strong.stream_verdict(user_input)
+        else:
+            yield from verdict_events(response, self.cheap.schema)
+
+    async def astream_verdict(
+        self, user_input: str,
+    ) -> AsyncGenerator[VerdictEvent, None]:
+        """Asynchronously generate the verdict field by field.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[VerdictEvent, None]: The label, then the
+            explanation text.
+
+        """
+        response = await self.cheap.achat(user_input)
+        if self._should_escalate(response):
+            async for event in self.strong.astream_verdict(user_input):
+                yield event
+        else:
+            for event in verdict_events(response, self.cheap.schema):
+                yield event
+
+    def with_id(self, id_: str) -> CascadeChatbot:
+        """Return a copy of the chatbot bound to another conversation.
+
+        Both stages are rebound, and the copy shares the escalation
+        statistics with the original.
+
+        Args:
+            id_ (str): Id of the conversation the copy is bound to.
+
+        Returns:
+            CascadeChatbot: The chatbot bound to the given conversation.
+
+        """
+        chatbot = super().with_id(id_)
+        chatbot.cheap = self.cheap.with_id(f"{id_}_cheap")
+        chatbot.strong = self.strong.with_id(f"{id_}_strong")
+        chatbot.stages = [chatbot.cheap, chatbot.strong]
+        return chatbot
+
+    def checkpoint_threads(self) -> list[tuple[BaseCheckpointSaver, str]]:
+        """Get the checkpointer threads of both stages.
+
+        Returns:
+            list[tuple[BaseCheckpointSaver, str]]: The checkpointer and
+            thread id of each stage.
+
+        """
+        return self.cheap.checkpoint_threads() + self.strong.checkpoint_threads()
+
+    def stats(self) -> dict[str, float]:
+        """Report how much of the traffic was escalated.
+
+        Returns:
+            dict[str, float]: The number of claims, of escalations and the
+            escalation rate.
+
+        """
+        claims = self.cascade_stats["claims"]
+        escalations = self.cascade_stats["escalations"]
+        return {
+            "claims": claims,
+            "escalations": escalations,
+            "escalation_rate": escalations / claims if claims else 0.0,
+        }
+
+    def _to_verdict(self, response: object) -> BaseModel:
+        if isinstance(response, self.schema):
+            return response
+        verdict = _read_verdict(response)
+        if verdict is None:
+            msg = f"Response is not a verdict: {_as_text(response)[:200]}"
+            raise ValueError(msg)
+        return self.schema.model_validate(verdict)
+
+    def _should_escalate(self, response: object) -> bool:
+        """Decide whether the cheap verdict must be checked again."""
+        self.cascade_stats["claims"] += 1
+        verdict = _read_verdict(response)
+        if verdict is None:
+            reason = "unreadable verdict"
+        elif str(verdict.get("label", "")).casefold() in self.escalation_labels:
+            reason = f"label {verdict['label']}"
+        elif (
+            isinstance(verdict.get("confidence"), int | float)
+            and verdict["confidence"] < self.min_confidence
+        ):
+            reason = f"confidence {verdict['confidence']}"
+        else:
+            return False
+
+        self.cascade_stats["escalations"] += 1
+        logger.info(f"Escalating to the strong chatbot: {reason}")
+        return True
+
+
+def _read_verdict(response: object) -> dict | None:
+    if isinstance(response, BaseModel) and not isinstance(response, BaseMessage):
+        return response.model_dump()
+    if isinstance(response, dict):
+        return response
+    text = response.text if isinstance(response, BaseMessage) else str(response)
+    try:
+        verdict = parse_json_markdown(text)
+    except ValueError:
+        return None
+    return verdict if isinstance(verdict, dict) and "label" in verdict else None
+
+
+def _as_text(response: object) -> str:
+    if isinstance(response, BaseMessage):
+        return response.text
+    if isinstance(response, BaseModel):
+        return response.model_dump_json()
+    return str(response)
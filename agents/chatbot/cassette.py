@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+import warnings
+from collections import Counter, defaultdict
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import IO, Any, Literal
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumpd, load
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    ToolMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool, StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from agents.logger.logger import get_logger
+
+logger = get_logger()
+
+CassetteMode = Literal["record", "replay", "auto"]
+
+
+class Cassette:
+    """Records model responses and tool outputs and replays them offline.
+
+    A request is keyed by a hash of the model or tool name, the messages
+    or arguments without message ids, and the bound tools. Identical
+    requests are replayed in the order they were recorded.
+
+    The "record" mode sends every call to the live model or tool and
+    records it. The "replay" mode never calls them and raises LookupError
+    for unknown requests. The "auto" mode records only the missing
+    requests. The cassette is written on ``save`` or when its ``with``
+    block exits, gzipped if the path ends with ".gz".
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: CassetteMode = "auto",
+        latency: Literal["recorded"] | float | None = None,
+    ) -> None:
+        """Initialize the Cassette, loading its file if it exists.
+
+        Args:
+            path (str | Path): Path of the cassette file.
+            mode (CassetteMode): "record", "replay" or "auto".
+            latency (Literal["recorded"] | float | None): Delay of replayed
+                calls. "recorded" waits as long as the recorded call took,
+                a number waits that many seconds and None does not wait.
+
+        Raises:
+            ValueError: If the mode is unknown or the latency is negative.
+            FileNotFoundError: If the file does not exist in replay mode.
+
+        """
+        if mode not in ("record", "replay", "auto"):
+            msg = f"Unknown cassette mode: {mode}"
+            raise ValueError(msg)
+        if latency not in (None, "recorded") and latency < 0:
+            msg = "latency must be 'recorded', None or not negative"
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._entries: dict[str, list[dict]] = defaultdict(list)
+        self._replayed: Counter = Counter()
+        self._stats: Counter = Counter()
+        self._lock = threading.Lock()
+        if self.path.exists() and mode != "record":
+            self._load()
+        elif mode == "replay":
+            msg = f"Cassette not found: {self.path}"
+            raise FileNotFoundError(msg)
+
+    def __enter__(self) -> Cassette:
+        """Return the cassette."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Save the cassette."""
+        self.save()
+
+    def __len__(self) -> int:
+        """Return the number of recorded calls."""
+        with self._lock:
+            return sum(len(entries) for entries in self._entries.values())
+
+    def wrap_model(
+        self, model: BaseChatModel | None, model_name: str | None = None,
+    ) -> CassetteChatModel:
+        """Wrap a chat model so its calls go through the cassette.
+
+        Args:
+            model (BaseChatModel | None): The live model. Not needed in
+                replay mode.
+            model_name (str | None): Name the requests are keyed by.
+                Defaults to the name of the model.
+
+        Returns:
+            CassetteChatModel: The wrapped model.
+
+        Raises:
+            ValueError: If neither a model nor a name is given.
+
+        """
+        if model_name is None:
+            if model is None:
+                msg = "model_name must be provided without a model"
+                raise ValueError(msg)
+            model_name = (
+                getattr(model, "model", None)
+                or getattr(model, "model_name", None)
+                or type(model).__name__
+            )
+        return CassetteChatModel(cassette=self, live=model, recorded_name=model_name)
+
+    def wrap_tool(self, tool: BaseTool) -> BaseTool:
+        """Wrap a tool so its calls go through the cassette.
+
+        Args:
+            tool (BaseTool): The live tool.
+
+        Returns:
+            BaseTool: A tool with the same name, description and arguments.
+
+        """
+        def run(**kwargs: Any) -> Any:  # noqa: ANN401
+            key = self.key("tool", tool.name, kwargs)
+            entry = self.replay(key)
+            if entry is not None:
+                time.sleep(self.delay(entry))
+                return _tool_output(tool, entry)
+            start = time.perf_counter()
+            message = tool.invoke(_tool_call(tool, kwargs))
+            self._record_tool(key, tool, message, time.perf_counter() - start)
+            return _tool_output(tool, self._tool_entry(message))
+
+        async def arun(**kwargs: Any) -> Any:  # noqa: ANN401
+            key = self.key("tool", tool.name, kwargs)
+            entry = self.replay(key)
+            if entry is not None:
+                await asyncio.sleep(self.delay(entry))
+                return _tool_output(tool, entry)
+            start = time.perf_counter()
+            message = await tool.ainvoke(_tool_call(tool, kwargs))
+            self._record_tool(key, tool, message, time.perf_counter() - start)
+            return _tool_output(tool, self._tool_entry(message))
+
+        return StructuredTool.from_function(
+            func=run,
+            coroutine=arun,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            response_format=tool.response_format,
+        )
+
+    def wrap_tools(self, tools: Sequence[BaseTool]) -> list[BaseTool]:
+        """Wrap tools so their calls go through the cassette.
+
+        Args:
+            tools (Sequence[BaseTool]): The live tools.
+
+        Returns:
+            list[BaseTool]: The wrapped tools.
+
+        """
+        return [self.wrap_tool(tool) for tool in tools]
+
+    def key(self, kind: str, name: str, request: object) -> str:
+        """Hash a request.
+
+        Args:
+            kind (str): "model" or "tool".
+            name (str): Name of the model or tool.
+            request (object): JSON serializable description of the request.
+
+        Returns:
+            str: The key of the request.
+
+        """
+        payload = json.dumps(
+            [kind, name, request], sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def save(self) -> None:
+        """Write the recorded calls to the cassette file."""
+        with self._lock:
+            records = [
+                {"key": key, **entry}
+                for key, entries in self._entries.items()
+                for entry in entries
+            ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._open("wt") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        logger.info(f"Saved {len(records)} calls to cassette {self.path}")
+
+    def stats(self) -> dict[str, int]:
+        """Report the replayed and recorded calls.
+
+        Returns:
+            dict[str, int]: The number of recorded calls in the cassette,
+            of calls replayed and of calls recorded in this session.
+
+        """
+        with self._lock:
+            return {
+                "entries": sum(len(entries) for entries in self._entries.values()),
+                "replayed": self._stats["replayed"],
+                "recorded": self._stats["recorded"],
+            }
+
+    def replay(self, key: str) -> dict | None:
+        """Find the next recorded answer of a request.
+
+        Args:
+            key (str): The key of the request.
+
+        Returns:
+            dict | None: The recorded call, or None if the request must be
+            sent to the live model or tool.
+
+        Raises:
+            LookupError: If the request was not recorded in replay mode.
+
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if self.mode != "record" and entries:
+                index = min(self._replayed[key], len(entries) - 1)
+                self._replayed[key] += 1
+                self._stats["replayed"] += 1
+                return entries[index]
+        if self.mode == "replay":
+            msg = f"Request {key} is not in cassette {self.path}"
+            raise LookupError(msg)
+        return None
+
+    def record(self, key: str, entry: dict) -> None:
+        """Add a call to the cassette.
+
+        Args:
+            key (str): The key of the request.
+            entry (dict): The kind, name, latency and answer of the call.
+
+        """
+        with self._lock:
+            self._entries[key].append(entry)
+            self._replayed[key] = len(self._entries[key])
+            self._stats["recorded"] += 1
+
+    def _record_tool(
+        self, key: str, tool: BaseTool, message: ToolMessage, latency: float,
+    ) -> None:
+        self.record(key, {
+            "kind": "tool",
+            "name": tool.name,
+            "latency": latency,
+            **self._tool_entry(message),
+        })
+
+    @staticmethod
+    def _tool_entry(message: ToolMessage) -> dict:
+        return {"content": message.content, "artifact": dumpd(message.artifact)}
+
+    def delay(self, entry: dict) -> float:
+        """Return the seconds a replayed call waits."""
+        if self.latency == "recorded":
+            return entry["latency"]
+        return self.latency or 0.0
+
+    def _load(self) -> None:
+        with self._open("rt") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    self._entries[record.pop("key")].append(record)
+        logger.info(f"Loaded {len(self)} calls from cassette {self.path}")
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return self.path.open(mode, encoding="utf-8")
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model answering from a cassette, recording what it misses."""
+
+    cassette: Cassette
+    live: Runnable | None = None
+    recorded_name: str
+    tools: list[dict] = []
+    tool_kwargs: dict[str, Any] = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    @property
+    def model_name(self) -> str:
+        """Name the requests of the model are keyed by."""
+        return self.recorded_name
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | Callable | BaseTool],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> CassetteChatModel:
+        """Bind tools to the model, and to the live model if there is one.
+
+        Args:
+            tools (Sequence[dict[str, Any] | type | Callable | BaseTool]):
+                The tools to bind. They are part of the request keys.
+            **kwargs: Arguments passed to the live model's ``bind_tools``.
+
+        Returns:
+            CassetteChatModel: A copy with the tools bound.
+
+        """
+        live = self.live.bind_tools(tools, **kwargs) if self.live is not None else None
+        return self.model_copy(update={
+            "live": live,
+            "tools": [convert_to_openai_tool(tool) for tool in tools],
+            "tool_kwargs": kwargs,
+        })
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        key = self._key(messages, stop, kwargs)
+        entry = self.cassette.replay(key)
+        if entry is not None:
+            time.sleep(self.cassette.delay(entry))
+            return _chat_result(entry)
+        start = time.perf_counter()
+        message = self._live().invoke(messages, stop=stop, **kwargs)
+        return self._record(key, message, time.perf_counter() - start)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        key = self._key(messages, stop, kwargs)
+        entry = self.cassette.replay(key)
+        if entry is not None:
+            await asyncio.sleep(self.cassette.delay(entry))
+            return _chat_result(entry)
+        start = time.perf_counter()
+        message = await self._live().ainvoke(messages, stop=stop, **kwargs)
+        return self._record(key, message, time.perf_counter() - start)
+
+    def _key(
+        self, messages: list[BaseMessage], stop: list[str] | None, kwargs: dict,
+    ) -> str:
+        return self.cassette.key("model", self.recorded_name, {
+            "messages": [_message_key(message) for message in messages],
+            "tools": self.tools,
+            "tool_kwargs": self.tool_kwargs,
+            "stop": stop,
+            "kwargs": kwargs,
+        })
+
+    def _live(self) -> Runnable:
+        if self.live is None:
+            msg = f"No live model to record {self.recorded_name} with"
+            raise LookupError(msg)
+        return self.live
+
+    def _record(self, key: str, message: BaseMessage, latency: float) -> ChatResult:
+        entry = {
+            "kind": "model",
+            "name": self.recorded_name,
+            "latency": latency,
+            "message": message_to_dict(message),
+        }
+        self.cassette.record(key, entry)
+        return _chat_result(entry)
+
+
+def _message_key(message: BaseMessage) -> dict:
+    """Describe a message by what the model sees, without ids and metadata."""
+    key = {"type": message.type, "content": message.content}
+    if isinstance(message, AIMessage) and message.tool_calls:
+        key["tool_calls"] = [
+            {"name": call["name"], "args": call["args"], "id": call["id"]}
+            for call in message.tool_calls
+        ]
+    if isinstance(message, ToolMessage):
+        key["tool_call_id"] = message.tool_call_id
+    return key
+
+
+def _chat_result(entry: dict) -> ChatResult:
+    message = messages_from_dict([entry["message"]])[0]
+    return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _tool_call(tool: BaseTool, kwargs: dict) -> dict:
+    return {"type": "tool_call", "name": tool.name, "args": kwargs, "id": "cassette"}
+
+
+def _tool_output(tool: BaseTool, entry: dict) -> Any:  # noqa: ANN401
+    if tool.response_format != "content_and_artifact":
+        return entry["content"]
+    with warnings.catch_warnings():
+        # Reviving LangChain objects such as Documents is a beta API.
+        warnings.simplefilter("ignore")
+        artifact = load(entry["artifact"], allowed_objects="core")
+    return entry["content"], artifact
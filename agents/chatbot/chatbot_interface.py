@@ -1,17 +1,27 @@
-import uuid
+from __future__ import annotations
+
+import asyncio
+import copy
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Generator
 
-from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import BaseMessage
-from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import BaseMessage
+    from langchain_core.prompts import ChatPromptTemplate
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from pydantic import BaseModel
+
+    from agents.chatbot.streaming import VerdictEvent
 
 
 class ChatbotInterface(ABC):
     """An abstract base class for chatbots."""
 
     model: BaseChatModel
+    id: str
 
     @abstractmethod
     def __init__(
@@ -19,7 +29,7 @@ class ChatbotInterface(ABC):
         model: BaseChatModel,
         prompt: ChatPromptTemplate | str,
         schema: type[BaseModel] | dict | None = None,
-        id_: str = str(uuid.uuid4()),
+        id_: str | None = None,
     ) -> None:
         """Create a new chatbot instance.
 
@@ -31,8 +41,8 @@ class ChatbotInterface(ABC):
             schema (type[BaseModel] | dict | None): Optional Pydantic
                 model class or JSON schema dict to enable structured
                 output.
-            id_ (str, optional): Id used to distinguish conversations.
-                Defaults to a UUID.
+            id_ (str | None): Id used to distinguish conversations.
+                Defaults to a new UUID.
 
         """
         msg = "__init__ method not implemented."
@@ -72,3 +82,115 @@ class ChatbotInterface(ABC):
         """
         msg = "stream_chat method not implemented."
         raise NotImplementedError(msg)
+
+    async def achat(self, user_input: str) -> BaseMessage:
+        """Asynchronously generate a response from the chatbot.
+
+        The default implementation runs the blocking ``chat`` in a worker
+        thread. Children should override it with a native async version.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Returns:
+            BaseMessage: The chatbot's last response message.
+
+        """
+        return await asyncio.to_thread(self.chat, user_input)
+
+    async def astream_chat(self, user_input: str) -> AsyncGenerator[str, None]:
+        """Asynchronously generate a response from the chatbot word by word.
+
+        The default implementation pulls chunks from the blocking
+        ``stream_chat`` in a worker thread. Children should override it
+        with a native async version.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[str, None]: The chatbot's response message,
+            one word at a time.
+
+        """
+        iterator = iter(self.stream_chat(user_input))
+        sentinel = object()
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, sentinel)
+            if chunk is sentinel:
+                break
+            yield chunk
+
+    def stream_verdict(
+        self, user_input: str,
+    ) -> Generator[VerdictEvent, None, None]:
+        """Generate the chatbot's verdict field by field.
+
+        The default implementation waits for the whole response of
+        ``chat``. Children should override it to emit the label as soon as
+        the model decides it, followed by increments of the explanation.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            Generator[VerdictEvent, None, None]: The label, then the
+            explanation text.
+
+        """
+        from agents.chatbot.streaming import verdict_events
+
+        yield from verdict_events(
+            self.chat(user_input), getattr(self, "schema", None),
+        )
+
+    async def astream_verdict(
+        self, user_input: str,
+    ) -> AsyncGenerator[VerdictEvent, None]:
+        """Asynchronously generate the chatbot's verdict field by field.
+
+        The default implementation waits for the whole response of
+        ``achat``.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[VerdictEvent, None]: The label, then the
+            explanation text.
+
+        """
+        from agents.chatbot.streaming import verdict_events
+
+        response = await self.achat(user_input)
+        for event in verdict_events(response, getattr(self, "schema", None)):
+            yield event
+
+    def with_id(self, id_: str) -> ChatbotInterface:
+        """Return a copy of the chatbot bound to another conversation.
+
+        The copy shares the model, tools, compiled graph and checkpointer
+        with the original, so it is cheap to create. Conversations are kept
+        apart by their thread ids.
+
+        Args:
+            id_ (str): Id of the conversation the copy is bound to.
+
+        Returns:
+            ChatbotInterface: The chatbot bound to the given conversation.
+
+        """
+        chatbot = copy.copy(self)
+        chatbot.id = id_
+        return chatbot
+
+    def checkpoint_threads(self) -> list[tuple[BaseCheckpointSaver, str]]:
+        """Get the checkpointer threads holding the current conversation.
+
+        Returns:
+            list[tuple[BaseCheckpointSaver, str]]: The checkpointer and
+            thread id of each part of the conversation history. Empty if
+            the chatbot does not keep any history.
+
+        """
+        return []
@@ -0,0 +1,131 @@
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.logger.logger import get_logger
+
+logger = get_logger()
+
+
+class ChatbotPool:
+    """A size-limited pool of warm, pre-compiled chatbots.
+
+    Each key holds one template chatbot built by a factory. Callers get
+    cheap copies of the template bound to their own conversation ids, so
+    the chat model client, tools and compiled graph are built once per key.
+    The least recently used template is evicted when the pool is full.
+    Templates are built outside the pool's lock, so a slow build only
+    blocks the callers waiting for the same key.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the ChatbotPool.
+
+        Args:
+            max_size (int): Maximum number of templates kept in the pool.
+
+        """
+        if max_size < 1:
+            msg = "max_size must be at least 1"
+            raise ValueError(msg)
+        self.max_size = max_size
+        self._templates: OrderedDict[Hashable, ChatbotInterface] = OrderedDict()
+        self._building: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], ChatbotInterface],
+        id_: str | None = None,
+    ) -> ChatbotInterface:
+        """Get a chatbot for the key bound to a conversation id.
+
+        Args:
+            key (Hashable): Key describing the chatbot configuration.
+            factory (Callable[[], ChatbotInterface]): Builds the template
+                chatbot when the key is not pooled yet.
+            id_ (str | None): Id of the conversation. Defaults to a new
+                UUID.
+
+        Returns:
+            ChatbotInterface: A chatbot bound to the conversation.
+
+        Raises:
+            Exception: The error raised by the factory, to every caller
+                waiting for the same key.
+
+        """
+        with self._lock:
+            template = self._templates.get(key)
+            build = self._building.get(key)
+            builder = template is None and build is None
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+            elif builder:
+                build = self._building[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if builder:
+            template = self._build(key, factory, build)
+        elif template is None:
+            template = build.result()
+        return template.with_id(id_ or str(uuid.uuid4()))
+
+    def clear(self) -> None:
+        """Drop all pooled chatbots."""
+        with self._lock:
+            self._templates.clear()
+
+    def __len__(self) -> int:
+        """Get the number of pooled chatbots."""
+        return len(self._templates)
+
+    def stats(self) -> dict:
+        """Get pool usage statistics.
+
+        Returns:
+            dict: The pool "size", "max_size", "hits", "misses" and
+            "evictions".
+
+        """
+        return {
+            "size": len(self._templates),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _build(
+        self,
+        key: Hashable,
+        factory: Callable[[], ChatbotInterface],
+        build: Future,
+    ) -> ChatbotInterface:
+        logger.info(f"Building pooled chatbot for key: {key}")
+        try:
+            template = factory()
+        except BaseException as e:
+            with self._lock:
+                del self._building[key]
+            build.set_exception(e)
+            raise
+        with self._lock:
+            del self._building[key]
+            self._templates[key] = template
+            while len(self._templates) > self.max_size:
+                evicted_key, _ = self._templates.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"Evicted pooled chatbot for key: {evicted_key}")
+        build.set_result(template)
+        return template
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from agents.chatbot.llms.token_counter import MessageTokenCounter, TokenCounter
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+if TYPE_CHECKING:
+    from langchain.agents.middleware import AgentState
+    from langgraph.runtime import Runtime
+
+logger = get_logger()
+settings = get_settings()
+
+
+class HistoryCompactionMiddleware(AgentMiddleware):
+    """Compacts old tool outputs once the history exceeds a token budget.
+
+    Retrieved chunks, search results and paper abstracts make up most of an
+    agent's history and are re-sent on every turn. Before each model call,
+    the most recent turns are kept verbatim and the outputs of older tool
+    calls, oldest first, are cut down to a short preview until the history
+    fits the budget. The compacted messages replace the originals in the
+    checkpointed state, so they are not re-sent in full on later turns.
+
+    Token counts are cached per message, so the history is not re-counted
+    on every model call.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int | None = None,
+        keep_turns: int | None = None,
+        preview_chars: int = 200,
+        token_counter: TokenCounter = count_tokens_approximately,
+        cache_size: int = 10_000,
+    ) -> None:
+        """Initialize the HistoryCompactionMiddleware.
+
+        Args:
+            max_tokens (int | None): Token budget of the history. Defaults
+                to ``Settings.history_token_budget``.
+            keep_turns (int | None): Number of most recent user turns kept
+                verbatim. Defaults to ``Settings.history_keep_turns``.
+            preview_chars (int): Characters of a compacted tool output
+                kept as its preview. 0 drops the output entirely.
+            token_counter (TokenCounter): Counts the tokens of messages.
+            cache_size (int): Maximum number of cached token counts.
+
+        Raises:
+            ValueError: If max_tokens or keep_turns is not positive.
+
+        """
+        super().__init__()
+        self.max_tokens = max_tokens or settings.history_token_budget
+        self.keep_turns = keep_turns or settings.history_keep_turns
+        if self.max_tokens < 1 or self.keep_turns < 1:
+            msg = "max_tokens and keep_turns must be positive"
+            raise ValueError(msg)
+        self.preview_chars = preview_chars
+        self.token_counter = MessageTokenCounter(token_counter, cache_size)
+
+    def before_model(
+        self, state: AgentState, runtime: Runtime,
+    ) -> dict[str, Any] | None:
+        """Compact the history before the model is called.
+
+        Args:
+            state (AgentState): The agent state holding the messages.
+            runtime (Runtime): The runtime of the agent.
+
+        Returns:
+            dict[str, Any] | None: The compacted tool messages, which
+            replace the originals by id, or None if the history fits.
+
+        """
+        messages = state["messages"]
+        counts = [self.count_tokens(message) for message in messages]
+        total = sum(counts)
+        if total <= self.max_tokens:
+            return None
+
+        compacted = []
+        for index in range(self._recent_start(messages)):
+            message = messages[index]
+            if (
+                not isinstance(message, ToolMessage)
+                or message.id is None
+                or message.additional_kwargs.get("compacted")
+                or len(message.text) <= self.preview_chars
+            ):
+                continue
+            replacement = self._compact(message)
+            total += self.count_tokens(replacement) - counts[index]
+            compacted.append(replacement)
+            if total <= self.max_tokens:
+                break
+
+        if not compacted:
+            return None
+        logger.info(
+            f"Compacted {len(compacted)} tool messages, "
+            f"history is now about {total} tokens",
+        )
+        return {"messages": compacted}
+
+    def count_tokens(self, message: BaseMessage) -> int:
+        """Count the tokens of a message, using the cache when possible.
+
+        Args:
+            message (BaseMessage): The message to count.
+
+        Returns:
+            int: The number of tokens of the message.
+
+        """
+        return self.token_counter.count(message)
+
+    def _recent_start(self, messages: list[BaseMessage]) -> int:
+        """Find the index of the oldest user turn kept verbatim."""
+        turns = 0
+        for index in range(len(messages) - 1, -1, -1):
+            if isinstance(messages[index], HumanMessage):
+                turns += 1
+                if turns == self.keep_turns:
+                    return index
+        return 0
+
+    def _compact(self, message: ToolMessage) -> ToolMessage:
+        text = message.text
+        preview = text[:self.preview_chars]
+        note = (
+            f"[Output of {message.name or 'tool'} compacted from "
+            f"{len(text)} characters"
+        )
+        content = f"{note}]\n{preview}" if preview else f"{note}]"
+        return message.model_copy(update={
+            "content": content,
+            "additional_kwargs": {**message.additional_kwargs, "compacted": True},
+        })
@@ -2,7 +2,9 @@ import os
 
 from langchain_anthropic import ChatAnthropic
 
+from agents.chatbot.llms.client_registry import client_registry
 from agents.chatbot.llms.llm import LLM
+from agents.chatbot.llms.rate_limiter import rate_limiter_kwargs
 
 
 class AnthropicLLM(LLM):
@@ -12,10 +14,18 @@ class AnthropicLLM(LLM):
     def get_chat_model(
         cls, model_name: str = "claude-3-7-sonnet-latest",
     ) -> ChatAnthropic:
-        """Get the Anthropic chat model instance."""
+        """Get the shared Anthropic chat model instance."""
         if "ANTHROPIC_API_KEY" not in os.environ:
             msg = "ANTHROPIC_API_KEY environment variable not set."
             raise ValueError(msg)
-        return ChatAnthropic(
-            model_name=model_name, timeout=120, stop=["\n\nHuman:"],
+        return client_registry.get(
+            "anthropic",
+            model_name,
+            lambda: ChatAnthropic(
+                model_name=model_name,
+                timeout=120,
+                stop=["\n\nHuman:"],
+                **rate_limiter_kwargs("anthropic"),
+            ),
+            timeout=120,
         )
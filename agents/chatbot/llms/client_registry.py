@@ -0,0 +1,105 @@
+import threading
+from collections import Counter
+from collections.abc import Callable
+from typing import TypeVar
+
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class ClientRegistry:
+    """A process-wide registry of chat model clients.
+
+    Every chat model owns its provider client, with its own HTTP connection
+    pool or gRPC channel. Building a new model for every chatbot, evaluator
+    and session therefore opens new connections and pays a TLS handshake on
+    each of them. The registry builds one pool of clients per provider,
+    model and parameters and hands them out round-robin, so all callers
+    share warm connections.
+    """
+
+    def __init__(self, pool_size: int | None = None) -> None:
+        """Initialize the ClientRegistry.
+
+        Args:
+            pool_size (int | None): Number of clients per configuration.
+                More than one spreads concurrent requests over several
+                connections. Defaults to ``Settings.llm_pool_size``.
+
+        Raises:
+            ValueError: If pool_size is not positive.
+
+        """
+        if pool_size is None:
+            pool_size = settings.llm_pool_size
+        if pool_size < 1:
+            msg = "pool_size must be at least 1"
+            raise ValueError(msg)
+        self.pool_size = pool_size
+        self._pools: dict[tuple, list] = {}
+        self._next: Counter = Counter()
+        self._stats: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def get(
+        self, provider: str, model_name: str, factory: Callable[[], T], **params,
+    ) -> T:
+        """Get a shared client, building it on first use.
+
+        Args:
+            provider (str): Name of the provider, e.g. "google".
+            model_name (str): Name of the model.
+            factory (Callable[[], T]): Builds a new client.
+            **params: Parameters the client is built with. Clients with
+                different parameters are never shared.
+
+        Returns:
+            T: The next client of the configuration's pool.
+
+        """
+        key = (provider, model_name, tuple(sorted(params.items())))
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if len(pool) < self.pool_size:
+                logger.info(f"Creating {provider} client for {model_name}")
+                pool.append(factory())
+                self._stats["created"] += 1
+            else:
+                self._stats["reused"] += 1
+            client = pool[self._next[key] % len(pool)]
+            self._next[key] += 1
+        return client
+
+    def clear(self) -> None:
+        """Forget all clients, so the next requests build new ones."""
+        with self._lock:
+            self._pools.clear()
+            self._next.clear()
+
+    def __len__(self) -> int:
+        """Return the number of clients in the registry."""
+        with self._lock:
+            return sum(len(pool) for pool in self._pools.values())
+
+    def stats(self) -> dict[str, int]:
+        """Report how often clients were created and reused.
+
+        Returns:
+            dict[str, int]: The number of clients, of clients created and
+            of requests served by an existing client.
+
+        """
+        with self._lock:
+            return {
+                "clients": sum(len(pool) for pool in self._pools.values()),
+                "created": self._stats["created"],
+                "reused": self._stats["reused"],
+            }
+
+
+client_registry = ClientRegistry()
@@ -2,7 +2,9 @@ import os
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from agents.chatbot.llms.client_registry import client_registry
 from agents.chatbot.llms.llm import LLM
+from agents.chatbot.llms.rate_limiter import rate_limiter_kwargs
 
 
 class GoogleLLM(LLM):
@@ -12,8 +14,15 @@ class GoogleLLM(LLM):
     def get_chat_model(
         cls, model_name: str = "gemini-2.5-flash",
     ) -> ChatGoogleGenerativeAI:
-        """Get the Google chat model instance."""
+        """Get the shared Google chat model instance."""
         if "GOOGLE_API_KEY" not in os.environ:
             msg = "GOOGLE_API_KEY environment variable not set."
             raise ValueError(msg)
-        return ChatGoogleGenerativeAI(model=model_name, max_tokens=1024)
+        return client_registry.get(
+            "google",
+            model_name,
+            lambda: ChatGoogleGenerativeAI(
+                model=model_name, max_tokens=1024, **rate_limiter_kwargs("google"),
+            ),
+            max_tokens=1024,
+        )
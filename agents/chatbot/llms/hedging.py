@@ -0,0 +1,522 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Sequence,
+)
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManager,
+    AsyncCallbackManagerForLLMRun,
+    CallbackManager,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage, BaseMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.constants import TAG_NOSTREAM
+from pydantic import Field, PrivateAttr
+
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+
+class HedgePool:
+    """Thread pool of the synchronous hedged calls that tracks its load."""
+
+    def __init__(self, workers: int) -> None:
+        """Initialize the HedgePool.
+
+        Args:
+            workers (int): Number of threads.
+
+        """
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="hedge",
+        )
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:  # noqa: ANN401
+        """Run a function on the pool.
+
+        Args:
+            fn (Callable[..., Any]): The function to run.
+            *args: Arguments passed to the function.
+
+        Returns:
+            Future: The future of the call.
+
+        """
+        with self.lock:
+            self.in_flight += 1
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def saturated(self) -> bool:
+        """Whether every thread is busy, so a new call would be queued."""
+        with self.lock:
+            return self.in_flight >= self.workers
+
+    def _release(self, _: Future | None = None) -> None:
+        with self.lock:
+            self.in_flight -= 1
+
+
+_pool = HedgePool(settings.hedge_workers)
+
+
+class HedgeStats:
+    """Latency history and counters shared by a model and its bound copies."""
+
+    def __init__(self, window: int) -> None:
+        """Initialize the HedgeStats.
+
+        Args:
+            window (int): Number of recent primary latencies kept.
+
+        """
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.counts: Counter = Counter()
+        self.saved = 0.0
+        self.lock = threading.Lock()
+
+    def threshold(
+        self, percentile: float, min_samples: int, initial_delay: float,
+    ) -> float:
+        """Return the seconds after which a call is hedged.
+
+        Args:
+            percentile (float): Percentile of the recent latencies.
+            min_samples (int): Latencies needed before the percentile is used.
+            initial_delay (float): Threshold used until then.
+
+        Returns:
+            float: The threshold in seconds.
+
+        """
+        with self.lock:
+            if len(self.latencies) < min_samples:
+                return initial_delay
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+    def record(self, latency: float) -> None:
+        """Add the latency of a primary call to the history."""
+        with self.lock:
+            self.latencies.append(latency)
+
+    def count(self, event: str) -> None:
+        """Increment the counter of an event."""
+        with self.lock:
+            self.counts[event] += 1
+
+    def add_saved(self, seconds: float) -> None:
+        """Add the seconds a hedge answered before the primary call."""
+        with self.lock:
+            self.saved += seconds
+
+
+class HedgedChatModel(BaseChatModel):
+    """Hedges slow calls of a chat model with a duplicate request.
+
+    A call that has not answered once it is slower than a percentile of
+    the recent calls is sent again, to the same model or to a secondary
+    one, and the first good answer wins. The other request is cancelled,
+    or, for synchronous calls whose threads cannot be interrupted, left to
+    finish with its result discarded. A call that fails is sent to the
+    backup right away. Streams are hedged on the time to their first
+    chunk. The calls of the wrapped models report to the callbacks of the
+    hedged call, so they are traced and their usage is counted.
+
+    Synchronous calls share a pool of ``Settings.hedge_workers`` threads.
+    Their hedge timer starts when the primary request starts running, not
+    while it waits for a thread, and no hedge is sent while every thread
+    is busy, since it would only wait in the same queue.
+
+    Tools bound to the wrapper are bound to both models, so it can serve
+    agents and structured output like the models it wraps.
+    """
+
+    primary: Runnable
+    secondary: Runnable | None = None
+    percentile: float = Field(
+        default_factory=lambda: settings.hedge_percentile, gt=0, lt=1,
+    )
+    min_samples: int = Field(default_factory=lambda: settings.hedge_min_samples)
+    initial_delay: float = Field(
+        default_factory=lambda: settings.hedge_initial_delay, gt=0,
+    )
+    window: int = Field(default=200, ge=1)
+
+    _stats: HedgeStats = PrivateAttr()
+
+    def model_post_init(self, context: Any) -> None:  # noqa: ANN401
+        """Create the latency history of the model."""
+        super().model_post_init(context)
+        self._stats = HedgeStats(self.window)
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def model_name(self) -> str:
+        """Name of the primary model and of the backup it hedges to."""
+        backup = self.secondary if self.secondary is not None else self.primary
+        return f"{_model_name(self.primary)}|hedge:{_model_name(backup)}"
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | Callable | BaseTool],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> HedgedChatModel:
+        """Bind tools to the primary and the secondary model.
+
+        Args:
+            tools (Sequence[dict[str, Any] | type | Callable | BaseTool]):
+                The tools to bind.
+            **kwargs: Arguments passed to the models' ``bind_tools``.
+
+        Returns:
+            HedgedChatModel: A copy hedging between the bound models. It
+            shares the latency history and statistics of this model.
+
+        """
+        update = {"primary": self.primary.bind_tools(tools, **kwargs)}
+        if self.secondary is not None:
+            update["secondary"] = self.secondary.bind_tools(tools, **kwargs)
+        return self.model_copy(update=update)
+
+    def stats(self) -> dict[str, float]:
+        """Report how often calls were hedged and what it saved.
+
+        Returns:
+            dict[str, float]: The number of calls, hedges, hedges answered
+            first by the backup, hedges skipped because the thread pool was
+            busy and failovers, the hedge rate, the current threshold and
+            the seconds saved on calls whose outrun primary request still
+            finished.
+
+        """
+        threshold = self._threshold()
+        with self._stats.lock:
+            counts = self._stats.counts
+            return {
+                "calls": counts["calls"],
+                "hedges": counts["hedges"],
+                "hedge_wins": counts["hedge_wins"],
+                "hedges_skipped": counts["hedges_skipped"],
+                "failovers": counts["failovers"],
+                "hedge_rate": counts["hedges"] / counts["calls"] if counts["calls"] else 0.0,
+                "threshold": threshold,
+                "latency_saved": self._stats.saved,
+            }
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        config = _child_config(run_manager)
+        message = self._race(
+            lambda model: model.invoke(messages, config, stop=stop, **kwargs),
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        config = _child_config(run_manager)
+        message = await self._arace(
+            lambda model: model.ainvoke(messages, config, stop=stop, **kwargs),
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Iterator[ChatGenerationChunk]:
+        """Stream from whichever model sends its first chunk first.
+
+        The hedge covers the time to the first chunk only. Once a model
+        has started streaming, its errors are raised rather than retried.
+        """
+        config = _child_config(run_manager)
+
+        def first_chunk(model: Runnable) -> tuple[BaseMessage | None, Iterator]:
+            chunks = model.stream(messages, config, stop=stop, **kwargs)
+            return next(chunks, None), chunks
+
+        chunk, chunks = self._race(first_chunk, discard=lambda race: race[1].close())
+        try:
+            while chunk is not None:
+                yield ChatGenerationChunk(message=_as_chunk(chunk))
+                chunk = next(chunks, None)
+        finally:
+            chunks.close()
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Asynchronously stream from whichever model answers first.
+
+        Like ``_stream``, only the time to the first chunk is hedged.
+        """
+        config = _child_config(run_manager)
+
+        async def first_chunk(
+            model: Runnable,
+        ) -> tuple[BaseMessage | None, AsyncIterator]:
+            chunks = model.astream(messages, config, stop=stop, **kwargs)
+            return await anext(chunks, None), chunks
+
+        chunk, chunks = await self._arace(
+            first_chunk, discard=lambda race: race[1].aclose(),
+        )
+        try:
+            while chunk is not None:
+                yield ChatGenerationChunk(message=_as_chunk(chunk))
+                chunk = await anext(chunks, None)
+        finally:
+            await chunks.aclose()
+
+    def _race(
+        self,
+        call: Callable[[Runnable], Any],
+        discard: Callable[[Any], Any] | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Run the call on the primary and hedge it on the backup if slow.
+
+        Args:
+            call (Callable[[Runnable], Any]): Calls a model.
+            discard (Callable[[Any], Any] | None): Releases the result of
+                a call that lost the race.
+
+        Returns:
+            Any: The result of the first call that succeeded.
+
+        """
+        self._stats.count("calls")
+        started: Future = Future()
+
+        def run_primary(model: Runnable) -> Any:  # noqa: ANN401
+            started.set_result(time.perf_counter())
+            return call(model)
+
+        def submit(fn: Callable[[Runnable], Any], model: Runnable) -> Future:
+            return _pool.submit(contextvars.copy_context().run, fn, model)
+
+        calls = {submit(run_primary, self.primary): "primary"}
+        # The timer starts once the primary leaves the queue of the pool.
+        start = deadline = None
+        backup_sent = False
+        errors = []
+        while calls:
+            waiting = set(calls) if start is not None else {*calls, started}
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            done, _ = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+            if started in done:
+                start = started.result()
+                deadline = start + self._threshold()
+                continue
+            if not done:
+                deadline = None
+                if _pool.saturated():
+                    self._stats.count("hedges_skipped")
+                    logger.debug("Not hedging, every hedge worker is busy")
+                    continue
+                calls[submit(call, self._backup)] = "backup"
+                backup_sent = True
+                self._stats.count("hedges")
+                continue
+            for future in done:
+                role = calls.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    if not backup_sent:
+                        calls[submit(call, self._backup)] = "backup"
+                        backup_sent = True
+                        deadline = None
+                        self._failover(e)
+                    continue
+                answered = time.perf_counter()
+                if role == "primary":
+                    self._stats.record(answered - start)
+                else:
+                    self._stats.count("hedge_wins")
+                    for pending in calls:
+                        pending.add_done_callback(
+                            lambda f: self._record_outrun(f, start, answered),
+                        )
+                for pending in calls:
+                    pending.cancel()
+                    if discard is not None:
+                        pending.add_done_callback(lambda f: _discard(f, discard))
+                return result
+        raise errors[0]
+
+    async def _arace(
+        self,
+        call: Callable[[Runnable], Awaitable[Any]],
+        discard: Callable[[Any], Awaitable[Any]] | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Await the call on the primary and hedge it on the backup if slow.
+
+        The call that loses the race is cancelled.
+
+        Args:
+            call (Callable[[Runnable], Awaitable[Any]]): Calls a model.
+            discard (Callable[[Any], Awaitable[Any]] | None): Releases the
+                result of a call that finished but lost the race.
+
+        Returns:
+            Any: The result of the first call that succeeded.
+
+        """
+        self._stats.count("calls")
+        start = time.perf_counter()
+
+        def submit(model: Runnable) -> asyncio.Task:
+            return asyncio.ensure_future(call(model))
+
+        calls = {submit(self.primary): "primary"}
+        deadline = start + self._threshold()
+        backup_sent = False
+        errors = []
+        try:
+            while calls:
+                timeout = None if backup_sent else max(0.0, deadline - time.perf_counter())
+                done, _ = await asyncio.wait(
+                    calls, timeout=timeout, return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    calls[submit(self._backup)] = "backup"
+                    backup_sent = True
+                    self._stats.count("hedges")
+                    continue
+                for task in done:
+                    role = calls.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        errors.append(e)
+                        if not backup_sent:
+                            calls[submit(self._backup)] = "backup"
+                            backup_sent = True
+                            self._failover(e)
+                        continue
+                    # A cancelled primary is at least as slow as the hedge,
+                    # which keeps the tail in the history.
+                    if role == "primary" or "primary" in calls.values():
+                        self._stats.record(time.perf_counter() - start)
+                    if role == "backup":
+                        self._stats.count("hedge_wins")
+                    return result
+        finally:
+            for task in calls:
+                task.cancel()
+                if (
+                    discard is not None and task.done() and not task.cancelled()
+                    and task.exception() is None
+                ):
+                    await discard(task.result())
+        raise errors[0]
+
+    @property
+    def _backup(self) -> Runnable:
+        return self.secondary if self.secondary is not None else self.primary
+
+    def _threshold(self) -> float:
+        return self._stats.threshold(
+            self.percentile, self.min_samples, self.initial_delay,
+        )
+
+    def _failover(self, error: Exception) -> None:
+        self._stats.count("failovers")
+        logger.warning(f"Primary model failed, failing over: {error}")
+
+    def _record_outrun(self, future: Future, start: float, answered: float) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        finished = time.perf_counter()
+        self._stats.record(finished - start)
+        self._stats.add_saved(finished - answered)
+
+
+def _child_config(
+    run_manager: CallbackManagerForLLMRun | AsyncCallbackManagerForLLMRun | None,
+) -> RunnableConfig | None:
+    """Pass the callbacks of the hedged run on to the calls of the models.
+
+    The calls are tagged so that LangGraph does not stream their tokens
+    twice, once from the model and once from this wrapper.
+    """
+    if run_manager is None:
+        return None
+    if isinstance(run_manager, AsyncCallbackManagerForLLMRun):
+        manager = AsyncCallbackManager([], parent_run_id=run_manager.run_id)
+    else:
+        manager = CallbackManager([], parent_run_id=run_manager.run_id)
+    manager.set_handlers(run_manager.inheritable_handlers)
+    manager.add_tags(run_manager.inheritable_tags)
+    manager.add_tags([TAG_NOSTREAM], inherit=False)
+    manager.add_metadata(run_manager.inheritable_metadata)
+    return RunnableConfig(callbacks=manager)
+
+
+def _as_chunk(message: BaseMessage) -> BaseMessageChunk:
+    # Models without native streaming yield their whole answer as a message.
+    if isinstance(message, BaseMessageChunk):
+        return message
+    return AIMessageChunk(**message.model_dump(exclude={"type"}))
+
+
+def _discard(future: Future, discard: Callable[[Any], Any]) -> None:
+    if not future.cancelled() and future.exception() is None:
+        discard(future.result())
+
+
+def _model_name(model: Runnable) -> str:
+    model = getattr(model, "bound", model)
+    return (
+        getattr(model, "model", None)
+        or getattr(model, "model_name", None)
+        or type(model).__name__
+    )
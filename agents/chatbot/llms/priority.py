@@ -0,0 +1,234 @@
+import asyncio
+import contextlib
+import threading
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+from agents.settings import get_settings
+
+settings = get_settings()
+
+
+class Priority(IntEnum):
+    """Traffic classes of LLM calls, most urgent first."""
+
+    INTERACTIVE = 0
+    API = 1
+    BULK = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "current_priority", default=Priority.API,
+)
+
+
+def current_priority() -> Priority:
+    """Get the priority class of the calls made in the current context.
+
+    Returns:
+        Priority: The class set by the innermost ``priority_class``, or
+        ``Priority.API`` outside of one.
+
+    """
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_class(priority: Priority) -> Iterator[None]:
+    """Tag the LLM calls made inside the block with a priority class.
+
+    The class is stored in a context variable, so it follows asyncio tasks
+    and ``asyncio.to_thread``. Work handed to other threads must be run in
+    a copy of the context to keep it.
+
+    Args:
+        priority (Priority): The class of the calls.
+
+    Yields:
+        None: Control to the block.
+
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class AsyncWaiters:
+    """Futures of async waiters, resolved when a condition is notified.
+
+    Async callers cannot block on a ``threading.Condition``. Each one
+    registers a future of its event loop instead, while holding the lock
+    of the condition, and waits for it. ``notify_all`` resolves the futures
+    from any thread, so sync and async callers on any loop wake each other.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the AsyncWaiters."""
+        self._futures: dict[asyncio.Future, asyncio.AbstractEventLoop] = {}
+
+    def add(self) -> asyncio.Future:
+        """Register a future of the running event loop.
+
+        Must be called with the lock of the condition held.
+
+        Returns:
+            asyncio.Future: The future resolved by the next notification.
+
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[future] = loop
+        return future
+
+    def discard(self, future: asyncio.Future) -> None:
+        """Stop tracking a future, e.g. once its waiter stopped waiting."""
+        self._futures.pop(future, None)
+
+    def notify_all(self) -> None:
+        """Resolve every registered future.
+
+        Must be called with the lock of the condition held.
+        """
+        for future, loop in self._futures.items():
+            # The loop of an abandoned waiter may be closed already.
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(_resolve, future)
+        self._futures.clear()
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class PriorityGate:
+    """Caps the number of concurrent calls of each priority class.
+
+    A large evaluation run would otherwise occupy every connection and
+    rate limit slot the interactive users need. Calls beyond the cap of
+    their class wait for a slot of the same class, while the other classes
+    keep going.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int | None] | None = None,
+    ) -> None:
+        """Initialize the PriorityGate.
+
+        Args:
+            limits (dict[str, int | None] | None): Maximum concurrent calls
+                per class name, e.g. ``{"bulk": 8}``. Missing or None
+                classes are unlimited. Defaults to
+                ``Settings.priority_concurrency``.
+
+        Raises:
+            ValueError: If a class is unknown or a limit is not positive.
+
+        """
+        if limits is None:
+            limits = settings.priority_concurrency
+        self.limits: dict[Priority, int | None] = {}
+        for name, limit in limits.items():
+            if name.upper() not in Priority.__members__:
+                msg = f"Unknown priority class: {name}"
+                raise ValueError(msg)
+            if limit is not None and limit < 1:
+                msg = "Concurrency limits must be at least 1"
+                raise ValueError(msg)
+            self.limits[Priority[name.upper()]] = limit
+        self._condition = threading.Condition()
+        self._async_waiters = AsyncWaiters()
+        self._in_flight: Counter = Counter()
+        self._waiting: Counter = Counter()
+
+    @contextmanager
+    def slot(self, priority: Priority | None = None) -> Iterator[None]:
+        """Hold a slot of a class for the duration of the block.
+
+        Args:
+            priority (Priority | None): The class of the call. Defaults to
+                the class of the current context.
+
+        Yields:
+            None: Control to the block, once a slot is free.
+
+        """
+        priority = current_priority() if priority is None else priority
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                self._condition.wait_for(lambda: self._has_slot(priority))
+            finally:
+                self._waiting[priority] -= 1
+            self._in_flight[priority] += 1
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    @asynccontextmanager
+    async def aslot(self, priority: Priority | None = None) -> AsyncIterator[None]:
+        """Asynchronously hold a slot of a class for the duration of the block.
+
+        Args:
+            priority (Priority | None): The class of the call. Defaults to
+                the class of the current context.
+
+        Yields:
+            None: Control to the block, once a slot is free.
+
+        """
+        priority = current_priority() if priority is None else priority
+        with self._condition:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._condition:
+                    if self._has_slot(priority):
+                        self._in_flight[priority] += 1
+                        break
+                    waiter = self._async_waiters.add()
+                try:
+                    await waiter
+                finally:
+                    with self._condition:
+                        self._async_waiters.discard(waiter)
+        finally:
+            with self._condition:
+                self._waiting[priority] -= 1
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def stats(self) -> dict[str, int]:
+        """Report the calls of each class.
+
+        Returns:
+            dict[str, int]: The number of running and of waiting calls per
+            class, e.g. ``bulk_in_flight`` and ``bulk_waiting``.
+
+        """
+        with self._condition:
+            stats = {}
+            for priority in Priority:
+                name = priority.name.lower()
+                stats[f"{name}_in_flight"] = self._in_flight[priority]
+                stats[f"{name}_waiting"] = self._waiting[priority]
+            return stats
+
+    def _has_slot(self, priority: Priority) -> bool:
+        limit = self.limits.get(priority)
+        return limit is None or self._in_flight[priority] < limit
+
+    def _release(self, priority: Priority) -> None:
+        with self._condition:
+            self._in_flight[priority] -= 1
+            self._condition.notify_all()
+            self._async_waiters.notify_all()
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 import yaml
@@ -7,9 +8,14 @@ from langchain_core.prompts import (
     SystemMessagePromptTemplate,
 )
 
-prompts_file = Path("agents/chatbot/llms/prompts/prompts.yaml")
-with prompts_file.open() as file:
-    prompts = yaml.safe_load(file)
+prompts_file = Path(__file__).parent / "prompts.yaml"
+
+
+@cache
+def load_prompts() -> dict:
+    """Load the prompts file once, on first use."""
+    with prompts_file.open() as file:
+        return yaml.safe_load(file)
 
 
 def get_detector_prompt() -> ChatPromptTemplate:
@@ -17,7 +23,7 @@ def get_detector_prompt() -> ChatPromptTemplate:
     return ChatPromptTemplate.from_messages(
         [
             SystemMessagePromptTemplate.from_template(
-                prompts["fake_news_detector"]["system"],
+                load_prompts()["fake_news_detector"]["system"],
             ),
             MessagesPlaceholder(variable_name="messages"),
         ],
@@ -26,7 +32,7 @@ def get_detector_prompt() -> ChatPromptTemplate:
 
 def get_detector_prompt_as_str() -> str:
     """Load and return the fake news detection prompt template as a string."""
-    return prompts["fake_news_detector"]["system"]
+    return load_prompts()["fake_news_detector"]["system"]
 
 
 def get_multi_agent_prompts() -> list[str]:
@@ -38,7 +44,17 @@ def get_multi_agent_prompts() -> list[str]:
 
     """
     return [
-        prompts["multi_agent"]["fact_checker"],
-        prompts["multi_agent"]["bias_detector"],
-        prompts["multi_agent"]["context_analyst"],
+        load_prompts()["multi_agent"]["fact_checker"],
+        load_prompts()["multi_agent"]["bias_detector"],
+        load_prompts()["multi_agent"]["context_analyst"],
     ]
+
+
+def get_evidence_review_template() -> str:
+    """Return the message template used to judge shared evidence.
+
+    Returns:
+        str: A template with "claim" and "evidence" placeholders.
+
+    """
+    return load_prompts()["multi_agent"]["evidence_review"]
@@ -0,0 +1,349 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from agents.chatbot.llms.priority import AsyncWaiters, Priority, current_priority
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+
+class TokenBucket:
+    """A bucket refilled at a constant rate up to its capacity.
+
+    The level may go below zero when more is spent than was available,
+    e.g. when tokens are charged after a request. New requests then wait
+    until the debt is repaid.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float]) -> None:
+        """Initialize the TokenBucket.
+
+        Args:
+            per_minute (float): Capacity of the bucket, refilled in a minute.
+            clock (Callable[[], float]): Returns the current time in seconds.
+
+        """
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.clock = clock
+        self.level = per_minute
+        self.updated = clock()
+
+    def refill(self) -> None:
+        """Add what was refilled since the last update."""
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Return the seconds until the bucket holds the amount."""
+        self.refill()
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class ProviderRateLimiter(BaseRateLimiter):
+    """Keeps the requests to a provider within its RPM and TPM budgets.
+
+    Every request takes one token of the request bucket. The tokens it used
+    are charged to the token bucket once its response arrives, through the
+    callback of ``usage_callback``, and further requests wait while the
+    bucket is in debt.
+
+    Waiting requests are served by priority class, then first in, first
+    out, so an interactive request overtakes the bulk requests queued
+    before it. Each class may also leave a share of the budgets unused,
+    which keeps bulk jobs from draining the buckets interactive requests
+    need.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float | None = None,
+        name: str = "llm",
+        clock: Callable[[], float] = time.monotonic,
+        reserve: dict[str, float] | None = None,
+    ) -> None:
+        """Initialize the ProviderRateLimiter.
+
+        Args:
+            requests_per_minute (float): Requests allowed per minute.
+            tokens_per_minute (float | None): Tokens allowed per minute.
+                None disables the token budget.
+            name (str): Name of the provider, used in logs.
+            clock (Callable[[], float]): Returns the current time in seconds.
+            reserve (dict[str, float] | None): Share of the budgets each
+                priority class leaves to the others, by class name, e.g.
+                ``{"bulk": 0.2}``. Defaults to ``Settings.priority_reserve``.
+
+        Raises:
+            ValueError: If a budget is not positive or a reserve is not
+                in [0, 1).
+
+        """
+        if requests_per_minute <= 0 or (
+            tokens_per_minute is not None and tokens_per_minute <= 0
+        ):
+            msg = "requests_per_minute and tokens_per_minute must be positive"
+            raise ValueError(msg)
+        if reserve is None:
+            reserve = settings.priority_reserve
+        if any(not 0 <= share < 1 for share in reserve.values()):
+            msg = "reserve shares must be in [0, 1)"
+            raise ValueError(msg)
+        self.name = name
+        self.clock = clock
+        self.reserve = {
+            priority: reserve.get(priority.name.lower(), 0.0)
+            for priority in Priority
+        }
+        self.requests = TokenBucket(requests_per_minute, clock)
+        self.tokens = (
+            TokenBucket(tokens_per_minute, clock) if tokens_per_minute else None
+        )
+        self.usage_callback = UsageCallback(self)
+        self._condition = threading.Condition()
+        self._async_waiters = AsyncWaiters()
+        self._next_ticket = 0
+        self._waiting: set[tuple[Priority, int]] = set()
+        self._stats = Counter()
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Wait for the turn of a request and take its budget.
+
+        The request belongs to the priority class of the current context.
+
+        Args:
+            blocking (bool): Wait until the request may be sent. If False,
+                only succeed if it may be sent right away.
+
+        Returns:
+            bool: Whether the request may be sent.
+
+        """
+        priority = current_priority()
+        with self._condition:
+            if not blocking:
+                if self._queued_before(priority) or self._delay(priority) > 0:
+                    return False
+                self._take(priority, 0.0)
+                return True
+            entry = self._enqueue(priority)
+        start = self.clock()
+        try:
+            with self._condition:
+                while True:
+                    if entry == min(self._waiting):
+                        delay = self._delay(priority)
+                        if delay <= 0:
+                            self._waiting.remove(entry)
+                            self._take(priority, self.clock() - start)
+                            return True
+                        self._condition.wait(delay)
+                    else:
+                        self._condition.wait()
+        except BaseException:
+            self._abandon(entry)
+            raise
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        """Asynchronously wait for the turn of a request and take its budget.
+
+        The request belongs to the priority class of the current context.
+
+        Args:
+            blocking (bool): Wait until the request may be sent. If False,
+                only succeed if it may be sent right away.
+
+        Returns:
+            bool: Whether the request may be sent.
+
+        """
+        if not blocking:
+            return self.acquire(blocking=False)
+        priority = current_priority()
+        with self._condition:
+            entry = self._enqueue(priority)
+        start = self.clock()
+        try:
+            while True:
+                with self._condition:
+                    delay = None
+                    if entry == min(self._waiting):
+                        delay = self._delay(priority)
+                        if delay <= 0:
+                            self._waiting.remove(entry)
+                            self._take(priority, self.clock() - start)
+                            return True
+                    waiter = self._async_waiters.add()
+                try:
+                    await asyncio.wait([waiter], timeout=delay)
+                finally:
+                    with self._condition:
+                        self._async_waiters.discard(waiter)
+        except BaseException:
+            self._abandon(entry)
+            raise
+
+    def record_usage(self, tokens: int) -> None:
+        """Charge the tokens used by a request to the token budget.
+
+        Args:
+            tokens (int): The total tokens of the request and response.
+
+        """
+        with self._condition:
+            self._stats["tokens"] += tokens
+            if self.tokens is not None:
+                self.tokens.refill()
+                self.tokens.level -= tokens
+
+    def stats(self) -> dict[str, float]:
+        """Report the load of the limiter.
+
+        Returns:
+            dict[str, float]: The number of queued requests, of admitted
+            requests, of tokens charged and the mean and maximum seconds a
+            request waited for its turn, overall and per priority class,
+            e.g. ``bulk_requests`` and ``bulk_mean_wait``.
+
+        """
+        with self._condition:
+            admitted = self._stats["requests"]
+            stats = {
+                "queue_depth": len(self._waiting),
+                "requests": admitted,
+                "tokens": self._stats["tokens"],
+                "mean_wait": self._stats["wait"] / admitted if admitted else 0.0,
+                "max_wait": self._stats["max_wait"],
+            }
+            for priority in Priority:
+                name = priority.name.lower()
+                admitted = self._stats[f"{name}_requests"]
+                stats[f"{name}_requests"] = admitted
+                stats[f"{name}_mean_wait"] = (
+                    self._stats[f"{name}_wait"] / admitted if admitted else 0.0
+                )
+            return stats
+
+    def _enqueue(self, priority: Priority) -> tuple[Priority, int]:
+        entry = (priority, self._next_ticket)
+        self._next_ticket += 1
+        self._waiting.add(entry)
+        return entry
+
+    def _queued_before(self, priority: Priority) -> bool:
+        return any(queued <= priority for queued, _ in self._waiting)
+
+    def _delay(self, priority: Priority) -> float:
+        share = self.reserve[priority]
+        delay = self.requests.time_until(1 + share * self.requests.capacity)
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.time_until(share * self.tokens.capacity))
+        return delay
+
+    def _take(self, priority: Priority, waited: float) -> None:
+        name = priority.name.lower()
+        self.requests.level -= 1
+        self._stats["requests"] += 1
+        self._stats["wait"] += waited
+        self._stats[f"{name}_requests"] += 1
+        self._stats[f"{name}_wait"] += waited
+        self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+        if waited > 1:
+            logger.info(
+                f"{priority.name.capitalize()} request to {self.name} waited "
+                f"{waited:.1f}s for its budget",
+            )
+        self._notify()
+
+    def _abandon(self, entry: tuple[Priority, int]) -> None:
+        with self._condition:
+            self._waiting.discard(entry)
+            self._notify()
+
+    def _notify(self) -> None:
+        self._condition.notify_all()
+        self._async_waiters.notify_all()
+
+
+class UsageCallback(BaseCallbackHandler):
+    """Charges the tokens reported by the model to a rate limiter."""
+
+    def __init__(self, limiter: ProviderRateLimiter) -> None:
+        """Initialize the UsageCallback.
+
+        Args:
+            limiter (ProviderRateLimiter): The limiter to charge.
+
+        """
+        self.limiter = limiter
+
+    def on_llm_end(self, response: LLMResult, **kwargs) -> None:
+        """Charge the token usage of a finished request.
+
+        Args:
+            response (LLMResult): The result of the request.
+            **kwargs: Unused callback arguments.
+
+        """
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+        if tokens:
+            self.limiter.record_usage(tokens)
+
+
+_limiters: dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter | None:
+    """Get the rate limiter shared by all models of a provider.
+
+    Args:
+        provider (str): Name of the provider, e.g. "google".
+
+    Returns:
+        ProviderRateLimiter | None: The limiter enforcing the budgets of
+        ``Settings.rate_limits``, or None if the provider has none.
+
+    """
+    if provider not in settings.rate_limits:
+        return None
+    with _limiters_lock:
+        if provider not in _limiters:
+            requests_per_minute, tokens_per_minute = settings.rate_limits[provider]
+            _limiters[provider] = ProviderRateLimiter(
+                requests_per_minute, tokens_per_minute, name=provider,
+            )
+        return _limiters[provider]
+
+
+def rate_limiter_kwargs(provider: str) -> dict:
+    """Get the chat model arguments that apply the provider's rate limiter.
+
+    Args:
+        provider (str): Name of the provider, e.g. "google".
+
+    Returns:
+        dict: The ``rate_limiter`` and its usage ``callbacks``, or an empty
+        dict if the provider is not rate limited.
+
+    """
+    limiter = get_rate_limiter(provider)
+    if limiter is None:
+        return {}
+    return {"rate_limiter": limiter, "callbacks": [limiter.usage_callback]}
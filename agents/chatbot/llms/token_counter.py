@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import partial
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+TokenCounter = Callable[[list[BaseMessage]], int]
+
+# Average characters per token of the providers without a local tokenizer.
+# Counting with their APIs would cost a network round trip per message.
+CHARS_PER_TOKEN = {
+    "ChatGoogleGenerativeAI": 4.0,
+    "ChatAnthropic": 3.5,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+class MessageTokenCounter:
+    """Counts the tokens of messages, memoizing the count of each message.
+
+    Counts are cached by message id, so a conversation is only tokenized
+    once per new message instead of once per turn. Messages without an id
+    are counted every time.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounter = count_tokens_approximately,
+        cache_size: int = 10_000,
+    ) -> None:
+        """Initialize the MessageTokenCounter.
+
+        Args:
+            token_counter (TokenCounter): Counts the tokens of a list of
+                messages. It is called with one message at a time.
+            cache_size (int): Maximum number of cached counts.
+
+        """
+        self.token_counter = token_counter
+        self.cache_size = cache_size
+        self._counts: OrderedDict[tuple, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, messages: list[BaseMessage]) -> int:
+        """Count the tokens of messages.
+
+        Args:
+            messages (list[BaseMessage]): The messages to count.
+
+        Returns:
+            int: The total number of tokens.
+
+        """
+        return sum(self.count(message) for message in messages)
+
+    def count(self, message: BaseMessage) -> int:
+        """Count the tokens of a message, using the cache when possible.
+
+        Args:
+            message (BaseMessage): The message to count.
+
+        Returns:
+            int: The number of tokens of the message.
+
+        """
+        if message.id is None:
+            return self.token_counter([message])
+        # The length guards against a message replaced under the same id.
+        key = (message.id, len(message.text))
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                return self._counts[key]
+        count = self.token_counter([message])
+        with self._lock:
+            self._counts[key] = count
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        return count
+
+
+def get_token_counter(model: BaseChatModel) -> MessageTokenCounter:
+    """Get a memoized token counter suited to the model's provider.
+
+    OpenAI models are counted with their local tokenizer. Other providers
+    only count tokens through their APIs, so they are estimated from the
+    number of characters.
+
+    Args:
+        model (BaseChatModel): The chat model the messages are sent to.
+
+    Returns:
+        MessageTokenCounter: The token counter.
+
+    """
+    provider = type(model).__name__
+    if provider == "ChatOpenAI":
+        return MessageTokenCounter(model.get_num_tokens_from_messages)
+    chars_per_token = CHARS_PER_TOKEN.get(provider, DEFAULT_CHARS_PER_TOKEN)
+    return MessageTokenCounter(
+        partial(count_tokens_approximately, chars_per_token=chars_per_token),
+    )
@@ -1,6 +1,13 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
 import uuid
 from collections import Counter
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 
 from langchain.agents import create_agent
 from langchain.agents.structured_output import ToolStrategy
@@ -10,11 +17,39 @@ from langgraph.checkpoint.memory import InMemorySaver
 from pydantic import BaseModel
 
 from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.chatbot.llms.prompts.prompts import get_evidence_review_template
+from agents.chatbot.streaming import AgentEvent, iter_text
 from agents.logger.logger import get_logger
+from agents.settings import get_settings
 
 logger = get_logger()
+settings = get_settings()
 
-NUM_AGENTS = 3
+DEFAULT_RECURSION_LIMIT = 50
+RESEARCH_TOOLS = ("retrieve_context", "verify_claim_sources", "search_research_papers")
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.agent_workers, thread_name_prefix="agent",
+)
+
+
+@dataclass
+class _Finished:
+    """Marks the end of the stream of one agent."""
+
+    agent: int
+    state: dict | None = None
+    error: BaseException | None = None
+
+
+@dataclass
+class AgentSpec:
+    """Configuration of a single agent of a multi-agent ensemble."""
+
+    prompt: str
+    model: BaseChatModel | None = None
+    weight: float = 1.0
+    recursion_limit: int = DEFAULT_RECURSION_LIMIT
 
 
 class MultiAgentChatbot(ChatbotInterface):
@@ -23,51 +58,95 @@ class MultiAgentChatbot(ChatbotInterface):
     def __init__(
         self,
         model: BaseChatModel,
-        prompts: list[str],
+        prompts: list[str | AgentSpec],
         schema: BaseModel | None = None,
         tools: list | None = None,
-        id_: str = str(uuid.uuid4()),
+        id_: str | None = None,
+        timeout: float | None = None,
+        quorum: float | None = None,
+        shared_evidence: bool = False,
     ) -> None:
         """Create a new multi-agent chatbot instance.
 
         Args:
             model (BaseChatModel): Language model to use for agents.
-            prompts (list[str]): List of prompt templates for each agent.
-                Should have exactly 3 prompts for 3 agents.
+            prompts (list[str | AgentSpec]): One prompt or agent
+                specification per agent. Plain prompts use the default
+                model, a weight of 1 and the default step budget.
             schema (BaseModel | None): Optional Pydantic model class to
                 enable structured output.
             tools (list | None): List of tools available to the agents.
-            id_ (str, optional): Id used to distinguish conversations.
-                Defaults to a UUID.
+            id_ (str | None): Id used to distinguish conversations.
+                Defaults to a new UUID.
+            timeout (float | None): Number of seconds each agent may take
+                before its vote is dropped. Defaults to
+                ``Settings.agent_timeout``.
+            quorum (float | None): Total weight of agreeing votes after
+                which the remaining agents are cancelled. If None, all
+                agents vote.
+            shared_evidence (bool): Gather evidence once with the research
+                tools and let the agents judge it without tools, instead
+                of letting every agent do its own research.
 
         """
         if tools is None:
             tools = []
+        self.specs = [
+            prompt if isinstance(prompt, AgentSpec) else AgentSpec(prompt=prompt)
+            for prompt in prompts
+        ]
         self.model = model
         self.schema = schema
+        self.prompts = [spec.prompt for spec in self.specs]
         self.tools = tools
-        self.id = id_
+        self.id = id_ or str(uuid.uuid4())
+        self.timeout = timeout or settings.agent_timeout
+        self.quorum = quorum
+        self.shared_evidence = shared_evidence
+        self.research_tools = [
+            tool for tool in tools if getattr(tool, "name", None) in RESEARCH_TOOLS
+        ]
 
-        if len(prompts) != NUM_AGENTS:
-            msg = f"Exactly {NUM_AGENTS} prompts required for {NUM_AGENTS} agents"
+        if not self.specs:
+            msg = "At least one prompt is required"
+            raise ValueError(msg)
+        if any(spec.weight <= 0 for spec in self.specs):
+            msg = "Agent weights must be positive"
+            raise ValueError(msg)
+        total_weight = sum(spec.weight for spec in self.specs)
+        if quorum is not None and not 0 < quorum <= total_weight:
+            msg = f"quorum must be positive and at most {total_weight}"
             raise ValueError(msg)
+        if shared_evidence and not self.research_tools:
+            msg = f"shared_evidence requires one of the tools {RESEARCH_TOOLS}"
+            raise ValueError(msg)
+        # Shared by the copies made by with_id, so pooled chatbots add up.
+        self.vote_stats: Counter[str] = Counter()
 
+        self.checkpointer = InMemorySaver()
         self.agents = [
             create_agent(
-                model,
-                system_prompt=prompt,
-                tools=tools,
+                spec.model or model,
+                system_prompt=spec.prompt,
+                tools=[] if shared_evidence else tools,
                 response_format=ToolStrategy(schema) if schema else None,
-                checkpointer=InMemorySaver(),
+                checkpointer=self.checkpointer,
             )
-            for prompt in prompts
+            for spec in self.specs
         ]
 
-        logger.info(f"Initialized MultiAgentChatbot with {NUM_AGENTS} agents")
+        logger.info(f"Initialized MultiAgentChatbot with {len(self.agents)} agents")
 
     def chat(self, user_input: str) -> BaseMessage:
         """Generate a consensus response from multiple agents.
 
+        The agents run concurrently on a thread pool shared by all
+        chatbots, bounded by ``Settings.agent_workers``. Agents that fail
+        or take longer than the timeout are left out of the vote. In quorum
+        mode the vote runs on an event loop in a background thread, as in
+        ``achat``, so the remaining agents are cancelled once enough votes
+        agree.
+
         Args:
             user_input (str): The user's input message.
 
@@ -75,90 +154,553 @@ class MultiAgentChatbot(ChatbotInterface):
             BaseMessage: The consensus response from the agents.
 
         """
+        if self.quorum is not None:
+            return self._chat_quorum(user_input)
+
         logger.info(f"User input: {user_input}")
-        logger.info(f"Querying all {NUM_AGENTS} agents...")
+        message = self._prepare_message(user_input)
+        logger.info(f"Querying all {len(self.agents)} agents concurrently...")
+        self.vote_stats["runs"] += 1
 
-        responses = []
-        labels = []
+        futures = {
+            _executor.submit(
+                contextvars.copy_context().run,
+                agent.invoke,
+                self._build_input(message),
+                self._build_config(i),
+            ): i
+            for i, agent in enumerate(self.agents, start=1)
+        }
+        deadline = time.monotonic() + self.timeout
+        pending = set(futures)
+        votes = {}
 
-        for i, agent in enumerate(self.agents, start=1):
-            logger.info(f"Querying Agent {i}...")
-            try:
-                result = agent.invoke(
-                    {"messages": [{"role": "user", "content": user_input}]},
-                    {
-                        "configurable": {"thread_id": f"{self.id}_agent{i}"},
-                        "recursion_limit": 50,
-                    },
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                for future in sorted(pending, key=futures.get):
+                    future.cancel()
+                    logger.warning(
+                        f"Agent {futures[future]} timed out after {self.timeout}s",
+                    )
+                break
+            for future in sorted(done, key=futures.get):
+                i = futures[future]
+                if future.exception() is None:
+                    self._collect_output(i, future.result(), votes)
+                else:
+                    logger.error(
+                        f"Error getting response from Agent {i}",
+                        exc_info=future.exception(),
+                    )
+
+        return self._reach_consensus(votes)
+
+    def _chat_quorum(self, user_input: str) -> BaseMessage:
+        # Threads cannot be interrupted, so the vote runs on an event loop
+        # of its own, where the agents left at the quorum are cancelled.
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(self._achat_quorum(user_input))
+        thread = threading.Thread(target=_run_pump, args=(loop, task), daemon=True)
+        thread.start()
+        try:
+            thread.join()
+        finally:
+            loop.call_soon_threadsafe(task.cancel)
+            thread.join()
+            loop.close()
+        return task.result()
+
+    async def achat(self, user_input: str) -> BaseMessage:
+        """Asynchronously generate a consensus response from multiple agents.
+
+        The agents run concurrently. Agents that fail or take longer than
+        the timeout are left out of the vote. In quorum mode the remaining
+        agents are cancelled once enough votes agree.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Returns:
+            BaseMessage: The consensus response from the agents.
+
+        """
+        if self.quorum is not None:
+            return await self._achat_quorum(user_input)
+
+        logger.info(f"User input: {user_input}")
+        message = await self._aprepare_message(user_input)
+        logger.info(f"Querying all {len(self.agents)} agents concurrently...")
+        self.vote_stats["runs"] += 1
+
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    agent.ainvoke(
+                        self._build_input(message), self._build_config(i),
+                    ),
+                    self.timeout,
                 )
+                for i, agent in enumerate(self.agents, start=1)
+            ),
+            return_exceptions=True,
+        )
 
-                if self.schema:
-                    output = result.get("structured_response")
-                else:
-                    output = result["messages"][-1].content
-
-                if output:
-                    responses.append(output)
-                    if self.schema and hasattr(output, "label"):
-                        labels.append(output.label)
-                        logger.info(
-                            f"Agent {i} response: "
-                            f"label={output.label}, "
-                            f"explanation={output.explanation[:100]}...",
-                        )
+        votes = {}
+
+        for i, result in enumerate(results, start=1):
+            if isinstance(result, TimeoutError):
+                logger.warning(f"Agent {i} timed out after {self.timeout}s")
+            elif isinstance(result, Exception):
+                logger.error(
+                    f"Error getting response from Agent {i}", exc_info=result,
+                )
+            else:
+                self._collect_output(i, result, votes)
+
+        return self._reach_consensus(votes)
+
+    async def _achat_quorum(self, user_input: str) -> BaseMessage:
+        logger.info(f"User input: {user_input}")
+        message = await self._aprepare_message(user_input)
+        logger.info(
+            f"Querying {len(self.agents)} agents until votes "
+            f"weighing {self.quorum} agree...",
+        )
+        self.vote_stats["runs"] += 1
+
+        tasks = {
+            asyncio.ensure_future(
+                asyncio.wait_for(
+                    agent.ainvoke(
+                        self._build_input(message), self._build_config(i),
+                    ),
+                    self.timeout,
+                ),
+            ): i
+            for i, agent in enumerate(self.agents, start=1)
+        }
+        pending = set(tasks)
+        votes = {}
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in sorted(done, key=tasks.get):
+                    i = tasks[task]
+                    if task.exception() is None:
+                        self._collect_output(i, task.result(), votes)
+                    elif isinstance(task.exception(), TimeoutError):
+                        logger.warning(f"Agent {i} timed out after {self.timeout}s")
                     else:
-                        logger.info(f"Agent {i} response: {output}")
-                else:
-                    logger.warning(f"Agent {i} returned empty response")
+                        logger.error(
+                            f"Error getting response from Agent {i}",
+                            exc_info=task.exception(),
+                        )
+                tally = self._tally(votes)
+                if tally and max(tally.values()) >= self.quorum:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if pending:
+            self.vote_stats["quorum_exits"] += 1
+            self.vote_stats["cancelled_agents"] += len(pending)
+        logger.info(
+            f"Quorum vote breakdown: {self._tally(votes)}, "
+            f"cancelled agents: {len(pending)}",
+        )
+        return self._reach_consensus(votes)
+
+    def _prepare_message(self, user_input: str) -> str:
+        """Build the agents' input, gathering shared evidence if enabled.
+
+        In shared evidence mode every research tool runs once, concurrently,
+        and the agents get the claim together with all the results.
+        """
+        if not self.shared_evidence:
+            return user_input
+        logger.info(
+            f"Gathering shared evidence with {len(self.research_tools)} tools...",
+        )
+        with ThreadPoolExecutor(max_workers=len(self.research_tools)) as executor:
+            results = list(
+                executor.map(
+                    lambda tool: self._run_research_tool(tool, user_input),
+                    self.research_tools,
+                ),
+            )
+        return self._judge_message(user_input, self._evidence_bundle(results))
+
+    async def _aprepare_message(self, user_input: str) -> str:
+        if not self.shared_evidence:
+            return user_input
+        logger.info(
+            f"Gathering shared evidence with {len(self.research_tools)} tools...",
+        )
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._run_research_tool, tool, user_input)
+                for tool in self.research_tools
+            ),
+        )
+        return self._judge_message(user_input, self._evidence_bundle(results))
+
+    def _run_research_tool(self, tool: object, claim: str) -> str:
+        self.vote_stats["tool_calls"] += 1
+        argument = next(iter(tool.args))
+        try:
+            return str(tool.invoke({argument: claim}))
+        except Exception:
+            logger.exception(f"Research tool '{tool.name}' failed")
+            return f"Unable to run {tool.name}."
+
+    def _evidence_bundle(self, results: list[str]) -> str:
+        return "\n\n".join(
+            f"## {tool.name}\n{result}"
+            for tool, result in zip(self.research_tools, results, strict=True)
+        )
+
+    @staticmethod
+    def _judge_message(claim: str, evidence: str) -> str:
+        return get_evidence_review_template().format(claim=claim, evidence=evidence)
+
+    def stats(self) -> dict:
+        """Get voting statistics.
+
+        Returns:
+            dict: The number of consensus "runs", of "quorum_exits" that
+            stopped before all agents voted, of "cancelled_agents" and of
+            research "tool_calls" made in shared evidence mode.
 
-            except Exception:
-                logger.exception(f"Error getting response from Agent {i}")
-                continue
+        """
+        return {
+            "runs": self.vote_stats["runs"],
+            "quorum_exits": self.vote_stats["quorum_exits"],
+            "cancelled_agents": self.vote_stats["cancelled_agents"],
+            "tool_calls": self.vote_stats["tool_calls"],
+        }
+
+    def checkpoint_threads(self) -> list[tuple[InMemorySaver, str]]:
+        """Get the checkpointer threads holding the current conversation.
+
+        The agents share one checkpointer and each keeps its history in a
+        thread of its own.
+
+        Returns:
+            list[tuple[InMemorySaver, str]]: The shared checkpointer and
+            the thread id of each agent.
+
+        """
+        return [
+            (self.checkpointer, f"{self.id}_agent{agent_number}")
+            for agent_number in range(1, len(self.agents) + 1)
+        ]
+
+    @staticmethod
+    def _build_input(user_input: str) -> dict:
+        return {"messages": [{"role": "user", "content": user_input}]}
 
-        if not responses:
+    def _build_config(self, agent_number: int) -> dict:
+        return {
+            "configurable": {"thread_id": f"{self.id}_agent{agent_number}"},
+            "recursion_limit": self.specs[agent_number - 1].recursion_limit,
+        }
+
+    def _collect_output(
+        self, agent_number: int, result: dict, votes: dict[int, object],
+    ) -> None:
+        if self.schema:
+            output = result.get("structured_response")
+        else:
+            output = result["messages"][-1].content
+
+        if output:
+            votes[agent_number] = output
+            if self.schema and hasattr(output, "label"):
+                logger.info(
+                    f"Agent {agent_number} response: "
+                    f"label={output.label}, "
+                    f"explanation={output.explanation[:100]}...",
+                )
+            else:
+                logger.info(f"Agent {agent_number} response: {output}")
+        else:
+            logger.warning(f"Agent {agent_number} returned empty response")
+
+    def _tally(self, votes: dict[int, object]) -> dict[str, float]:
+        """Sum the weights of the agents voting for each label.
+
+        Labels are added in agent order, so ties go to the earlier agent.
+        """
+        tally: dict[str, float] = {}
+        if not self.schema:
+            return tally
+        for agent_number in sorted(votes):
+            label = getattr(votes[agent_number], "label", None)
+            if label is not None:
+                weight = self.specs[agent_number - 1].weight
+                tally[label] = tally.get(label, 0.0) + weight
+        return tally
+
+    def _reach_consensus(self, votes: dict[int, object]) -> BaseMessage:
+        if not votes:
             msg = "Failed to get responses from any agent"
             raise RuntimeError(msg)
 
-        if self.schema and labels:
-            label_counts = Counter(labels)
-            majority_label = label_counts.most_common(1)[0][0]
-            logger.info(f"Label voting results: {dict(label_counts)}")
+        tally = self._tally(votes)
+        if tally:
+            majority_label = max(tally, key=tally.get)
+            logger.info(f"Label voting results: {tally}")
             logger.info(f"Consensus label: {majority_label}")
 
-            for response in responses:
-                if hasattr(response, "label") and response.label == majority_label:
-                    logger.info(f"MultiAgentChatbot consensus: {response}")
-                    return response
+            voters = [
+                agent_number for agent_number in sorted(votes)
+                if getattr(votes[agent_number], "label", None) == majority_label
+            ]
+            strongest = max(
+                voters, key=lambda agent_number: self.specs[agent_number - 1].weight,
+            )
+            logger.info(f"MultiAgentChatbot consensus: {votes[strongest]}")
+            return votes[strongest]
 
-            return responses[0]
+        response = votes[min(votes)]
+        logger.info(f"MultiAgentChatbot response: {response}")
+        return response
 
-        logger.info(f"MultiAgentChatbot response: {responses[0]}")
-        return responses[0]
+    def stream_events(self, user_input: str) -> Generator[AgentEvent, None, None]:
+        """Stream all agents concurrently as one tagged event stream.
 
-    def stream_chat(self, user_input: str) -> Generator[str, None, None]:
-        """Generate a response from the chatbot word by word.
+        The agents run on an event loop in a background thread, so the
+        remaining agents can be cancelled once a quorum is reached. If the
+        caller stops consuming early, the agents are cancelled as well.
 
         Args:
             user_input (str): The user's input message.
 
         Yields:
-            Generator[str, None, None]: The chatbot's response message,
-            one word at a time.
+            Generator[AgentEvent, None, None]: Response text of each agent,
+            a vote with the running tally whenever an agent finishes and
+            the consensus at the end.
+
+        Raises:
+            RuntimeError: If no agent responded.
 
         """
-        logger.info(
-            "Streaming with Agent 1 (multi-agent streaming "
-            "not fully supported)",
+        events: queue.Queue = queue.Queue()
+        done = object()
+
+        async def pump() -> None:
+            try:
+                async for event in self.astream_events(user_input):
+                    events.put(event)
+            except Exception as e:
+                events.put(e)
+            finally:
+                events.put(done)
+
+        loop = asyncio.new_event_loop()
+        # The task copies the caller's context when it is created.
+        task = loop.create_task(pump())
+        thread = threading.Thread(target=_run_pump, args=(loop, task), daemon=True)
+        thread.start()
+        try:
+            while (item := events.get()) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            loop.call_soon_threadsafe(task.cancel)
+            thread.join()
+            loop.close()
+
+    async def astream_events(
+        self, user_input: str,
+    ) -> AsyncGenerator[AgentEvent, None]:
+        """Asynchronously stream all agents as one tagged event stream.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[AgentEvent, None]: Response text of each agent,
+            a vote with the running tally whenever an agent finishes and
+            the consensus at the end.
+
+        Raises:
+            RuntimeError: If no agent responded.
+
+        """
+        logger.info(f"User input: {user_input}")
+        message = await self._aprepare_message(user_input)
+        logger.info(f"Streaming all {len(self.agents)} agents concurrently...")
+        self.vote_stats["runs"] += 1
+
+        events: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.ensure_future(self._astream_agent(i, agent, message, events))
+            for i, agent in enumerate(self.agents, start=1)
+        ]
+        running = set(range(1, len(self.agents) + 1))
+        votes = {}
+
+        try:
+            while running:
+                item = await events.get()
+                if isinstance(item, AgentEvent):
+                    yield item
+                    continue
+                running.discard(item.agent)
+                if item.error is not None:
+                    yield AgentEvent("error", item.agent, repr(item.error))
+                    continue
+                self._collect_output(item.agent, item.state, votes)
+                output = votes.get(item.agent)
+                tally = self._tally(votes)
+                yield AgentEvent(
+                    "vote",
+                    item.agent,
+                    str(getattr(output, "label", None) or output or ""),
+                    tally,
+                    output,
+                )
+                if (
+                    running
+                    and self.quorum is not None
+                    and tally
+                    and max(tally.values()) >= self.quorum
+                ):
+                    self.vote_stats["quorum_exits"] += 1
+                    self.vote_stats["cancelled_agents"] += len(running)
+                    logger.info(
+                        f"Quorum vote breakdown: {tally}, "
+                        f"cancelled agents: {len(running)}",
+                    )
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        response = self._reach_consensus(votes)
+        yield AgentEvent(
+            "consensus",
+            0,
+            str(getattr(response, "label", None) or response),
+            self._tally(votes),
+            response,
         )
-        for step in self.agents[0].stream(
-            {"messages": [{"role": "user", "content": user_input}]},
-            {"configurable": {"thread_id": f"{self.id}_agent1"}},
-            stream_mode="messages",
-        ):
-            if (
-                isinstance(step, tuple)
-                and len(step) > 0
-                and hasattr(step[0], "content")
+
+    async def _astream_agent(
+        self,
+        agent_number: int,
+        agent: object,
+        message: str,
+        events: asyncio.Queue,
+    ) -> None:
+        """Forward the text of one agent and report its final state."""
+        state = None
+
+        async def consume() -> None:
+            nonlocal state
+            async for mode, data in agent.astream(
+                self._build_input(message),
+                self._build_config(agent_number),
+                stream_mode=["messages", "values"],
             ):
-                yield step[0].content
+                if mode == "messages":
+                    for text in iter_text(data[0]):
+                        await events.put(AgentEvent("token", agent_number, text))
+                else:
+                    state = data
+
+        try:
+            await asyncio.wait_for(consume(), self.timeout)
+        except TimeoutError as e:
+            logger.warning(f"Agent {agent_number} timed out after {self.timeout}s")
+            await events.put(_Finished(agent_number, error=e))
+        except Exception as e:
+            logger.exception(f"Error streaming response from Agent {agent_number}")
+            await events.put(_Finished(agent_number, error=e))
+        else:
+            if state is None:
+                error = RuntimeError(f"Agent {agent_number} returned no result")
+                await events.put(_Finished(agent_number, error=error))
+            else:
+                await events.put(_Finished(agent_number, state=state))
+
+    def stream_chat(self, user_input: str) -> Generator[str, None, None]:
+        """Generate a response from the chatbot word by word.
+
+        All agents are streamed concurrently. Each finished agent's vote is
+        reported with the running tally, followed by the consensus.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            Generator[str, None, None]: The progress of the vote, then the
+            consensus response.
+
+        """
+        for event in self.stream_events(user_input):
+            text = _describe(event)
+            if text:
+                yield text
+
+    async def astream_chat(self, user_input: str) -> AsyncGenerator[str, None]:
+        """Asynchronously generate a response from the chatbot word by word.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[str, None]: The progress of the vote, then the
+            consensus response.
+
+        """
+        async for event in self.astream_events(user_input):
+            text = _describe(event)
+            if text:
+                yield text
+
+
+def _run_pump(loop: asyncio.AbstractEventLoop, task: asyncio.Task) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        # The caller reads the result or the error from the task.
+        loop.run_until_complete(asyncio.wait([task]))
+        if task.cancelled():
+            logger.info("Stopped the agents, the caller went away")
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+
+
+def _describe(event: AgentEvent) -> str:
+    """Render the progress of a multi-agent vote as text.
 
+    Token events are not rendered, because the agents' responses are
+    interleaved.
+    """
+    tally = ", ".join(f"{label}: {weight:g}" for label, weight in event.tally.items())
+    if event.kind == "vote":
+        if tally:
+            return f"Agent {event.agent} voted {event.text} (tally: {tally})\n"
+        return f"Agent {event.agent} answered\n"
+    if event.kind == "error":
+        return f"Agent {event.agent} failed: {event.text}\n"
+    if event.kind == "consensus":
+        explanation = getattr(event.response, "explanation", None)
+        if explanation is None:
+            return f"\n{event.response}"
+        return f"\nConsensus: {event.text}\n{explanation}"
+    return ""
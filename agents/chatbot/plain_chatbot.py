@@ -5,22 +5,35 @@ import uuid
 from typing import TYPE_CHECKING
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, trim_messages
-from langchain_core.runnables import RunnableConfig, RunnableSequence
+from langchain_core.runnables import (
+    RunnableConfig,
+    RunnableLambda,
+    RunnableSequence,
+)
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import START, MessagesState, StateGraph
 from pydantic import BaseModel
 
 from agents.chatbot.chatbot_interface import ChatbotInterface
+from agents.chatbot.llms.token_counter import get_token_counter
+from agents.chatbot.streaming import (
+    ATOMIC_FIELDS,
+    VerdictEvent,
+    VerdictStreamParser,
+    iter_text,
+)
 from agents.logger.logger import get_logger
+from agents.settings import get_settings
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import AsyncGenerator, Generator
 
     from langchain_core.language_models import BaseChatModel
     from langchain_core.prompts import ChatPromptTemplate
     from langgraph.graph.state import CompiledStateGraph
 
 logger = get_logger()
+settings = get_settings()
 
 
 class PlainChatbot(ChatbotInterface):
@@ -31,7 +44,10 @@ class PlainChatbot(ChatbotInterface):
         model: BaseChatModel,
         prompt: ChatPromptTemplate,
         schema: type[BaseModel] | dict | None = None,
-        id_: str = str(uuid.uuid4()),
+        id_: str | None = None,
+        max_history_tokens: int | None = None,
+        *,
+        stateless: bool = False,
     ) -> None:
         """Create a new plain chatbot (without tools and rag) instance.
 
@@ -43,33 +59,61 @@ class PlainChatbot(ChatbotInterface):
             schema (type[BaseModel] | dict | None): Optional Pydantic
                 model class or JSON schema dict to enable structured
                 output.
-            id_ (str, optional): Id used to distinguish conversations.
-                Defaults to a UUID.
+            id_ (str | None): Id used to distinguish conversations.
+                Defaults to a new UUID.
+            max_history_tokens (int | None): Token budget of the history
+                sent to the model. The oldest turns are dropped once it is
+                exceeded. Defaults to ``Settings.history_token_budget``.
+                Unused in stateless mode.
+            stateless (bool): Answer every call from a fresh state without
+                a checkpointer, like ``AgentChatbot``. Meant for
+                verification of independent claims.
 
         """
         self.model = model
         self.schema = schema
         self.prompt = prompt
-        self.config = RunnableConfig(configurable={"thread_id": id_})
-        self.memory = MemorySaver()
+        self.id = id_ or str(uuid.uuid4())
+        self.stateless = stateless
+        self.config = self._thread_config(self.id)
+        self.memory = None if stateless else MemorySaver()
+        self.max_history_tokens = max_history_tokens or settings.history_token_budget
+        self.token_counter = get_token_counter(model)
         self.trimmer = trim_messages(
-            max_tokens=20,
+            max_tokens=self.max_history_tokens,
             strategy="last",
-            token_counter=len,
+            token_counter=self.token_counter,
             include_system=True,
             allow_partial=False,
             start_on="human",
         )
+        self.chain = self._build_chain()
         self.app = self._initialize_workflow()
 
     def _call_model(self, state: MessagesState) -> dict:
+        response = self.chain.invoke(state["messages"])
+        return self._to_state_update(response)
+
+    async def _acall_model(self, state: MessagesState) -> dict:
+        response = await self.chain.ainvoke(state["messages"])
+        return self._to_state_update(response)
+
+    def _trim_history(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        # A single message over the budget is sent rather than nothing.
+        return self.trimmer.invoke(messages) or messages[-1:]
+
+    def _build_chain(self) -> RunnableSequence:
+        model = (
+            self.model.with_structured_output(self.schema)
+            if self.schema is not None else self.model
+        )
+        if self.stateless:
+            # Without a history there is nothing to trim.
+            return self.prompt | model
+        return RunnableLambda(self._trim_history) | self.prompt | model
+
+    def _to_state_update(self, response: BaseModel | dict | list) -> dict:
         if self.schema is not None:
-            chain: RunnableSequence = (
-                self.trimmer
-                | self.prompt
-                | self.model.with_structured_output(self.schema)
-            )
-            response = chain.invoke(state["messages"])
             if isinstance(response, BaseModel):
                 content = response.model_dump_json()
             elif isinstance(response, dict):
@@ -79,15 +123,15 @@ class PlainChatbot(ChatbotInterface):
             ai_msg = AIMessage(content=content)
             return {"messages": [ai_msg]}
 
-        chain = self.trimmer | self.prompt | self.model
-        response = chain.invoke(state["messages"])
         if isinstance(response, list):
             return {"messages": response}
         return {"messages": [response]}
 
     def _initialize_workflow(self) -> CompiledStateGraph:
         workflow = StateGraph(state_schema=MessagesState)
-        workflow.add_node("model", self._call_model)
+        workflow.add_node(
+            "model", RunnableLambda(self._call_model, afunc=self._acall_model),
+        )
         workflow.add_edge(START, "model")
         return workflow.compile(checkpointer=self.memory)
 
@@ -112,9 +156,134 @@ class PlainChatbot(ChatbotInterface):
         logger.info(f"PlainChatbot response: {output.content}")
         return output
 
+    async def achat(self, user_input: str) -> BaseMessage:
+        """Asynchronously generate a response from the chatbot.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Returns:
+            BaseMessage: The chatbot's last response message.
+
+        """
+        logger.info(f"User input: {user_input}")
+        input_message = [HumanMessage(user_input)]
+        for _ in range(3):
+            output = await self.app.ainvoke(
+                {"messages": input_message}, self.config,
+            )
+            output = output["messages"][-1]
+            if output and output.content is not None:
+                break
+            logger.warning("Empty response from model, retrying...")
+        logger.info(f"PlainChatbot response: {output.content}")
+        return output
+
+    def chat_batch(
+        self, claims: list[str], max_concurrency: int | None = None,
+    ) -> list[BaseMessage | Exception]:
+        """Classify many independent claims with the model's batch API.
+
+        Every claim is answered on its own, without conversation history,
+        by the chain compiled once at construction. A failing claim does
+        not abort the batch; its exception takes the place of its response.
+
+        Args:
+            claims (list[str]): The claims to classify.
+            max_concurrency (int | None): Maximum number of requests in
+                flight. Defaults to ``Settings.max_concurrency``.
+
+        Returns:
+            list[BaseMessage | Exception]: The response to each claim, in
+            input order, shaped like the responses of ``chat``.
+
+        """
+        logger.info(f"Classifying a batch of {len(claims)} claims")
+        responses = self.chain.batch(
+            [[HumanMessage(claim)] for claim in claims],
+            self._batch_config(max_concurrency),
+            return_exceptions=True,
+        )
+        return [self._to_batch_response(response) for response in responses]
+
+    async def achat_batch(
+        self, claims: list[str], max_concurrency: int | None = None,
+    ) -> list[BaseMessage | Exception]:
+        """Asynchronously classify many independent claims in a batch.
+
+        Args:
+            claims (list[str]): The claims to classify.
+            max_concurrency (int | None): Maximum number of requests in
+                flight. Defaults to ``Settings.max_concurrency``.
+
+        Returns:
+            list[BaseMessage | Exception]: The response to each claim, in
+            input order, shaped like the responses of ``achat``.
+
+        """
+        logger.info(f"Classifying a batch of {len(claims)} claims")
+        responses = await self.chain.abatch(
+            [[HumanMessage(claim)] for claim in claims],
+            self._batch_config(max_concurrency),
+            return_exceptions=True,
+        )
+        return [self._to_batch_response(response) for response in responses]
+
+    @staticmethod
+    def _batch_config(max_concurrency: int | None) -> RunnableConfig:
+        if max_concurrency is None:
+            max_concurrency = settings.max_concurrency
+        if max_concurrency < 1:
+            msg = "max_concurrency must be at least 1"
+            raise ValueError(msg)
+        return RunnableConfig(max_concurrency=max_concurrency)
+
+    def _to_batch_response(
+        self, response: BaseModel | BaseMessage | Exception,
+    ) -> BaseMessage | Exception:
+        if isinstance(response, Exception):
+            logger.error(f"Error classifying claim in batch: {response!r}")
+            return response
+        return self._to_state_update(response)["messages"][-1]
+
+    def with_id(self, id_: str) -> PlainChatbot:
+        """Return a copy of the chatbot bound to another conversation.
+
+        Args:
+            id_ (str): Id of the conversation the copy is bound to.
+
+        Returns:
+            PlainChatbot: The chatbot bound to the given conversation.
+
+        """
+        chatbot = super().with_id(id_)
+        chatbot.config = self._thread_config(id_)
+        return chatbot
+
+    def checkpoint_threads(self) -> list[tuple[MemorySaver, str]]:
+        """Get the checkpointer thread holding the current conversation.
+
+        Returns:
+            list[tuple[MemorySaver, str]]: The memory saver and the
+            conversation id. Empty in stateless mode.
+
+        """
+        if self.memory is None:
+            return []
+        return [(self.memory, self.id)]
+
+    def _thread_config(self, id_: str) -> RunnableConfig:
+        if self.stateless:
+            return RunnableConfig()
+        return RunnableConfig(configurable={"thread_id": id_})
+
     def stream_chat(self, user_input: str) -> Generator[str, None, None]:
         """Generate a response from the chatbot word by word.
 
+        A chatbot with a schema answers with a tool call rather than text,
+        so its verdict is parsed as it streams and the text fields, such as
+        the explanation, are yielded instead.
+
         Args:
             user_input (str): The user's input message.
 
@@ -123,6 +292,11 @@ class PlainChatbot(ChatbotInterface):
             one word at a time.
 
         """
+        if self.schema is not None:
+            for event in self.stream_verdict(user_input):
+                if event.field not in ATOMIC_FIELDS:
+                    yield event.text
+            return
         input_message = [HumanMessage(user_input)]
         logger.info(f"User input: {user_input}")
         logger.info("Streaming chatbot response...")
@@ -131,4 +305,86 @@ class PlainChatbot(ChatbotInterface):
             self.config,
             stream_mode="messages",
         ):
-            yield chunk
+            yield from iter_text(chunk)
+
+    async def astream_chat(self, user_input: str) -> AsyncGenerator[str, None]:
+        """Asynchronously generate a response from the chatbot word by word.
+
+        Like ``stream_chat``, a chatbot with a schema yields the text fields
+        of its verdict.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[str, None]: The chatbot's response message,
+            one word at a time.
+
+        """
+        if self.schema is not None:
+            async for event in self.astream_verdict(user_input):
+                if event.field not in ATOMIC_FIELDS:
+                    yield event.text
+            return
+        input_message = [HumanMessage(user_input)]
+        logger.info(f"User input: {user_input}")
+        logger.info("Streaming chatbot response...")
+        async for chunk, _ in self.app.astream(
+            {"messages": input_message},
+            self.config,
+            stream_mode="messages",
+        ):
+            for text in iter_text(chunk):
+                yield text
+
+    def stream_verdict(
+        self, user_input: str,
+    ) -> Generator[VerdictEvent, None, None]:
+        """Generate the chatbot's verdict field by field.
+
+        The structured output is parsed as it streams in, so the label is
+        emitted as soon as it is decided, followed by increments of the
+        explanation.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            Generator[VerdictEvent, None, None]: The label, then the
+            explanation text.
+
+        """
+        logger.info(f"User input: {user_input}")
+        parser = VerdictStreamParser(self.schema)
+        for chunk, _ in self.app.stream(
+            {"messages": [HumanMessage(user_input)]},
+            self.config,
+            stream_mode="messages",
+        ):
+            yield from parser.feed(chunk)
+        yield from parser.close()
+
+    async def astream_verdict(
+        self, user_input: str,
+    ) -> AsyncGenerator[VerdictEvent, None]:
+        """Asynchronously generate the chatbot's verdict field by field.
+
+        Args:
+            user_input (str): The user's input message.
+
+        Yields:
+            AsyncGenerator[VerdictEvent, None]: The label, then the
+            explanation text.
+
+        """
+        logger.info(f"User input: {user_input}")
+        parser = VerdictStreamParser(self.schema)
+        async for chunk, _ in self.app.astream(
+            {"messages": [HumanMessage(user_input)]},
+            self.config,
+            stream_mode="messages",
+        ):
+            for event in parser.feed(chunk):
+                yield event
+        for event in parser.close():
+            yield event
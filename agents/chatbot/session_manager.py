@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from agents.logger.logger import get_logger
+from agents.settings import get_settings
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+    from agents.chatbot.chatbot_interface import ChatbotInterface
+
+logger = get_logger()
+settings = get_settings()
+
+# Sweeps of all session managers run here, off the request path.
+_sweeper = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-sweep")
+
+
+def checkpoint_sizes(checkpointer: BaseCheckpointSaver) -> dict[str, int]:
+    """Estimate the memory held by each thread of an in-memory checkpointer.
+
+    The estimate is the total size of the serialized checkpoints, pending
+    writes and channel values stored for the thread. Checkpointers that do
+    not keep their data in memory report nothing.
+
+    Args:
+        checkpointer (BaseCheckpointSaver): The checkpointer to inspect.
+
+    Returns:
+        dict[str, int]: The estimated number of bytes per thread id.
+
+    """
+    sizes: dict[str, int] = defaultdict(int)
+    for thread_id, namespaces in list(getattr(checkpointer, "storage", {}).items()):
+        for checkpoints in list(namespaces.values()):
+            for checkpoint, metadata, _ in list(checkpoints.values()):
+                sizes[thread_id] += len(checkpoint[1]) + len(metadata[1])
+    for key, writes in list(getattr(checkpointer, "writes", {}).items()):
+        for _, _, value, _ in list(writes.values()):
+            sizes[key[0]] += len(value[1])
+    for key, value in list(getattr(checkpointer, "blobs", {}).items()):
+        sizes[key[0]] += len(value[1])
+    return sizes
+
+
+class _Session:
+    """A tracked conversation and the time it was last used."""
+
+    def __init__(self, chatbot: ChatbotInterface) -> None:
+        self.chatbot = chatbot
+        self.last_access = time.monotonic()
+
+
+class SessionManager:
+    """Issues conversation ids and bounds the history kept for them.
+
+    Chatbots keep every conversation in their checkpointer until it is
+    deleted. The manager binds chatbots to fresh conversation ids, tracks
+    when each conversation was last used and deletes the checkpoints of
+    conversations that are idle for longer than the TTL. When there are too
+    many conversations, or their checkpoints take too much memory, the least
+    recently used ones are deleted first. Measuring the checkpoints walks
+    every conversation, so the memory limit is only checked once per sweep
+    interval. Sweeps run in a background thread, so requests never wait
+    for them.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_sessions: int | None = None,
+        max_memory_bytes: int | None = None,
+        sweep_interval: float | None = None,
+    ) -> None:
+        """Initialize the SessionManager.
+
+        Args:
+            ttl (float | None): Number of idle seconds after which a
+                conversation is deleted. Defaults to ``Settings.session_ttl``.
+            max_sessions (int | None): Maximum number of conversations
+                kept. Defaults to ``Settings.max_sessions``.
+            max_memory_bytes (int | None): Maximum estimated size of all
+                checkpoints kept. Defaults to
+                ``Settings.session_memory_limit``.
+            sweep_interval (float | None): Minimum number of seconds
+                between two checks of the memory limit. Defaults to
+                ``Settings.session_sweep_interval``.
+
+        """
+        self.ttl = ttl or settings.session_ttl
+        self.max_sessions = max_sessions or settings.max_sessions
+        self.max_memory_bytes = max_memory_bytes or settings.session_memory_limit
+        self.sweep_interval = (
+            settings.session_sweep_interval if sweep_interval is None
+            else sweep_interval
+        )
+        self._next_sweep = 0.0
+        self._sweep_pending = False
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def open(
+        self, chatbot: ChatbotInterface, session_id: str | None = None,
+    ) -> ChatbotInterface:
+        """Bind a chatbot to a conversation and start tracking it.
+
+        Opening a conversation that is already tracked returns its chatbot
+        and marks it as used. A chatbot already bound to the conversation
+        is tracked as is.
+
+        Args:
+            chatbot (ChatbotInterface): The chatbot to bind.
+            session_id (str | None): Id of the conversation. Defaults to a
+                new UUID.
+
+        Returns:
+            ChatbotInterface: The chatbot bound to the conversation.
+
+        """
+        session_id = session_id or str(uuid.uuid4())
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                if chatbot.id != session_id:
+                    chatbot = chatbot.with_id(session_id)
+                session = self._sessions[session_id] = _Session(chatbot)
+                logger.info(f"Opened session: {session_id}")
+        self.touch(session_id)
+        return session.chatbot
+
+    def touch(self, session_id: str) -> None:
+        """Mark a conversation as used.
+
+        Touching only schedules a sweep in the background, when there are
+        too many conversations, when the least recently used one has expired
+        or when a memory sweep is due, so it is cheap however many
+        conversations are tracked. Unknown ids are ignored.
+
+        Args:
+            session_id (str): Id of the conversation.
+
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(session_id)
+            oldest = next(iter(self._sessions.values()), None)
+            over_limit = len(self._sessions) > self.max_sessions or (
+                oldest is not None and now - oldest.last_access >= self.ttl
+            )
+            sweep = not self._sweep_pending and (
+                over_limit or now >= self._next_sweep
+            )
+            if sweep:
+                self._next_sweep = now + self.sweep_interval
+                self._sweep_pending = True
+        if sweep:
+            _sweeper.submit(self._sweep, session_id)
+
+    def close(self, session_id: str) -> None:
+        """Stop tracking a conversation and delete its checkpoints.
+
+        Args:
+            session_id (str): Id of the conversation.
+
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._delete(session_id, session)
+
+    def evict(self, keep: str | None = None) -> int:
+        """Delete idle conversations and the ones over the limits.
+
+        Args:
+            keep (str | None): Id of a conversation that must not be
+                evicted, usually the one being used.
+
+        Returns:
+            int: The number of deleted conversations.
+
+        """
+        now = time.monotonic()
+        expired = []
+        evicted = []
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                if now - session.last_access < self.ttl:
+                    break
+                if session_id != keep:
+                    expired.append((session_id, self._sessions.pop(session_id)))
+            for session_id in list(self._sessions):
+                if len(self._sessions) <= self.max_sessions:
+                    break
+                if session_id != keep:
+                    evicted.append((session_id, self._sessions.pop(session_id)))
+
+        for session_id, session in expired + evicted:
+            self._delete(session_id, session)
+
+        usage = self.memory_usage()
+        total = sum(usage.values())
+        if total > self.max_memory_bytes:
+            over_memory = []
+            with self._lock:
+                for session_id in list(self._sessions):
+                    if total <= self.max_memory_bytes:
+                        break
+                    if session_id != keep:
+                        total -= usage.get(session_id, 0)
+                        over_memory.append(
+                            (session_id, self._sessions.pop(session_id)),
+                        )
+            for session_id, session in over_memory:
+                self._delete(session_id, session)
+            evicted += over_memory
+
+        self.expired += len(expired)
+        self.evicted += len(evicted)
+        if expired or evicted:
+            logger.info(
+                f"Deleted {len(expired)} expired and {len(evicted)} "
+                f"least recently used sessions",
+            )
+        return len(expired) + len(evicted)
+
+    def memory_usage(self) -> dict[str, int]:
+        """Estimate the checkpoint memory used by each conversation.
+
+        Returns:
+            dict[str, int]: The estimated number of bytes per conversation id.
+
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+        sizes_by_checkpointer: dict[int, dict[str, int]] = {}
+        usage = {}
+        for session_id, session in sessions:
+            usage[session_id] = 0
+            for checkpointer, thread_id in session.chatbot.checkpoint_threads():
+                sizes = sizes_by_checkpointer.get(id(checkpointer))
+                if sizes is None:
+                    sizes = checkpoint_sizes(checkpointer)
+                    sizes_by_checkpointer[id(checkpointer)] = sizes
+                usage[session_id] += sizes.get(thread_id, 0)
+        return usage
+
+    def __len__(self) -> int:
+        """Get the number of tracked conversations."""
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        """Check whether a conversation is tracked."""
+        return session_id in self._sessions
+
+    def stats(self) -> dict:
+        """Get session usage statistics.
+
+        Returns:
+            dict: The number of tracked "sessions", their estimated
+            "memory_bytes", the "max_sessions" and "max_memory_bytes"
+            limits, and the number of "expired" and "evicted" sessions.
+
+        """
+        return {
+            "sessions": len(self._sessions),
+            "memory_bytes": sum(self.memory_usage().values()),
+            "max_sessions": self.max_sessions,
+            "max_memory_bytes": self.max_memory_bytes,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+    def _sweep(self, keep: str) -> None:
+        # Later touches schedule a new sweep, since this one may miss them.
+        with self._lock:
+            self._sweep_pending = False
+        try:
+            self.evict(keep=keep)
+        except Exception:
+            logger.exception("Session sweep failed")
+
+    @staticmethod
+    def _delete(session_id: str, session: _Session) -> None:
+        for checkpointer, thread_id in session.chatbot.checkpoint_threads():
+            checkpointer.delete_thread(thread_id)
+        logger.info(f"Closed session: {session_id}")
@@ -0,0 +1,268 @@
+import json
+import re
+from collections.abc import Generator
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.utils.json import parse_partial_json
+from pydantic import BaseModel
+
+from agents.models.detector_model import DetectorModel
+
+ATOMIC_FIELDS = ("label",)
+
+
+@dataclass
+class VerdictEvent:
+    """A piece of a streamed verdict.
+
+    Atomic fields such as the label are emitted once, with their full
+    value, as soon as they are decided. Other fields are emitted as
+    increments of text.
+    """
+
+    field: str
+    text: str
+
+
+@dataclass
+class AgentEvent:
+    """An event of a multi-agent stream, tagged with the agent it comes from.
+
+    The kind is "token" for response text, "vote" when an agent finishes,
+    "error" when an agent fails or times out and "consensus" for the final
+    verdict, which is not tied to a single agent and uses agent 0. Vote
+    and consensus events carry the running tally of label weights.
+    """
+
+    kind: str
+    agent: int
+    text: str = ""
+    tally: dict[str, float] = field(default_factory=dict)
+    response: object = None
+
+
+def iter_text(chunk: BaseMessage) -> Generator[str, None, None]:
+    """Yield the text blocks of a streamed message chunk.
+
+    Tool call chunks and non-AI messages are skipped.
+
+    Args:
+        chunk (BaseMessage): The streamed message chunk.
+
+    Yields:
+        str: The text of each text block.
+
+    """
+    if not isinstance(chunk, AIMessageChunk):
+        return
+    if chunk.tool_calls or chunk.tool_call_chunks:
+        return
+
+    content = chunk.content
+    if isinstance(content, str) and content:
+        yield content
+    elif isinstance(content, list):
+        for block in content:
+            if isinstance(block, dict):
+                if block.get("type") == "text" and block.get("text"):
+                    yield block["text"]
+            elif (
+                hasattr(block, "type")
+                and block.type == "text"
+                and hasattr(block, "text")
+                and block.text
+            ):
+                yield block.text
+
+
+def verdict_events(
+    response: BaseModel | BaseMessage | dict | str,
+    schema: type[BaseModel] | dict | None = None,
+) -> Generator[VerdictEvent, None, None]:
+    """Split a complete verdict into the events a stream would produce.
+
+    Args:
+        response (BaseModel | BaseMessage | dict | str): The verdict, or a
+            message or text holding it as JSON.
+        schema (type[BaseModel] | dict | None): Schema of the verdict.
+            Defaults to DetectorModel.
+
+    Yields:
+        VerdictEvent: One event per field of the verdict. Text that is not
+        a verdict is yielded whole as the explanation.
+
+    """
+    if isinstance(response, BaseModel) and not isinstance(response, BaseMessage):
+        response = response.model_dump()
+    if isinstance(response, dict):
+        for field, value in response.items():
+            if value is not None:
+                yield VerdictEvent(field, str(value))
+        return
+
+    text = response.text if isinstance(response, BaseMessage) else str(response)
+    parser = VerdictStreamParser(schema)
+    events = parser.feed(AIMessage(content=text)) + parser.close()
+    if events:
+        yield from events
+    elif text:
+        yield VerdictEvent("explanation", text)
+
+
+class VerdictStreamParser:
+    """Turns streamed message chunks into verdict events.
+
+    The verdict is read from the arguments of the structured output tool
+    call, or from JSON message content when the model answers in text.
+    The JSON is parsed after every chunk, so the label is known as soon
+    as the model moves on to the next field, long before the explanation
+    is finished.
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel] | dict | None = None,
+        atomic_fields: tuple[str, ...] = ATOMIC_FIELDS,
+    ) -> None:
+        """Initialize the VerdictStreamParser.
+
+        Args:
+            schema (type[BaseModel] | dict | None): Schema of the verdict.
+                Defaults to DetectorModel.
+            atomic_fields (tuple[str, ...]): Fields emitted only once
+                their whole value is known.
+
+        """
+        if schema is None:
+            schema = DetectorModel
+        if isinstance(schema, dict):
+            self.tool_name = schema.get("title")
+            self.fields = set(schema.get("properties", {}))
+        else:
+            self.tool_name = schema.__name__
+            self.fields = set(schema.model_fields)
+        self.atomic_fields = atomic_fields
+        self._buffers: dict[tuple, str] = {}
+        self._tool_names: dict[tuple, str | None] = {}
+        self._emitted: dict[str, str] = {}
+        self._streamed = False
+
+    def feed(self, message: BaseMessage) -> list[VerdictEvent]:
+        """Parse the next streamed message.
+
+        Complete messages are only used if the model did not stream, so a
+        verdict is never read twice.
+
+        Args:
+            message (BaseMessage): A streamed message chunk or message.
+
+        Returns:
+            list[VerdictEvent]: The events decided by the message.
+
+        """
+        if isinstance(message, AIMessageChunk):
+            keys = self._feed_chunk(message)
+            self._streamed = self._streamed or bool(keys)
+        elif isinstance(message, AIMessage) and not self._streamed:
+            keys = self._feed_message(message)
+        else:
+            return []
+        return [event for key in keys for event in self._events(key, complete=False)]
+
+    def close(self) -> list[VerdictEvent]:
+        """Finish the stream and emit the fields that are still pending.
+
+        Returns:
+            list[VerdictEvent]: The remaining events.
+
+        """
+        if not self._buffers:
+            return []
+        key = next(
+            (
+                key for key in reversed(self._buffers)
+                if self._parse(key)[0] is not None
+            ),
+            None,
+        )
+        return list(self._events(key, complete=True)) if key else []
+
+    def _feed_chunk(self, chunk: AIMessageChunk) -> list[tuple]:
+        keys = []
+        for tool_call in chunk.tool_call_chunks:
+            key = (chunk.id, "tool", tool_call.get("index"))
+            if tool_call.get("name"):
+                self._tool_names[key] = tool_call["name"]
+            if self._tool_names.get(key) == self.tool_name and tool_call.get("args"):
+                self._buffers[key] = self._buffers.get(key, "") + tool_call["args"]
+                keys.append(key)
+        if not chunk.tool_call_chunks:
+            text = "".join(iter_text(chunk))
+            if text:
+                key = (chunk.id, "content", None)
+                self._buffers[key] = self._buffers.get(key, "") + text
+                keys.append(key)
+        return keys
+
+    def _feed_message(self, message: AIMessage) -> list[tuple]:
+        keys = []
+        for index, tool_call in enumerate(message.tool_calls):
+            if tool_call["name"] == self.tool_name:
+                key = (message.id, "tool", index)
+                self._buffers[key] = json.dumps(tool_call["args"])
+                keys.append(key)
+        if not message.tool_calls and isinstance(message.content, str):
+            key = (message.id, "content", None)
+            self._buffers[key] = message.content
+            keys.append(key)
+        return keys
+
+    def _parse(self, key: tuple) -> tuple[dict | None, bool]:
+        """Parse a buffer and tell whether its JSON document is complete."""
+        text = self._text(key)
+        try:
+            parsed, complete = json.loads(text), True
+        except json.JSONDecodeError:
+            try:
+                parsed, complete = parse_partial_json(text), False
+            except json.JSONDecodeError:
+                return None, False
+        if not isinstance(parsed, dict) or not self.fields & parsed.keys():
+            return None, False
+        return parsed, complete
+
+    def _text(self, key: tuple) -> str:
+        text = self._buffers[key].strip()
+        if text.startswith("```"):
+            text = text.removeprefix("```json").removeprefix("```").rstrip("`")
+        return text
+
+    def _events(
+        self, key: tuple, *, complete: bool,
+    ) -> Generator[VerdictEvent, None, None]:
+        parsed, parsed_complete = self._parse(key)
+        if parsed is None:
+            return
+        complete = complete or parsed_complete
+        for field in self.atomic_fields:
+            if field in self._emitted or field not in parsed:
+                continue
+            closed = re.search(
+                rf'"{re.escape(field)}"\s*:\s*"(?:[^"\\]|\\.)*"', self._text(key),
+            )
+            decided = complete or closed or not isinstance(parsed[field], str)
+            if decided and parsed[field] is not None:
+                self._emitted[field] = str(parsed[field])
+                yield VerdictEvent(field, str(parsed[field]))
+        for field, value in parsed.items():
+            if (
+                field in self.atomic_fields
+                or field not in self.fields
+                or not isinstance(value, str)
+            ):
+                continue
+            sent = self._emitted.get(field, "")
+            if value.startswith(sent) and len(value) > len(sent):
+                self._emitted[field] = value
+                yield VerdictEvent(field, value[len(sent):])
@@ -1,8 +1,7 @@
 from typing import Any
 from urllib.parse import urlparse
 
-import arxiv
-from langchain.tools import tool
+from langchain_core.tools import tool
 from langchain_community.tools import DuckDuckGoSearchRun
 
 from agents.logger.logger import get_logger
@@ -77,6 +76,8 @@ def search_research_papers(query: str, max_results: int = 10) -> str:
         f"max_results: {max_results}",
     )
     try:
+        import arxiv
+
         search = arxiv.Search(
             query=query,
             max_results=max_results,
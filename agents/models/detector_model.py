@@ -6,3 +6,13 @@ class DetectorModel(BaseModel):
 
     label: str = Field(description="Predicted label for the statement")
     explanation: str = Field(description="Explanation for the prediction")
+
+
+class ScoredDetectorModel(DetectorModel):
+    """A fake news verdict with the model's confidence in it."""
+
+    confidence: float = Field(
+        ge=0,
+        le=1,
+        description="Confidence in the predicted label, from 0 to 1",
+    )
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -10,6 +10,52 @@ class Settings:
     chunk_size: int = 512
     chunk_overlap: int = 64
     documents_retrieved: int = 10
+    max_concurrency: int = 8
+    chatbot_pool_size: int = 16
+    verdict_cache_size: int = 10_000
+    verdict_cache_ttl: float = 7 * 24 * 60 * 60
+    verdict_cache_path: str = "./knowledge_base/verdict_cache.sqlite"
+    semantic_cache_threshold: float = 0.92
+    session_ttl: float = 30 * 60
+    max_sessions: int = 1_000
+    session_memory_limit: int = 256 * 1024 * 1024
+    session_sweep_interval: float = 10.0
+    agent_timeout: float = 180
+    # Threads shared by the agents of all synchronous multi-agent votes.
+    agent_workers: int = 32
+    cascade_model: str = "Gemini 2.5 Flash"
+    cascade_min_confidence: float = 0.7
+    history_token_budget: int = 16_000
+    history_keep_turns: int = 2
+    llm_pool_size: int = 1
+    # Requests and tokens per minute of each provider, shared by all of its
+    # models in the process. Set them to the quota of the account's tier.
+    rate_limits: dict[str, tuple[float, float | None]] = field(
+        default_factory=lambda: {
+            "google": (1_000, 1_000_000),
+            "anthropic": (50, 30_000),
+        },
+    )
+    # Maximum concurrent chatbot calls of each priority class (None for no
+    # limit) and the share of each provider's budget a class leaves unused,
+    # so bulk jobs only consume what interactive users do not need.
+    priority_concurrency: dict[str, int | None] = field(
+        default_factory=lambda: {"interactive": None, "api": None, "bulk": 8},
+    )
+    priority_reserve: dict[str, float] = field(
+        default_factory=lambda: {"bulk": 0.2},
+    )
+    # Hedged models resend a call once it is slower than this percentile of
+    # the recent calls, or after the initial delay until enough calls were
+    # seen. Models missing from hedge_models hedge to themselves.
+    # Synchronous calls of all hedged models share hedge_workers threads.
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    hedge_initial_delay: float = 15.0
+    hedge_workers: int = 32
+    hedge_models: dict[str, str] = field(
+        default_factory=lambda: {"Gemini 2.5 Pro": "Gemini 2.5 Flash"},
+    )
 
 
 def get_settings() -> Settings:
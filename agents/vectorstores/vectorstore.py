@@ -1,16 +1,15 @@
-from uuid import uuid4
+from __future__ import annotations
 
-from langchain_chroma import Chroma
-from langchain_core.documents import Document
-from langchain_core.embeddings import Embeddings
+from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from agents.settings import get_settings
-from agents.vectorstores.embeddings.openai_embeddings import (
-    OpenAIEmbeddingsWrapper,
-)
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
 
 settings = get_settings()
-embedding_model = OpenAIEmbeddingsWrapper.get_embedding_model()
 
 
 class Vectorstore:
@@ -19,15 +18,27 @@ class Vectorstore:
     def __init__(
         self,
         collection_name: str,
-        embedding_function: Embeddings = embedding_model,
+        embedding_function: Embeddings | None = None,
     ) -> None:
         """Initialize the Vectorstore.
 
+        Chroma and the embedding client are imported here rather than at
+        module level, so importing this module stays cheap.
+
         Args:
             collection_name (str): Name of the collection.
-            embedding_function (Embeddings): Embedding function to use.
+            embedding_function (Embeddings | None): Embedding function to
+                use. Defaults to the OpenAI embedding model.
 
         """
+        from langchain_chroma import Chroma
+
+        if embedding_function is None:
+            from agents.vectorstores.embeddings.openai_embeddings import (
+                OpenAIEmbeddingsWrapper,
+            )
+
+            embedding_function = OpenAIEmbeddingsWrapper.get_embedding_model()
         self.vectorstore = Chroma(
             collection_name=collection_name,
             embedding_function=embedding_function,
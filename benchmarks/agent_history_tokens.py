@@ -0,0 +1,80 @@
+"""Benchmark the prompt tokens per call of a stateful and a stateless agent.
+
+An agent answers a stream of independent claims on one conversation, as
+the evaluators and batch jobs used to do. The model is a local fake that
+records the approximate number of tokens it is sent, so no API key or
+network is needed. A stateful agent re-sends the whole growing history on
+every call, a stateless one sends the same amount every time.
+
+Usage:
+    python -m benchmarks.agent_history_tokens --claims 1000
+"""
+import argparse
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agents.chatbot.agent import AgentChatbot
+
+PROMPT = "You are a fact checker. Label the claim as True, False or Unclear."
+ANSWER = "False. The claim contradicts the evidence in the knowledge base."
+
+
+class TokenCountingModel(BaseChatModel):
+    """A fake chat model recording the tokens of every prompt it gets."""
+
+    prompt_tokens: list[int] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "token-counting"
+
+    def bind_tools(self, tools: list, **kwargs) -> "TokenCountingModel":
+        """Accept the agent's tools without using them."""
+        return self
+
+    def _generate(self, messages: list[BaseMessage], *args, **kwargs) -> ChatResult:
+        self.prompt_tokens.append(count_tokens_approximately(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(ANSWER))])
+
+
+def measure(claims: int, *, stateless: bool) -> list[int]:
+    """Verify synthetic claims on one agent and record its prompt sizes.
+
+    Args:
+        claims (int): Number of claims to verify.
+        stateless (bool): Whether the agent runs in stateless mode.
+
+    Returns:
+        list[int]: The approximate prompt tokens of each call.
+
+    """
+    model = TokenCountingModel(prompt_tokens=[])
+    chatbot = AgentChatbot(model=model, prompt=PROMPT, stateless=stateless)
+    for i in range(claims):
+        chatbot.chat(f"Claim {i}: the city council banned bicycles on Sundays.")
+    return model.prompt_tokens
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--claims",
+        type=int,
+        default=1_000,
+        help="Number of claims verified on each agent.",
+    )
+    args = parser.parse_args()
+
+    for stateless in (False, True):
+        tokens = measure(args.claims, stateless=stateless)
+        print(
+            f"{'stateless' if stateless else 'stateful'}: "
+            f"first call {tokens[0]} tokens, "
+            f"middle call {tokens[len(tokens) // 2]} tokens, "
+            f"last call {tokens[-1]} tokens, "
+            f"total {sum(tokens):,} tokens",
+        )
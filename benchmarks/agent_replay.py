@@ -0,0 +1,113 @@
+"""Benchmark the framework overhead of an agent by replaying a cassette.
+
+A stateless AgentChatbot verifies claims with a scripted model that calls
+a search tool once and then answers, and every model and tool call is
+recorded to a cassette. The same claims are then replayed from the
+cassette with no latency, so the measured time is the overhead of
+LangGraph, the middleware and the chatbot alone, and optionally with a
+synthetic latency per call. No network is used.
+
+Usage:
+    python -m benchmarks.agent_replay --claims 100 --latency 0.01
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from agents.chatbot.agent import AgentChatbot
+from agents.chatbot.cassette import Cassette
+
+
+class _ScriptedChatModel(GenericFakeChatModel):
+    def bind_tools(self, tools: list, **kwargs: Any) -> "_ScriptedChatModel":  # noqa: ANN401
+        return self
+
+
+@tool
+def web_search(query: str) -> str:
+    """Search the web for a query."""
+    return f"Results for {query}: " + "lorem ipsum " * 200
+
+
+def _script(claims: int) -> list[AIMessage]:
+    messages = []
+    for i in range(claims):
+        messages.append(AIMessage("", tool_calls=[
+            {"name": "web_search", "args": {"query": f"claim {i}"}, "id": f"call_{i}"},
+        ]))
+        messages.append(AIMessage(f"Claim {i} is false."))
+    return messages
+
+
+def _verify(cassette: Cassette, model: GenericFakeChatModel | None, claims: int) -> list[float]:
+    chatbot = AgentChatbot(
+        model=cassette.wrap_model(model, model_name="scripted"),
+        prompt="You verify claims.",
+        tools=cassette.wrap_tools([web_search]),
+        stateless=True,
+    )
+    timings = []
+    for i in range(claims):
+        start = time.perf_counter()
+        chatbot.chat(f"Claim number {i}")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure(claims: int, latency: float) -> dict:
+    """Record a run of claims, then replay it without and with latency.
+
+    Args:
+        claims (int): Number of claims.
+        latency (float): Synthetic seconds per replayed call.
+
+    Returns:
+        dict: The median milliseconds per claim for recording, replaying
+        without latency and replaying with the synthetic latency, and the
+        size of the cassette in bytes.
+
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "run.jsonl.gz"
+        with Cassette(path, mode="record") as cassette:
+            record = _verify(cassette, _ScriptedChatModel(messages=iter(_script(claims))), claims)
+        replay = _verify(Cassette(path, mode="replay"), None, claims)
+        delayed = _verify(Cassette(path, mode="replay", latency=latency), None, claims)
+        size = path.stat().st_size
+    return {
+        "record_ms": statistics.median(record) * 1000,
+        "replay_ms": statistics.median(replay) * 1000,
+        "delayed_ms": statistics.median(delayed) * 1000,
+        "cassette_bytes": size,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--claims", type=int, default=100, help="Number of claims to verify.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.01,
+        help="Synthetic latency per replayed call, in seconds.",
+    )
+    args = parser.parse_args()
+
+    result = measure(args.claims, args.latency)
+    print(f"Recording: median {result['record_ms']:.2f} ms per claim")
+    print(f"Replay, no latency: median {result['replay_ms']:.2f} ms per claim")
+    print(
+        f"Replay, {args.latency * 1000:.0f} ms per call: "
+        f"median {result['delayed_ms']:.2f} ms per claim",
+    )
+    print(f"Cassette size: {result['cassette_bytes'] / 1024:.1f} KiB")
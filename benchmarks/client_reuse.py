@@ -0,0 +1,180 @@
+"""Benchmark the connection setup overhead of fresh and shared clients.
+
+Two measurements are taken, both without network access:
+
+* HTTPS requests to a local TLS server, with a new HTTP client per request
+  (a new chat model per chatbot, as before the client registry) and with
+  one shared client. The server counts the connections it accepts.
+* Building a Gemini chat model, with and without the client registry.
+
+Usage:
+    python -m benchmarks.client_reuse --requests 200
+"""
+import argparse
+import datetime
+import os
+import ssl
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"label": "False"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def get_request(self) -> tuple:
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+
+def _write_certificate(directory: Path) -> tuple[Path, Path]:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ),
+    )
+    return cert_path, key_path
+
+
+def measure_requests(requests: int) -> dict:
+    """Send requests to a local TLS server with fresh and shared clients.
+
+    Args:
+        requests (int): Number of requests per mode.
+
+    Returns:
+        dict: The median milliseconds per request and the number of
+        connections opened, per mode.
+
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = _write_certificate(Path(directory))
+        server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        server_context.load_cert_chain(cert_path, key_path)
+        server = _CountingServer(("localhost", 0), _Handler)
+        server.socket = server_context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"https://localhost:{server.server_address[1]}/generate"
+        client_context = ssl.create_default_context(cafile=str(cert_path))
+
+        try:
+            for mode in ("fresh", "shared"):
+                server.connections = 0
+                shared = httpx.Client(verify=client_context)
+                timings = []
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    if mode == "fresh":
+                        with httpx.Client(verify=client_context) as client:
+                            client.post(url, json={"claim": "test"})
+                    else:
+                        shared.post(url, json={"claim": "test"})
+                    timings.append(time.perf_counter() - start)
+                shared.close()
+                results[mode] = {
+                    "median_ms": statistics.median(timings) * 1000,
+                    "connections": server.connections,
+                }
+        finally:
+            server.shutdown()
+    return results
+
+
+def measure_model_construction(runs: int) -> dict:
+    """Time getting a Gemini chat model with and without the registry.
+
+    Args:
+        runs (int): Number of models requested per mode.
+
+    Returns:
+        dict: The median milliseconds per model, per mode.
+
+    """
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+    from agents.chatbot.llms.client_registry import client_registry
+    from agents.chatbot.llms.google import GoogleLLM
+
+    results = {}
+    for mode in ("fresh", "shared"):
+        client_registry.clear()
+        timings = []
+        for _ in range(runs):
+            if mode == "fresh":
+                client_registry.clear()
+            start = time.perf_counter()
+            GoogleLLM.get_chat_model("gemini-2.5-flash")
+            timings.append(time.perf_counter() - start)
+        results[mode] = {"median_ms": statistics.median(timings) * 1000}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="Number of requests and model constructions per mode.",
+    )
+    args = parser.parse_args()
+
+    for mode, result in measure_requests(args.requests).items():
+        print(
+            f"HTTPS requests, {mode} client: median {result['median_ms']:.2f} ms "
+            f"per request, {result['connections']} connections",
+        )
+    for mode, result in measure_model_construction(args.requests).items():
+        print(
+            f"Gemini chat model, {mode}: median {result['median_ms']:.3f} ms "
+            f"per model",
+        )
@@ -0,0 +1,114 @@
+"""Benchmark the tail latency of a chat model with and without hedging.
+
+A fake chat model answers most calls quickly and a small share of them
+very slowly, like a provider with occasional stragglers. The same
+sequence of calls is timed on the bare model and on a HedgedChatModel
+wrapping it. No network is used.
+
+Usage:
+    python -m benchmarks.hedged_latency --calls 400 --slow_share 0.03
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agents.chatbot.llms.hedging import HedgedChatModel
+
+
+class StragglerChatModel(BaseChatModel):
+    """Fake chat model whose latency has a long tail."""
+
+    fast: float = 0.02
+    slow: float = 0.5
+    slow_share: float = 0.03
+    seed: int = 0
+
+    def model_post_init(self, context: Any) -> None:  # noqa: ANN401
+        """Seed the latency sequence of the model."""
+        super().model_post_init(context)
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "straggler"
+
+    def _latency(self) -> float:
+        jitter = self._random.uniform(0.8, 1.2)
+        if self._random.random() < self.slow_share:
+            return self.slow * jitter
+        return self.fast * jitter
+
+    def _generate(self, messages: list, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:  # noqa: ANN401
+        time.sleep(self._latency())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("False"))])
+
+    async def _agenerate(self, messages: list, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:  # noqa: ANN401
+        await asyncio.sleep(self._latency())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("False"))])
+
+
+def measure(model: BaseChatModel, calls: int) -> dict:
+    """Time sequential async calls of a model.
+
+    Args:
+        model (BaseChatModel): The model to call.
+        calls (int): Number of calls.
+
+    Returns:
+        dict: The median and 99th percentile latency in milliseconds.
+
+    """
+    async def run() -> list[float]:
+        timings = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await model.ainvoke("Claim")
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    timings = asyncio.run(run())
+    percentiles = statistics.quantiles(timings, n=100)
+    return {"p50_ms": percentiles[49] * 1000, "p99_ms": percentiles[98] * 1000}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--calls", type=int, default=400, help="Number of calls per mode.",
+    )
+    parser.add_argument(
+        "--slow_share",
+        type=float,
+        default=0.03,
+        help="Share of calls answered slowly.",
+    )
+    args = parser.parse_args()
+
+    bare = StragglerChatModel(slow_share=args.slow_share)
+    result = measure(bare, args.calls)
+    print(
+        f"Bare model: p50 {result['p50_ms']:.1f} ms, "
+        f"p99 {result['p99_ms']:.1f} ms",
+    )
+
+    hedged = HedgedChatModel(
+        primary=StragglerChatModel(slow_share=args.slow_share),
+        percentile=0.9,
+        min_samples=20,
+    )
+    result = measure(hedged, args.calls)
+    stats = hedged.stats()
+    print(
+        f"Hedged model: p50 {result['p50_ms']:.1f} ms, "
+        f"p99 {result['p99_ms']:.1f} ms, "
+        f"hedge rate {stats['hedge_rate']:.1%}, "
+        f"threshold {stats['threshold'] * 1000:.1f} ms",
+    )
@@ -0,0 +1,106 @@
+"""Benchmark the cold-start import time of the agents package.
+
+Each run imports the module in a fresh interpreter, so the numbers match
+what a CLI tool or a newly spawned worker pays before its first request.
+
+Usage:
+    python -m benchmarks.import_time --module agents.agent_api --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "langchain.agents",
+    "langgraph",
+    "langchain_google_genai",
+    "langchain_anthropic",
+    "langchain_openai",
+    "langchain_chroma",
+    "chromadb",
+    "arxiv",
+    "ddgs",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_modules": loaded}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    """Import the module in fresh interpreters and time it.
+
+    API keys are removed from the environment to make sure importing does
+    not depend on them.
+
+    Args:
+        module (str): Dotted name of the module to import.
+        runs (int): Number of fresh interpreters to start.
+
+    Returns:
+        dict: The "min", "median" and "max" import time in seconds and
+        the heavy dependencies loaded by the import.
+
+    """
+    env = {
+        key: value for key, value in os.environ.items()
+        if not key.endswith("_API_KEY")
+    }
+    probe = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    timings = []
+    heavy_modules: list[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        heavy_modules = result["heavy_modules"]
+    return {
+        "module": module,
+        "runs": runs,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "heavy_modules": heavy_modules,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--module",
+        type=str,
+        action="append",
+        help="Module to import. Can be given multiple times.",
+    )
+
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="Number of fresh interpreters per module.",
+    )
+    args = parser.parse_args()
+
+    for module in args.module or ["agents.agent_api", "agents.chatbot.tools"]:
+        result = measure(module, args.runs)
+        print(
+            f"{result['module']}: median {result['median'] * 1000:.0f} ms "
+            f"(min {result['min'] * 1000:.0f} ms, "
+            f"max {result['max'] * 1000:.0f} ms, {result['runs']} runs); "
+            f"heavy modules loaded: {result['heavy_modules'] or 'none'}",
+        )
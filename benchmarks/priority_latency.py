@@ -0,0 +1,109 @@
+"""Benchmark the latency of interactive requests during a bulk run.
+
+Bulk workers drain a provider's rate limiter and keep it saturated while
+interactive requests arrive at a steady pace. The time interactive
+requests wait for their budget is measured twice: with every request in
+the API class, so they queue first in, first out behind the bulk backlog,
+and with priority classes, where bulk workers leave a reserve of the
+budget and queue behind interactive requests. No model is called, only
+the limiter is used.
+
+Usage:
+    python -m benchmarks.priority_latency --workers 16 --seconds 5
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from agents.chatbot.llms.priority import Priority, priority_class
+from agents.chatbot.llms.rate_limiter import ProviderRateLimiter
+
+
+def measure(
+    prioritized: bool,
+    workers: int,
+    seconds: float,
+    requests_per_minute: float,
+) -> dict:
+    """Time interactive requests while bulk workers saturate the limiter.
+
+    Args:
+        prioritized (bool): Put the requests in the interactive and bulk
+            classes instead of all in the API class.
+        workers (int): Number of bulk workers.
+        seconds (float): Duration of the run.
+        requests_per_minute (float): Budget of the limiter.
+
+    Returns:
+        dict: The median and maximum milliseconds interactive requests
+        waited and the number of bulk requests admitted.
+
+    """
+    limiter = ProviderRateLimiter(requests_per_minute, name="benchmark")
+    bulk_priority = Priority.BULK if prioritized else Priority.API
+    interactive_priority = Priority.INTERACTIVE if prioritized else Priority.API
+    stop = threading.Event()
+
+    def bulk_worker() -> None:
+        with priority_class(bulk_priority):
+            while not stop.is_set():
+                limiter.acquire()
+
+    threads = [
+        threading.Thread(target=bulk_worker, daemon=True) for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.5)
+    waits = []
+    deadline = time.monotonic() + seconds
+    with priority_class(interactive_priority):
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            limiter.acquire()
+            waits.append(time.perf_counter() - start)
+            time.sleep(0.25)
+    stop.set()
+    bulk_requests = limiter.stats()["requests"] - len(waits)
+    # Let the bulk workers drain without waiting for the budget.
+    limiter.requests.level = float(workers)
+    for thread in threads:
+        thread.join()
+    return {
+        "median_ms": statistics.median(waits) * 1000,
+        "max_ms": max(waits) * 1000,
+        "bulk_requests": bulk_requests,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--workers", type=int, default=16, help="Number of bulk workers.",
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=5, help="Duration of each run.",
+    )
+    parser.add_argument(
+        "--requests_per_minute",
+        type=float,
+        default=1_200,
+        help="Request budget of the limiter.",
+    )
+    args = parser.parse_args()
+
+    for label, prioritized in (
+        ("without priority", False),
+        ("with priority", True),
+    ):
+        result = measure(
+            prioritized, args.workers, args.seconds, args.requests_per_minute,
+        )
+        print(
+            f"Interactive requests {label}: median {result['median_ms']:.1f} ms, "
+            f"max {result['max_ms']:.1f} ms waiting; "
+            f"{result['bulk_requests']} bulk requests admitted",
+        )
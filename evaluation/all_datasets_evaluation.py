@@ -4,6 +4,7 @@ from tqdm import tqdm
 from agents.chatbot.agent import AgentChatbot
 from agents.chatbot.chatbot_interface import ChatbotInterface
 from agents.chatbot.llms.anthropic import AnthropicLLM
+from agents.chatbot.llms.priority import Priority, priority_class
 from agents.chatbot.llms.prompts.prompts import (
     get_detector_prompt,
     get_detector_prompt_as_str,
@@ -49,6 +50,7 @@ def create_chatbot_instances(
                     prompt=get_detector_prompt_as_str(),
                     schema=DetectorModel,
                     tools=get_tools(),  # type: ignore[call-arg]
+                    stateless=True,
                 )
             elif chatbot_class == MultiAgentChatbot:
                 chatbot_instance = chatbot_class(
@@ -128,7 +130,8 @@ if __name__ == "__main__":
     evaluators_instances = create_evaluators_instances(
         chatbots_instances, evaluators,
     )
-    results = evaluate(evaluators_instances)
+    with priority_class(Priority.BULK):
+        results = evaluate(evaluators_instances)
     logger.info(f"Evaluation results: {results}")
 
 
@@ -2,7 +2,8 @@ from collections.abc import Generator
 
 import streamlit as st
 
-from agents.agent_api import create_chatbot, stream_response
+from agents.agent_api import get_pooled_chatbot, stream_response
+from agents.chatbot.llms.priority import Priority, priority_class
 from agents.chatbot.tools import get_available_tools
 
 
@@ -47,7 +48,7 @@ if "chatbot" not in st.session_state:
         else:
             st.session_state.model = model
             st.session_state.selected_tools = selected_tools
-            st.session_state.chatbot = create_chatbot(
+            st.session_state.chatbot = get_pooled_chatbot(
                 "agent",
                 model,
                 schema=None,
@@ -85,7 +86,8 @@ else:
         with st.chat_message("assistant"):
             thinking_placeholder = st.empty()
             thinking_placeholder.markdown("🤔 **Thinking...**")
-            response = st.write_stream(response_generator())
+            with priority_class(Priority.INTERACTIVE):
+                response = st.write_stream(response_generator())
             thinking_placeholder.empty()
         st.session_state.messages.append(
             {"role": "assistant", "content": response},
@@ -1,22 +1,37 @@
 """Tests for the agent_api module."""
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import os
+import subprocess
+import sys
+import threading
+import time
 
 import pytest
 
 from agents.agent_api import (
     _get_model,
+    aget_response,
+    aget_responses,
+    astream_response,
+    chatbot_pool,
     create_chatbot,
+    get_pooled_chatbot,
     get_response,
+    get_responses,
     stream_response,
+    stream_verdict,
 )
+from agents.chatbot.llms.priority import Priority, current_priority
+from agents.chatbot.streaming import VerdictEvent
 
 
 class TestCreateChatbot:
     """Test cases for the create_chatbot function."""
 
-    @patch("agents.agent_api.GoogleLLM")
-    @patch("agents.agent_api.PlainChatbot")
-    @patch("agents.agent_api.get_detector_prompt")
+    @patch("agents.chatbot.llms.google.GoogleLLM")
+    @patch("agents.chatbot.plain_chatbot.PlainChatbot")
+    @patch("agents.chatbot.llms.prompts.prompts.get_detector_prompt")
     def test_create_plain_chatbot(self, mock_prompt, mock_plain_chatbot, mock_google_llm) -> None:
         """Test creating a plain chatbot."""
         mock_model = MagicMock()
@@ -31,10 +46,44 @@ class TestCreateChatbot:
         mock_google_llm.get_chat_model.assert_called_once_with("gemini-2.5-flash")
         mock_plain_chatbot.assert_called_once()
 
-    @patch("agents.agent_api.GoogleLLM")
-    @patch("agents.agent_api.AgentChatbot")
-    @patch("agents.agent_api.get_detector_prompt_as_str")
-    @patch("agents.agent_api.get_tools")
+    @patch("agents.chatbot.llms.google.GoogleLLM")
+    @patch("agents.chatbot.plain_chatbot.PlainChatbot")
+    @patch("agents.chatbot.llms.prompts.prompts.get_detector_prompt")
+    def test_create_stateless_plain_chatbot(
+        self, mock_prompt, mock_plain_chatbot, mock_google_llm,
+    ) -> None:
+        """Test that the stateless flag reaches plain chatbots."""
+        create_chatbot(chatbot_type="plain", model_name="Gemini 2.5 Flash", stateless=True)
+
+        assert mock_plain_chatbot.call_args.kwargs["stateless"] is True
+
+    @patch("agents.chatbot.llms.google.GoogleLLM")
+    @patch("agents.chatbot.plain_chatbot.PlainChatbot")
+    @patch("agents.chatbot.llms.prompts.prompts.get_detector_prompt")
+    def test_create_chatbot_replaying_cassette(
+        self, mock_prompt, mock_plain_chatbot, mock_google_llm, tmp_path,
+    ) -> None:
+        """Test that a replaying chatbot is created without a provider client."""
+        from agents.chatbot.cassette import Cassette, CassetteChatModel
+
+        path = tmp_path / "cassette.jsonl"
+        Cassette(path, mode="record").save()
+
+        create_chatbot(
+            chatbot_type="plain",
+            model_name="Gemini 2.5 Flash",
+            cassette=Cassette(path, mode="replay"),
+        )
+
+        mock_google_llm.get_chat_model.assert_not_called()
+        model = mock_plain_chatbot.call_args.kwargs["model"]
+        assert isinstance(model, CassetteChatModel)
+        assert model.model_name == "Gemini 2.5 Flash"
+
+    @patch("agents.chatbot.llms.google.GoogleLLM")
+    @patch("agents.chatbot.agent.AgentChatbot")
+    @patch("agents.chatbot.llms.prompts.prompts.get_detector_prompt_as_str")
+    @patch("agents.chatbot.tools.get_tools")
     def test_create_agent_chatbot(
         self, mock_get_tools, mock_prompt, mock_agent_chatbot, mock_google_llm,
     ) -> None:
@@ -63,6 +112,33 @@ class TestCreateChatbot:
                 model_name="Gemini 2.5 Flash",
             )
 
+    @patch("agents.chatbot.llms.google.GoogleLLM")
+    @patch("agents.chatbot.cascade.CascadeChatbot")
+    @patch("agents.chatbot.agent.AgentChatbot")
+    @patch("agents.chatbot.plain_chatbot.PlainChatbot")
+    @patch("agents.chatbot.tools.get_tools")
+    def test_create_cascade_chatbot(
+        self, mock_get_tools, mock_plain_chatbot, mock_agent_chatbot,
+        mock_cascade_chatbot, mock_google_llm,
+    ) -> None:
+        """Test that a cascade escalates from Flash to an agent on the given model."""
+        mock_get_tools.return_value = []
+
+        create_chatbot(
+            chatbot_type="cascade",
+            model_name="Gemini 2.5 Pro",
+            vectorstore_collection_name="test_collection",
+        )
+
+        assert [call.args for call in mock_google_llm.get_chat_model.call_args_list] == [
+            ("gemini-2.5-flash",), ("gemini-2.5-pro",),
+        ]
+        mock_cascade_chatbot.assert_called_once_with(
+            cheap=mock_plain_chatbot.return_value,
+            strong=mock_agent_chatbot.return_value,
+        )
+        assert mock_plain_chatbot.call_args.kwargs["stateless"] is False
+
     def test_create_chatbot_unknown_type_raises_error(self) -> None:
         """Test that unknown chatbot type raises ValueError."""
         with pytest.raises(ValueError, match="Unknown chatbot type"):
@@ -72,10 +148,56 @@ class TestCreateChatbot:
             )
 
 
+class TestGetPooledChatbot:
+    """Test cases for the get_pooled_chatbot function."""
+
+    @pytest.fixture(autouse=True)
+    def clear_pool(self):
+        """Start each test with an empty chatbot pool."""
+        chatbot_pool.clear()
+        yield
+        chatbot_pool.clear()
+
+    @patch("agents.agent_api.create_chatbot")
+    def test_get_pooled_chatbot_reuses_configuration(self, mock_create_chatbot) -> None:
+        """Test that the same configuration is built once per pool."""
+        template = MagicMock()
+        mock_create_chatbot.return_value = template
+
+        get_pooled_chatbot("plain", "Gemini 2.5 Flash", thread_id="t1")
+        get_pooled_chatbot("plain", "Gemini 2.5 Flash", thread_id="t2")
+        get_pooled_chatbot("plain", "Gemini 2.5 Pro", thread_id="t3")
+
+        assert mock_create_chatbot.call_count == 2
+        template.with_id.assert_any_call("t1")
+        template.with_id.assert_any_call("t2")
+
+
+class TestLazyImports:
+    """Test cases for the deferred imports of agent_api."""
+
+    def test_import_does_not_load_heavy_dependencies(self) -> None:
+        """Test that importing agent_api skips providers, Chroma and arXiv."""
+        env = {k: v for k, v in os.environ.items() if not k.endswith("_API_KEY")}
+        probe = (
+            "import sys, agents.agent_api; "
+            "print([m for m in ('langchain.agents', 'langgraph', "
+            "'langchain_google_genai', 'langchain_openai', 'chromadb', 'arxiv') "
+            "if m in sys.modules])"
+        )
+
+        output = subprocess.run(
+            [sys.executable, "-c", probe],
+            check=True, capture_output=True, text=True, env=env,
+        ).stdout
+
+        assert output.strip().splitlines()[-1] == "[]"
+
+
 class TestGetModel:
     """Test cases for the _get_model function."""
 
-    @patch("agents.agent_api.GoogleLLM")
+    @patch("agents.chatbot.llms.google.GoogleLLM")
     def test_get_google_model(self, mock_google_llm) -> None:
         """Test getting a Google model."""
         mock_model = MagicMock()
@@ -86,6 +208,25 @@ class TestGetModel:
         assert model == mock_model
         mock_google_llm.get_chat_model.assert_called_once_with("gemini-2.5-flash")
 
+    @patch("agents.chatbot.llms.google.GoogleLLM")
+    def test_get_hedged_model(self, mock_google_llm) -> None:
+        """Test that a hedged model falls back to its configured backup."""
+        from langchain_core.language_models import BaseChatModel
+
+        from agents.chatbot.llms.hedging import HedgedChatModel
+
+        mock_google_llm.get_chat_model.side_effect = (
+            lambda model_id: MagicMock(spec=BaseChatModel, model=model_id)
+        )
+
+        pro = _get_model("Gemini 2.5 Pro", hedge=True)
+        flash = _get_model("Gemini 2.5 Flash", hedge=True)
+
+        assert isinstance(pro, HedgedChatModel)
+        assert pro.primary.model == "gemini-2.5-pro"
+        assert pro.secondary.model == "gemini-2.5-flash"
+        assert flash.secondary is None
+
     def test_get_model_unknown_raises_error(self) -> None:
         """Test that unknown model name raises ValueError."""
         with pytest.raises(ValueError, match="Unknown model"):
@@ -118,3 +259,167 @@ class TestStreamResponse:
 
         assert result == ["Hello", " ", "World"]
         mock_chatbot.stream_chat.assert_called_once_with("Test input")
+
+
+class TestStreamVerdict:
+    """Test cases for the stream_verdict function."""
+
+    def test_stream_verdict(self) -> None:
+        """Test that verdict events are streamed from the chatbot."""
+        events = [VerdictEvent("label", "True"), VerdictEvent("explanation", "Yes.")]
+        mock_chatbot = MagicMock()
+        mock_chatbot.stream_verdict.return_value = iter(events)
+
+        result = list(stream_verdict(mock_chatbot, "Test input"))
+
+        assert result == events
+        mock_chatbot.stream_verdict.assert_called_once_with("Test input")
+
+
+class TestAGetResponse:
+    """Test cases for the aget_response function."""
+
+    @pytest.mark.asyncio
+    async def test_aget_response(self) -> None:
+        """Test getting response from chatbot asynchronously."""
+        mock_chatbot = MagicMock()
+        mock_chatbot.achat = AsyncMock(return_value="Test response")
+
+        response = await aget_response(mock_chatbot, "Test input")
+
+        assert response == "Test response"
+        mock_chatbot.achat.assert_awaited_once_with("Test input")
+
+
+class TestAStreamResponse:
+    """Test cases for the astream_response function."""
+
+    @pytest.mark.asyncio
+    async def test_astream_response(self) -> None:
+        """Test streaming response from chatbot asynchronously."""
+        async def fake_stream(user_input):
+            for chunk in ["Hello", " ", "World"]:
+                yield chunk
+
+        mock_chatbot = MagicMock()
+        mock_chatbot.astream_chat = fake_stream
+
+        result = [chunk async for chunk in astream_response(mock_chatbot, "Test input")]
+
+        assert result == ["Hello", " ", "World"]
+
+
+class TestGetResponses:
+    """Test cases for the get_responses function."""
+
+    def test_get_responses_preserves_input_order(self) -> None:
+        """Test that ordered results follow the input order."""
+        mock_chatbot = MagicMock()
+
+        def slow_for_first(claim: str) -> str:
+            if claim == "claim 0":
+                time.sleep(0.05)
+            return f"verdict for {claim}"
+
+        mock_chatbot.chat.side_effect = slow_for_first
+        claims = [f"claim {i}" for i in range(5)]
+
+        results = list(get_responses(mock_chatbot, claims, max_concurrency=3))
+
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert [r.response for r in results] == [f"verdict for {c}" for c in claims]
+        assert all(r.ok for r in results)
+
+    def test_get_responses_as_completed(self) -> None:
+        """Test that unordered results are yielded as they complete."""
+        mock_chatbot = MagicMock()
+
+        def slow_for_first(claim: str) -> str:
+            if claim == "claim 0":
+                time.sleep(0.1)
+            return claim
+
+        mock_chatbot.chat.side_effect = slow_for_first
+
+        results = list(get_responses(
+            mock_chatbot, ["claim 0", "claim 1"], max_concurrency=2, ordered=False,
+        ))
+
+        assert [r.index for r in results] == [1, 0]
+
+    def test_get_responses_captures_errors(self) -> None:
+        """Test that a failing claim is reported instead of aborting the run."""
+        mock_chatbot = MagicMock()
+        mock_chatbot.chat.side_effect = ["ok", RuntimeError("boom"), "ok"]
+
+        results = list(get_responses(mock_chatbot, ["a", "b", "c"], max_concurrency=1))
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert isinstance(results[1].error, RuntimeError)
+
+    def test_get_responses_bounds_concurrency(self) -> None:
+        """Test that no more than max_concurrency claims run at once."""
+        mock_chatbot = MagicMock()
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def track(claim: str) -> str:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return claim
+
+        mock_chatbot.chat.side_effect = track
+
+        results = list(get_responses(mock_chatbot, (str(i) for i in range(20)), max_concurrency=4))
+
+        assert len(results) == 20
+        assert peak <= 4
+
+    def test_get_responses_run_as_bulk(self) -> None:
+        """Test that claims are verified in the bulk priority class."""
+        mock_chatbot = MagicMock()
+        mock_chatbot.chat.side_effect = lambda claim: current_priority()
+
+        results = list(get_responses(mock_chatbot, ["a", "b"]))
+        explicit = list(get_responses(mock_chatbot, ["a"], priority=Priority.API))
+
+        assert [r.response for r in results] == [Priority.BULK, Priority.BULK]
+        assert explicit[0].response is Priority.API
+
+    def test_get_responses_invalid_concurrency_raises_error(self) -> None:
+        """Test that a non-positive max_concurrency raises ValueError."""
+        with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+            list(get_responses(MagicMock(), ["a"], max_concurrency=0))
+
+
+class TestAGetResponses:
+    """Test cases for the aget_responses function."""
+
+    @pytest.mark.asyncio
+    async def test_aget_responses(self) -> None:
+        """Test verifying claims concurrently on the event loop."""
+        mock_chatbot = MagicMock()
+
+        async def achat(claim: str) -> str:
+            if claim == "bad":
+                msg = "boom"
+                raise RuntimeError(msg)
+            return claim.upper()
+
+        mock_chatbot.achat = achat
+
+        results = [
+            result
+            async for result in aget_responses(
+                mock_chatbot, ["a", "bad", "c"], max_concurrency=2,
+            )
+        ]
+
+        assert [r.response for r in results] == ["A", None, "C"]
+        assert isinstance(results[1].error, RuntimeError)
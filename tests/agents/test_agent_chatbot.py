@@ -1,8 +1,9 @@
 """Tests for the agent chatbot module."""
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from langchain_core.messages import AIMessage
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
 
 from agents.chatbot.agent import AgentChatbot
 from agents.models.detector_model import DetectorModel
@@ -164,3 +165,132 @@ class TestAgentChatbot:
             chatbot.chat("Test input")
 
         assert mock_agent.invoke.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("agents.chatbot.agent.create_agent")
+    @patch("agents.chatbot.agent.InMemorySaver")
+    async def test_agent_chatbot_achat_with_schema(
+        self, mock_saver, mock_create_agent, mock_model,
+    ) -> None:
+        """Test that AgentChatbot.achat awaits the agent's ainvoke."""
+        mock_detector = DetectorModel(label="True", explanation="Test explanation")
+        mock_agent = MagicMock()
+        mock_agent.ainvoke = AsyncMock(return_value={
+            "messages": [AIMessage(content="Test")],
+            "structured_response": mock_detector,
+        })
+        mock_create_agent.return_value = mock_agent
+
+        chatbot = AgentChatbot(
+            model=mock_model,
+            prompt="Test prompt",
+            schema=DetectorModel,
+            tools=[],
+            id_="test-id",
+        )
+
+        response = await chatbot.achat("Test input")
+
+        assert response == mock_detector
+        mock_agent.ainvoke.assert_awaited_once()
+        mock_agent.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("agents.chatbot.agent.create_agent")
+    @patch("agents.chatbot.agent.InMemorySaver")
+    async def test_agent_chatbot_astream_chat(
+        self, mock_saver, mock_create_agent, mock_model,
+    ) -> None:
+        """Test that AgentChatbot.astream_chat yields text and skips tool calls."""
+        async def fake_astream(*args, **kwargs):
+            yield (AIMessageChunk(content="Hello"), {})
+            yield (
+                AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {"name": "search", "args": "{}", "id": "1", "index": 0},
+                    ],
+                ),
+                {},
+            )
+            yield (AIMessageChunk(content=[{"type": "text", "text": " World"}]), {})
+
+        mock_agent = MagicMock()
+        mock_agent.astream = fake_astream
+        mock_create_agent.return_value = mock_agent
+
+        chatbot = AgentChatbot(
+            model=mock_model,
+            prompt="Test prompt",
+            schema=None,
+            tools=[],
+            id_="test-id",
+        )
+
+        result = [chunk async for chunk in chatbot.astream_chat("Test input")]
+
+        assert result == ["Hello", " World"]
+
+    @patch("agents.chatbot.agent.create_agent")
+    @patch("agents.chatbot.agent.InMemorySaver")
+    def test_agent_chatbot_stream_verdict(
+        self, mock_saver, mock_create_agent, mock_model,
+    ) -> None:
+        """Test that the verdict is parsed from the structured output tool call."""
+        arguments = '{"label": "True", "explanation": "Confirmed by sources."}'
+        chunks = [
+            AIMessageChunk(
+                content="",
+                id="run-1",
+                tool_call_chunks=[{
+                    "name": "DetectorModel" if start == 0 else None,
+                    "args": arguments[start:start + 8],
+                    "id": "call-1" if start == 0 else None,
+                    "index": 0,
+                }],
+            )
+            for start in range(0, len(arguments), 8)
+        ]
+        mock_agent = MagicMock()
+        mock_agent.stream.return_value = iter((chunk, {}) for chunk in chunks)
+        mock_create_agent.return_value = mock_agent
+
+        chatbot = AgentChatbot(
+            model=mock_model,
+            prompt="Test prompt",
+            schema=DetectorModel,
+            tools=[],
+            id_="test-id",
+        )
+
+        events = list(chatbot.stream_verdict("Test input"))
+
+        assert (events[0].field, events[0].text) == ("label", "True")
+        assert "".join(e.text for e in events[1:]) == "Confirmed by sources."
+        mock_agent.stream.assert_called_once()
+
+    @patch("agents.chatbot.agent.create_agent")
+    @patch("agents.chatbot.agent.InMemorySaver")
+    def test_stateless_agent_chatbot(self, mock_saver, mock_create_agent, mock_model) -> None:
+        """Test that a stateless agent runs without a checkpointer or thread."""
+        mock_agent = MagicMock()
+        mock_agent.invoke.return_value = {"messages": [AIMessage(content="Answer")]}
+        mock_create_agent.return_value = mock_agent
+
+        chatbot = AgentChatbot(model=mock_model, prompt="Test prompt", stateless=True)
+        chatbot.chat("First claim")
+
+        assert mock_create_agent.call_args.kwargs["checkpointer"] is None
+        mock_saver.assert_not_called()
+        assert mock_agent.invoke.call_args.args[1] == {}
+        assert chatbot.checkpoint_threads() == []
+
+    def test_stateless_agent_chatbot_answers_each_claim_afresh(self) -> None:
+        """Test that a stateless agent runs end to end on a real graph."""
+        model = GenericFakeChatModel(
+            messages=iter([AIMessage(content="First"), AIMessage(content="Second")]),
+        )
+        chatbot = AgentChatbot(model=model, prompt="Test prompt", stateless=True)
+
+        assert chatbot.chat("First claim") == "First"
+        assert chatbot.chat("Second claim") == "Second"
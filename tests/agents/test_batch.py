@@ -0,0 +1,157 @@
+"""Tests for the batch module."""
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agents.batch import read_claims, read_done_ids, run_batch
+from agents.chatbot.llms.prompts.prompts import get_detector_prompt
+from agents.chatbot.plain_chatbot import PlainChatbot
+from agents.models.detector_model import DetectorModel
+
+
+class PromptSizeChatModel(GenericFakeChatModel):
+    """A fake chat model recording how many messages each call was sent."""
+
+    messages: object = None
+    sizes: list = []
+    lock: object = None
+
+    def _generate(self, messages: list[BaseMessage], *args, **kwargs) -> ChatResult:
+        with self.lock:
+            self.sizes.append(len(messages))
+        message = AIMessage(content='{"label": "False", "explanation": "No."}')
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _write_jsonl(path, records) -> None:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+class TestReadClaims:
+    """Test cases for the read_claims function."""
+
+    def test_read_claims_skips_done_and_malformed(self, tmp_path) -> None:
+        """Test that done ids and malformed lines are skipped."""
+        input_path = tmp_path / "claims.jsonl"
+        input_path.write_text(
+            '{"id": 1, "claim": "first"}\n'
+            "not json\n"
+            "\n"
+            '{"id": 2, "claim": "second"}\n'
+            '{"claim": "missing id"}\n',
+        )
+
+        claims = list(read_claims(input_path, skip_ids={"1"}))
+
+        assert claims == [("2", "second")]
+
+
+class TestReadDoneIds:
+    """Test cases for the read_done_ids function."""
+
+    def test_read_done_ids_missing_file(self, tmp_path) -> None:
+        """Test that a missing output file means nothing is done."""
+        assert read_done_ids(tmp_path / "verdicts.jsonl") == set()
+
+    def test_read_done_ids_ignores_torn_line(self, tmp_path) -> None:
+        """Test that a partially written last line is ignored."""
+        output_path = tmp_path / "verdicts.jsonl"
+        output_path.write_text('{"id": "a", "label": "True"}\n{"id": "b", "lab')
+
+        assert read_done_ids(output_path) == {"a"}
+
+
+class TestRunBatch:
+    """Test cases for the run_batch function."""
+
+    def test_run_batch_writes_verdicts(self, tmp_path) -> None:
+        """Test that verdicts of all claims are appended to the output."""
+        input_path = tmp_path / "claims.jsonl"
+        output_path = tmp_path / "verdicts.jsonl"
+        _write_jsonl(input_path, [{"id": i, "claim": f"claim {i}"} for i in range(5)])
+
+        mock_chatbot = MagicMock()
+        mock_chatbot.checkpoint_threads.return_value = []
+        mock_chatbot.chat.side_effect = lambda claim: DetectorModel(
+            label="True", explanation=claim,
+        )
+
+        stats = run_batch(mock_chatbot, input_path, output_path, max_concurrency=2)
+
+        records = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert stats == {"skipped": 0, "verified": 5, "failed": 0}
+        assert sorted(record["id"] for record in records) == ["0", "1", "2", "3", "4"]
+        assert {record["explanation"] for record in records} == {
+            f"claim {i}" for i in range(5)
+        }
+
+    def test_run_batch_resumes_and_retries_failures(self, tmp_path) -> None:
+        """Test that written ids are skipped and failed claims are retried."""
+        input_path = tmp_path / "claims.jsonl"
+        output_path = tmp_path / "verdicts.jsonl"
+        _write_jsonl(input_path, [{"id": i, "claim": f"claim {i}"} for i in range(3)])
+        _write_jsonl(output_path, [{"id": "0", "label": "True", "explanation": "x"}])
+
+        mock_chatbot = MagicMock()
+        mock_chatbot.checkpoint_threads.return_value = []
+        mock_chatbot.chat.side_effect = lambda claim: (
+            AIMessage(content='{"label": "False", "explanation": "y"}')
+            if claim == "claim 1"
+            else "not a verdict"
+        )
+
+        stats = run_batch(mock_chatbot, input_path, output_path, max_concurrency=1)
+
+        assert stats == {"skipped": 1, "verified": 1, "failed": 1}
+        assert read_done_ids(output_path) == {"0", "1"}
+        assert mock_chatbot.chat.call_count == 2
+
+    def test_run_batch_resumes_after_torn_line(self, tmp_path) -> None:
+        """Test that a torn last line is cut off before new verdicts are appended."""
+        input_path = tmp_path / "claims.jsonl"
+        output_path = tmp_path / "verdicts.jsonl"
+        _write_jsonl(input_path, [{"id": i, "claim": f"claim {i}"} for i in range(2)])
+        output_path.write_text(
+            '{"id": "0", "label": "True", "explanation": "x"}\n{"id": "1", "lab',
+        )
+
+        mock_chatbot = MagicMock()
+        mock_chatbot.checkpoint_threads.return_value = []
+        mock_chatbot.chat.side_effect = lambda claim: DetectorModel(
+            label="False", explanation=claim,
+        )
+
+        stats = run_batch(mock_chatbot, input_path, output_path)
+
+        records = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert stats == {"skipped": 1, "verified": 1, "failed": 0}
+        assert [record["id"] for record in records] == ["0", "1"]
+        assert records[1]["explanation"] == "claim 1"
+
+    def test_run_batch_prompt_size_stays_flat(self, tmp_path) -> None:
+        """Test that claims of a batch do not share or grow a history."""
+        input_path = tmp_path / "claims.jsonl"
+        output_path = tmp_path / "verdicts.jsonl"
+        _write_jsonl(input_path, [{"id": i, "claim": f"claim {i}"} for i in range(40)])
+        model = PromptSizeChatModel(sizes=[], lock=threading.Lock())
+        chatbot = PlainChatbot(model=model, prompt=get_detector_prompt(), stateless=True)
+
+        stats = run_batch(chatbot, input_path, output_path, max_concurrency=4)
+
+        assert stats["verified"] == 40
+        assert len(model.sizes) == 40
+        assert set(model.sizes) == {model.sizes[0]}
+
+    def test_run_batch_rejects_stateful_chatbot(self, tmp_path) -> None:
+        """Test that a chatbot keeping one conversation is refused."""
+        chatbot = PlainChatbot(
+            model=PromptSizeChatModel(), prompt=get_detector_prompt(),
+        )
+
+        with pytest.raises(ValueError, match="stateless"):
+            run_batch(chatbot, tmp_path / "claims.jsonl", tmp_path / "verdicts.jsonl")
@@ -0,0 +1,151 @@
+"""Tests for the cascade module."""
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from pydantic import Field
+
+from agents.chatbot.cascade import CascadeChatbot
+from agents.chatbot.plain_chatbot import PlainChatbot
+from agents.models.detector_model import DetectorModel
+
+
+class RecordingChatModel(GenericFakeChatModel):
+    """A fake chat model recording the messages of every call."""
+
+    calls: list = Field(default_factory=list)
+
+    def _generate(self, messages: list[BaseMessage], *args, **kwargs):
+        self.calls.append(messages)
+        return super()._generate(messages, *args, **kwargs)
+
+
+def verdict(label: str, confidence: float | None = None) -> AIMessage:
+    """Create a model message holding a verdict as JSON."""
+    content = {"label": label, "explanation": f"{label} because"}
+    if confidence is not None:
+        content["confidence"] = confidence
+    return AIMessage(content=json.dumps(content))
+
+
+@pytest.fixture
+def build_cascade(sample_prompt):
+    """Create a factory building cascades of chatbots with canned answers."""
+
+    def build(cheap: list[AIMessage], strong: list[AIMessage], **kwargs) -> CascadeChatbot:
+        return CascadeChatbot(
+            cheap=PlainChatbot(
+                model=GenericFakeChatModel(messages=iter(cheap)), prompt=sample_prompt,
+            ),
+            strong=PlainChatbot(
+                model=GenericFakeChatModel(messages=iter(strong)), prompt=sample_prompt,
+            ),
+            **kwargs,
+        )
+
+    return build
+
+
+class TestCascadeChatbot:
+    """Test cases for the CascadeChatbot class."""
+
+    def test_confident_verdict_is_kept(self, build_cascade) -> None:
+        """Test that a confident cheap verdict is not escalated."""
+        chatbot = build_cascade([verdict("False", 0.9)], [])
+
+        response = chatbot.chat("Test claim")
+
+        assert response.label == "False"
+        assert chatbot.stats() == {"claims": 1, "escalations": 0, "escalation_rate": 0.0}
+
+    def test_unclear_verdict_is_escalated(self, build_cascade) -> None:
+        """Test that an unclear verdict is answered by the strong chatbot."""
+        chatbot = build_cascade([verdict("Unclear", 0.95)], [verdict("True")])
+
+        response = chatbot.chat("Test claim")
+
+        assert response.label == "True"
+        assert chatbot.stats()["escalations"] == 1
+
+    def test_both_stages_return_detector_models(self, build_cascade) -> None:
+        """Test that kept and escalated verdicts have the same type."""
+        chatbot = build_cascade(
+            [verdict("False", 0.9), verdict("Unclear", 0.9)], [verdict("True")],
+        )
+
+        kept = chatbot.chat("First claim")
+        escalated = chatbot.chat("Second claim")
+
+        assert kept == DetectorModel(label="False", explanation="False because")
+        assert escalated == DetectorModel(label="True", explanation="True because")
+
+    def test_low_confidence_is_escalated(self, build_cascade) -> None:
+        """Test that verdicts below the confidence threshold are escalated."""
+        chatbot = build_cascade(
+            [verdict("True", 0.4), verdict("False", 0.8)],
+            [verdict("False")],
+            min_confidence=0.5,
+        )
+
+        chatbot.chat("First claim")
+        chatbot.chat("Second claim")
+
+        assert chatbot.stats() == {"claims": 2, "escalations": 1, "escalation_rate": 0.5}
+
+    def test_unreadable_verdict_is_escalated(self, build_cascade) -> None:
+        """Test that a cheap answer that is not a verdict is escalated."""
+        chatbot = build_cascade([AIMessage(content="No idea")], [verdict("True")])
+
+        assert chatbot.chat("Test claim").label == "True"
+
+    @pytest.mark.asyncio
+    async def test_achat_escalates(self, build_cascade) -> None:
+        """Test that the async path escalates as well."""
+        chatbot = build_cascade([verdict("Unclear", 0.9)], [verdict("False")])
+
+        response = await chatbot.achat("Test claim")
+
+        assert response.label == "False"
+
+    def test_stream_verdict_of_kept_verdict(self, build_cascade) -> None:
+        """Test that a kept cheap verdict is streamed field by field."""
+        chatbot = build_cascade([verdict("True", 0.9)], [])
+
+        events = list(chatbot.stream_verdict("Test claim"))
+
+        assert (events[0].field, events[0].text) == ("label", "True")
+
+    def test_with_id_rebinds_stages(self, build_cascade) -> None:
+        """Test that copies use their own threads but share the statistics."""
+        chatbot = build_cascade([verdict("True", 0.9)], [])
+
+        copy = chatbot.with_id("session")
+        copy.chat("Test claim")
+
+        assert copy.cheap.id == "session_cheap"
+        assert copy.strong.id == "session_strong"
+        assert chatbot.stats()["claims"] == 1
+
+    def test_stateless_cascade_keeps_no_history(self, sample_prompt) -> None:
+        """Test that repeated stateless calls do not grow either stage's prompt."""
+        cheap_model = RecordingChatModel(
+            messages=iter([verdict("Unclear", 0.9) for _ in range(4)]),
+        )
+        strong_model = RecordingChatModel(messages=iter([verdict("True") for _ in range(4)]))
+        chatbot = CascadeChatbot(
+            cheap=PlainChatbot(model=cheap_model, prompt=sample_prompt, stateless=True),
+            strong=PlainChatbot(model=strong_model, prompt=sample_prompt, stateless=True),
+        )
+
+        for i in range(4):
+            chatbot.chat(f"Claim {i}")
+
+        assert len({len(messages) for messages in cheap_model.calls}) == 1
+        assert len({len(messages) for messages in strong_model.calls}) == 1
+        assert chatbot.checkpoint_threads() == []
+
+    def test_invalid_min_confidence_raises_error(self, build_cascade) -> None:
+        """Test that the confidence threshold must be a probability."""
+        with pytest.raises(ValueError, match="min_confidence"):
+            build_cascade([], [], min_confidence=1.5)
@@ -0,0 +1,133 @@
+"""Tests for the cassette module."""
+import time
+from typing import Any
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from agents.chatbot.agent import AgentChatbot
+from agents.chatbot.cassette import Cassette
+
+
+class ToolCallingChatModel(GenericFakeChatModel):
+    """Fake chat model that accepts tools and counts its calls."""
+
+    calls: int = 0
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "ToolCallingChatModel":
+        return self
+
+    def _generate(self, *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        return super()._generate(*args, **kwargs)
+
+
+def scripted_model() -> ToolCallingChatModel:
+    """Create a model that searches once, then answers."""
+    return ToolCallingChatModel(messages=iter([
+        AIMessage("", tool_calls=[{"name": "lookup", "args": {"query": "moon"}, "id": "call_1"}]),
+        AIMessage("The claim is false."),
+    ]))
+
+
+def make_lookup(calls: list) -> Any:
+    """Create a tool that records its calls."""
+    @tool(response_format="content_and_artifact")
+    def lookup(query: str) -> tuple[str, list]:
+        """Look up documents about a query."""
+        calls.append(query)
+        return f"Documents about {query}", [Document(page_content=query)]
+
+    return lookup
+
+
+def run_agent(cassette: Cassette, model: Any, calls: list) -> str:
+    """Verify a claim with an agent whose model and tools use the cassette."""
+    chatbot = AgentChatbot(
+        model=cassette.wrap_model(model, model_name="fake"),
+        prompt="You verify claims.",
+        tools=cassette.wrap_tools([make_lookup(calls)]),
+        stateless=True,
+    )
+    return chatbot.chat("The moon is made of cheese")
+
+
+class TestCassette:
+    """Test cases for the Cassette class."""
+
+    def test_agent_run_is_replayed_offline(self, tmp_path) -> None:
+        """Test that a recorded agent run replays without model or tools."""
+        path = tmp_path / "run.jsonl.gz"
+        recorded_calls = []
+        with Cassette(path, mode="record") as cassette:
+            recorded = run_agent(cassette, scripted_model(), recorded_calls)
+        assert cassette.stats()["recorded"] == 3
+
+        replayed_calls = []
+        replay = Cassette(path, mode="replay")
+        replayed = run_agent(replay, None, replayed_calls)
+
+        assert replayed == recorded == "The claim is false."
+        assert recorded_calls == ["moon"]
+        assert replayed_calls == []
+        assert replay.stats()["replayed"] == 3
+
+    def test_artifacts_are_restored(self, tmp_path) -> None:
+        """Test that tool artifacts such as documents survive the cassette."""
+        calls = []
+        with Cassette(tmp_path / "tools.jsonl", mode="record") as cassette:
+            cassette.wrap_tool(make_lookup(calls)).invoke({
+                "type": "tool_call", "name": "lookup", "args": {"query": "moon"}, "id": "1",
+            })
+
+        message = Cassette(tmp_path / "tools.jsonl", mode="replay").wrap_tool(
+            make_lookup(calls),
+        ).invoke({"type": "tool_call", "name": "lookup", "args": {"query": "moon"}, "id": "2"})
+
+        assert message.content == "Documents about moon"
+        assert message.artifact == [Document(page_content="moon")]
+        assert calls == ["moon"]
+
+    def test_missing_request_raises_in_replay_mode(self, tmp_path) -> None:
+        """Test that requests not in the cassette are not sent anywhere."""
+        path = tmp_path / "empty.jsonl"
+        Cassette(path, mode="record").save()
+        model = Cassette(path, mode="replay").wrap_model(None, model_name="fake")
+
+        with pytest.raises(LookupError, match="not in cassette"):
+            model.invoke("Claim")
+
+    def test_auto_mode_records_only_misses(self, tmp_path) -> None:
+        """Test that auto mode calls the live model for new requests only."""
+        live = ToolCallingChatModel(messages=iter([AIMessage("first"), AIMessage("second")]))
+        cassette = Cassette(tmp_path / "auto.jsonl", mode="auto")
+        model = cassette.wrap_model(live, model_name="fake")
+
+        assert model.invoke("Claim A").content == "first"
+        assert model.invoke("Claim A").content == "first"
+        assert model.invoke("Claim B").content == "second"
+        assert live.calls == 2
+
+    def test_synthetic_latency_is_replayed(self, tmp_path) -> None:
+        """Test that replayed calls wait for the configured latency."""
+        path = tmp_path / "latency.jsonl"
+        with Cassette(path, mode="record") as cassette:
+            cassette.wrap_model(
+                GenericFakeChatModel(messages=iter([AIMessage("answer")])), model_name="fake",
+            ).invoke("Claim")
+        replay = Cassette(path, mode="replay", latency=0.05)
+        model = replay.wrap_model(None, model_name="fake")
+
+        start = time.perf_counter()
+        assert model.invoke("Claim").content == "answer"
+        assert time.perf_counter() - start >= 0.05
+
+    def test_invalid_mode_raises_error(self, tmp_path) -> None:
+        """Test that unknown modes and missing replay files are rejected."""
+        with pytest.raises(ValueError, match="Unknown cassette mode"):
+            Cassette(tmp_path / "c.jsonl", mode="live")
+        with pytest.raises(FileNotFoundError):
+            Cassette(tmp_path / "missing.jsonl", mode="replay")
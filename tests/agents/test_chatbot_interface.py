@@ -42,3 +42,22 @@ class TestChatbotInterface:
 
         assert chatbot.chat("test") == "response"
         assert list(chatbot.stream_chat("test")) == ["response"]
+
+    @pytest.mark.asyncio
+    async def test_chatbot_interface_async_defaults_use_sync_methods(self) -> None:
+        """Test that the default async methods fall back to the sync ones."""
+        class SyncOnlyChatbot(ChatbotInterface):
+            def __init__(self, model, prompt, schema=None, id_="test") -> None:
+                self.model = model
+
+            def chat(self, user_input: str) -> str:
+                return f"echo: {user_input}"
+
+            def stream_chat(self, user_input: str):
+                yield "echo"
+                yield user_input
+
+        chatbot = SyncOnlyChatbot(MagicMock(), "test prompt")
+
+        assert await chatbot.achat("test") == "echo: test"
+        assert [chunk async for chunk in chatbot.astream_chat("test")] == ["echo", "test"]
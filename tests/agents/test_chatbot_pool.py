@@ -0,0 +1,103 @@
+"""Tests for the chatbot_pool module."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agents.chatbot.agent import AgentChatbot
+from agents.chatbot.chatbot_pool import ChatbotPool
+
+
+@pytest.fixture
+def agent_factory():
+    """Create a factory building AgentChatbots on a mocked agent graph."""
+    with patch("agents.chatbot.agent.create_agent") as mock_create_agent, \
+            patch("agents.chatbot.agent.InMemorySaver"):
+        mock_create_agent.return_value = MagicMock()
+        factory = MagicMock(
+            side_effect=lambda: AgentChatbot(
+                model=MagicMock(), prompt="Test prompt", id_="template",
+            ),
+        )
+        yield factory
+
+
+class TestChatbotPool:
+    """Test cases for the ChatbotPool class."""
+
+    def test_acquire_reuses_template(self, agent_factory) -> None:
+        """Test that a pooled configuration is built only once."""
+        pool = ChatbotPool(max_size=2)
+
+        first = pool.acquire("key", agent_factory, id_="conversation-1")
+        second = pool.acquire("key", agent_factory, id_="conversation-2")
+
+        assert agent_factory.call_count == 1
+        assert first.agent is second.agent
+        assert first.id == "conversation-1"
+        assert second.id == "conversation-2"
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["misses"] == 1
+
+    def test_acquire_generates_unique_ids(self, agent_factory) -> None:
+        """Test that each acquired chatbot gets its own conversation id."""
+        pool = ChatbotPool(max_size=2)
+
+        first = pool.acquire("key", agent_factory)
+        second = pool.acquire("key", agent_factory)
+
+        assert first.id != second.id
+
+    def test_acquire_evicts_least_recently_used(self, agent_factory) -> None:
+        """Test that the least recently used template is evicted."""
+        pool = ChatbotPool(max_size=2)
+
+        pool.acquire("a", agent_factory)
+        pool.acquire("b", agent_factory)
+        pool.acquire("a", agent_factory)
+        pool.acquire("c", agent_factory)
+        pool.acquire("a", agent_factory)
+        pool.acquire("b", agent_factory)
+
+        assert len(pool) == 2
+        assert agent_factory.call_count == 4
+        assert pool.stats()["evictions"] == 2
+
+    def test_build_does_not_block_other_keys(self, agent_factory) -> None:
+        """Test that a slow build only blocks callers of the same key."""
+        pool = ChatbotPool(max_size=4)
+        release = threading.Event()
+
+        def slow_factory():
+            release.wait()
+            return agent_factory()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            slow = [executor.submit(pool.acquire, "slow", slow_factory) for _ in range(2)]
+            time.sleep(0.05)
+            fast = pool.acquire("fast", agent_factory)
+            assert not any(future.done() for future in slow)
+            release.set()
+            first, second = (future.result() for future in slow)
+
+        assert fast.id != first.id
+        assert first.agent is second.agent
+        assert agent_factory.call_count == 2
+        assert pool.stats()["misses"] == 2
+
+    def test_failed_build_is_retried(self, agent_factory) -> None:
+        """Test that a failing factory does not leave the key blocked."""
+        pool = ChatbotPool(max_size=2)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            pool.acquire("key", MagicMock(side_effect=RuntimeError("boom")))
+
+        assert pool.acquire("key", agent_factory).id
+        assert len(pool) == 1
+
+    def test_invalid_max_size_raises_error(self) -> None:
+        """Test that a non-positive max_size raises ValueError."""
+        with pytest.raises(ValueError, match="max_size must be at least 1"):
+            ChatbotPool(max_size=0)
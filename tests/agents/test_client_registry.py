@@ -0,0 +1,73 @@
+"""Tests for the client_registry module."""
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agents.chatbot.llms.client_registry import ClientRegistry
+from agents.chatbot.llms.google import GoogleLLM
+from agents.chatbot.llms.rate_limiter import rate_limiter_kwargs
+
+
+class TestClientRegistry:
+    """Test cases for the ClientRegistry class."""
+
+    def test_same_configuration_shares_client(self) -> None:
+        """Test that a configuration is built once and then reused."""
+        registry = ClientRegistry()
+        factory = MagicMock(side_effect=lambda: object())
+
+        first = registry.get("google", "gemini-2.5-flash", factory, max_tokens=1024)
+        second = registry.get("google", "gemini-2.5-flash", factory, max_tokens=1024)
+
+        assert first is second
+        factory.assert_called_once()
+        assert registry.stats() == {"clients": 1, "created": 1, "reused": 1}
+
+    def test_different_parameters_are_not_shared(self) -> None:
+        """Test that clients built with other parameters are kept apart."""
+        registry = ClientRegistry()
+
+        first = registry.get("google", "gemini-2.5-flash", object, max_tokens=1024)
+        second = registry.get("google", "gemini-2.5-flash", object, max_tokens=2048)
+        third = registry.get("google", "gemini-2.5-pro", object, max_tokens=1024)
+
+        assert len({id(first), id(second), id(third)}) == 3
+
+    def test_pool_hands_out_clients_round_robin(self) -> None:
+        """Test that a larger pool spreads requests over several clients."""
+        registry = ClientRegistry(pool_size=2)
+
+        clients = [registry.get("google", "gemini-2.5-flash", object) for _ in range(4)]
+
+        assert clients[0] is not clients[1]
+        assert clients[0] is clients[2]
+        assert clients[1] is clients[3]
+        assert len(registry) == 2
+
+    def test_clear_builds_new_clients(self) -> None:
+        """Test that clearing the registry drops the shared clients."""
+        registry = ClientRegistry()
+        first = registry.get("google", "gemini-2.5-flash", object)
+
+        registry.clear()
+
+        assert registry.get("google", "gemini-2.5-flash", object) is not first
+
+    def test_invalid_pool_size_raises_error(self) -> None:
+        """Test that a pool must hold at least one client."""
+        with pytest.raises(ValueError, match="pool_size"):
+            ClientRegistry(pool_size=0)
+
+    @patch("agents.chatbot.llms.google.ChatGoogleGenerativeAI")
+    def test_google_llm_shares_model(self, mock_chat_google) -> None:
+        """Test that GoogleLLM returns the shared model for a configuration."""
+        os.environ["GOOGLE_API_KEY"] = "test-key"
+
+        first = GoogleLLM.get_chat_model("gemini-2.5-flash")
+        second = GoogleLLM.get_chat_model("gemini-2.5-flash")
+
+        assert first is second
+        mock_chat_google.assert_called_once_with(
+            model="gemini-2.5-flash", max_tokens=1024, **rate_limiter_kwargs("google"),
+        )
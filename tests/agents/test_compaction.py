@@ -0,0 +1,89 @@
+"""Tests for the compaction module."""
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from agents.chatbot.compaction import HistoryCompactionMiddleware
+
+
+def turn(number: int, output_size: int) -> list:
+    """Create a user turn with one tool call returning a large output."""
+    call_id = f"call-{number}"
+    return [
+        HumanMessage(content=f"Claim {number}", id=f"human-{number}"),
+        AIMessage(
+            content="",
+            id=f"ai-{number}",
+            tool_calls=[{"name": "retrieve_context", "args": {"query": "q"}, "id": call_id}],
+        ),
+        ToolMessage(
+            content="x" * output_size,
+            id=f"tool-{number}",
+            name="retrieve_context",
+            tool_call_id=call_id,
+        ),
+        AIMessage(content=f"Answer {number}", id=f"answer-{number}"),
+    ]
+
+
+class TestHistoryCompactionMiddleware:
+    """Test cases for the HistoryCompactionMiddleware class."""
+
+    def test_history_within_budget_is_kept(self) -> None:
+        """Test that nothing is compacted while the history fits the budget."""
+        middleware = HistoryCompactionMiddleware(max_tokens=10_000, keep_turns=1)
+        messages = turn(1, 400) + turn(2, 400)
+
+        assert middleware.before_model({"messages": messages}, MagicMock()) is None
+
+    def test_old_tool_outputs_are_compacted_first(self) -> None:
+        """Test that the oldest tool outputs are compacted until the history fits."""
+        middleware = HistoryCompactionMiddleware(
+            max_tokens=2_000, keep_turns=1, preview_chars=20,
+        )
+        messages = turn(1, 4_000) + turn(2, 4_000) + turn(3, 4_000)
+
+        update = middleware.before_model({"messages": messages}, MagicMock())
+
+        compacted = update["messages"]
+        assert [message.id for message in compacted] == ["tool-1", "tool-2"]
+        assert all(message.tool_call_id.startswith("call-") for message in compacted)
+        assert compacted[0].text.startswith("[Output of retrieve_context compacted")
+        assert compacted[0].text.endswith("x" * 20)
+        assert compacted[0].additional_kwargs["compacted"] is True
+
+    def test_recent_turns_are_kept_verbatim(self) -> None:
+        """Test that tool outputs of the kept turns are never compacted."""
+        middleware = HistoryCompactionMiddleware(max_tokens=100, keep_turns=2)
+        messages = turn(1, 4_000) + turn(2, 4_000) + turn(3, 4_000)
+
+        update = middleware.before_model({"messages": messages}, MagicMock())
+
+        assert [message.id for message in update["messages"]] == ["tool-1"]
+
+    def test_compacted_messages_are_not_compacted_again(self) -> None:
+        """Test that an already compacted history is left alone."""
+        middleware = HistoryCompactionMiddleware(max_tokens=100, keep_turns=1)
+        messages = turn(1, 4_000) + turn(2, 4_000)
+        compacted = middleware.before_model({"messages": messages}, MagicMock())["messages"]
+        messages[2] = compacted[0]
+
+        assert middleware.before_model({"messages": messages}, MagicMock()) is None
+
+    def test_token_counts_are_cached(self) -> None:
+        """Test that each message is counted once across model calls."""
+        counter = MagicMock(side_effect=count_tokens_approximately)
+        middleware = HistoryCompactionMiddleware(max_tokens=10_000, token_counter=counter)
+        messages = turn(1, 400)
+
+        middleware.before_model({"messages": messages}, MagicMock())
+        middleware.before_model({"messages": messages}, MagicMock())
+
+        assert counter.call_count == len(messages)
+
+    def test_invalid_budget_raises_error(self) -> None:
+        """Test that a negative budget is rejected."""
+        with pytest.raises(ValueError, match="max_tokens"):
+            HistoryCompactionMiddleware(max_tokens=-1)
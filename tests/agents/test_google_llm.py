@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from agents.chatbot.llms.google import GoogleLLM
+from agents.chatbot.llms.rate_limiter import rate_limiter_kwargs
 
 
 class TestGoogleLLM:
@@ -37,7 +38,9 @@ class TestGoogleLLM:
         model = GoogleLLM.get_chat_model("gemini-2.5-flash")
 
         assert model == mock_model
-        mock_chat_google.assert_called_once_with(model="gemini-2.5-flash", max_tokens=1024)
+        mock_chat_google.assert_called_once_with(
+            model="gemini-2.5-flash", max_tokens=1024, **rate_limiter_kwargs("google"),
+        )
 
     @patch("agents.chatbot.llms.google.ChatGoogleGenerativeAI")
     def test_get_chat_model_default_model(self, mock_chat_google) -> None:
@@ -49,7 +52,9 @@ class TestGoogleLLM:
 
         GoogleLLM.get_chat_model()
 
-        mock_chat_google.assert_called_once_with(model="gemini-2.5-flash", max_tokens=1024)
+        mock_chat_google.assert_called_once_with(
+            model="gemini-2.5-flash", max_tokens=1024, **rate_limiter_kwargs("google"),
+        )
 
     @patch("agents.chatbot.llms.google.ChatGoogleGenerativeAI")
     def test_get_chat_model_custom_model(self, mock_chat_google) -> None:
@@ -61,4 +66,6 @@ class TestGoogleLLM:
 
         GoogleLLM.get_chat_model("gemini-2.5-pro")
 
-        mock_chat_google.assert_called_once_with(model="gemini-2.5-pro", max_tokens=1024)
+        mock_chat_google.assert_called_once_with(
+            model="gemini-2.5-pro", max_tokens=1024, **rate_limiter_kwargs("google"),
+        )
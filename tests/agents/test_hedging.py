@@ -0,0 +1,228 @@
+"""Tests for the hedging module."""
+import asyncio
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agents.chatbot.llms.hedging import HedgedChatModel, HedgePool
+
+
+class DelayedChatModel(BaseChatModel):
+    """Fake chat model answering after a delay per call, or failing."""
+
+    name: str = "delayed"
+    delays: list[float] = [0.0]
+    fail: bool = False
+    calls: int = 0
+    cancelled: int = 0
+    bound_tools: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "delayed"
+
+    def _next_delay(self) -> float:
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        return delay
+
+    def _answer(self) -> ChatResult:
+        if self.fail:
+            msg = f"{self.name} failed"
+            raise RuntimeError(msg)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(self.name))])
+
+    def _generate(self, messages: list, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._next_delay())
+        return self._answer()
+
+    async def _agenerate(self, messages: list, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        try:
+            await asyncio.sleep(self._next_delay())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._answer()
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "DelayedChatModel":
+        return self.model_copy(update={"bound_tools": list(tools)})
+
+
+class RunRecorder(BaseCallbackHandler):
+    """Callback handler recording the tags of every chat model run."""
+
+    def __init__(self) -> None:
+        self.runs: list[list[str]] = []
+
+    def on_chat_model_start(self, serialized: dict, messages: list, **kwargs: Any) -> None:
+        self.runs.append(kwargs.get("tags") or [])
+
+
+class TestHedgedChatModel:
+    """Test cases for the HedgedChatModel class."""
+
+    def test_fast_call_is_not_hedged(self) -> None:
+        """Test that calls faster than the threshold go to the primary only."""
+        primary, secondary = DelayedChatModel(name="primary"), DelayedChatModel(name="secondary")
+        model = HedgedChatModel(primary=primary, secondary=secondary, initial_delay=1.0)
+
+        assert model.invoke("Claim").content == "primary"
+        assert secondary.calls == 0
+        assert model.stats()["hedge_rate"] == 0.0
+
+    def test_slow_call_is_hedged(self) -> None:
+        """Test that a slow primary is outrun by the secondary."""
+        primary = DelayedChatModel(name="primary", delays=[0.3])
+        secondary = DelayedChatModel(name="secondary")
+        model = HedgedChatModel(primary=primary, secondary=secondary, initial_delay=0.05)
+
+        start = time.perf_counter()
+        answer = model.invoke("Claim")
+        elapsed = time.perf_counter() - start
+        time.sleep(0.35)
+
+        assert answer.content == "secondary"
+        assert elapsed < 0.25
+        stats = model.stats()
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+        assert stats["hedge_rate"] == 1.0
+        assert stats["latency_saved"] > 0.1
+
+    def test_failing_call_fails_over(self) -> None:
+        """Test that an error sends the call to the backup right away."""
+        primary = DelayedChatModel(name="primary", fail=True)
+        secondary = DelayedChatModel(name="secondary")
+        model = HedgedChatModel(primary=primary, secondary=secondary, initial_delay=5.0)
+
+        assert model.invoke("Claim").content == "secondary"
+        assert model.stats()["failovers"] == 1
+        assert model.stats()["hedges"] == 0
+
+    def test_error_is_raised_when_both_fail(self) -> None:
+        """Test that the primary's error is raised when the backup fails too."""
+        primary = DelayedChatModel(name="primary", fail=True)
+        model = HedgedChatModel(
+            primary=primary, secondary=DelayedChatModel(name="secondary", fail=True),
+        )
+
+        with pytest.raises(RuntimeError, match="primary failed"):
+            model.invoke("Claim")
+
+    def test_threshold_follows_latency_percentile(self) -> None:
+        """Test that the threshold is a percentile once enough calls were seen."""
+        primary = DelayedChatModel(delays=[0.0] * 9 + [0.05])
+        model = HedgedChatModel(
+            primary=primary, percentile=0.9, min_samples=10, initial_delay=5.0,
+        )
+
+        for _ in range(9):
+            model.invoke("Claim")
+        assert model.stats()["threshold"] == 5.0
+        model.invoke("Claim")
+
+        assert 0.05 <= model.stats()["threshold"] < 5.0
+
+    def test_queued_call_is_not_hedged(self) -> None:
+        """Test that the time a call waits for a thread does not count."""
+        primary, secondary = DelayedChatModel(name="primary"), DelayedChatModel(name="secondary")
+        model = HedgedChatModel(primary=primary, secondary=secondary, initial_delay=0.05)
+        pool = HedgePool(workers=2)
+        busy = [pool.submit(time.sleep, 0.2) for _ in range(2)]
+
+        with patch("agents.chatbot.llms.hedging._pool", pool):
+            assert model.invoke("Claim").content == "primary"
+
+        assert all(future.done() for future in busy)
+        assert secondary.calls == 0
+        assert model.stats()["hedges"] == 0
+
+    def test_saturated_pool_skips_hedge(self) -> None:
+        """Test that no hedge is queued while every thread is busy."""
+        primary = DelayedChatModel(name="primary", delays=[0.2])
+        secondary = DelayedChatModel(name="secondary")
+        model = HedgedChatModel(primary=primary, secondary=secondary, initial_delay=0.05)
+
+        with patch("agents.chatbot.llms.hedging._pool", HedgePool(workers=1)):
+            assert model.invoke("Claim").content == "primary"
+
+        assert secondary.calls == 0
+        assert model.stats()["hedges"] == 0
+        assert model.stats()["hedges_skipped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_hedge_cancels_the_slow_call(self) -> None:
+        """Test that the outrun primary call is cancelled."""
+        primary = DelayedChatModel(name="primary", delays=[1.0])
+        model = HedgedChatModel(primary=primary, initial_delay=0.05)
+        primary.delays = [1.0, 0.0]
+
+        answer = await asyncio.wait_for(model.ainvoke("Claim"), 0.5)
+
+        assert answer.content == "primary"
+        assert primary.calls == 2
+        assert primary.cancelled == 1
+        assert model.stats()["hedge_wins"] == 1
+
+    def test_bind_tools_binds_both_models(self) -> None:
+        """Test that tools are bound to both models and stats are shared."""
+        model = HedgedChatModel(
+            primary=DelayedChatModel(name="primary"),
+            secondary=DelayedChatModel(name="secondary"),
+        )
+
+        bound = model.bind_tools([{"name": "search"}])
+        bound.invoke("Claim")
+
+        assert bound.primary.bound_tools == [{"name": "search"}]
+        assert bound.secondary.bound_tools == [{"name": "search"}]
+        assert model.stats()["calls"] == 1
+        assert model.model_name == "DelayedChatModel|hedge:DelayedChatModel"
+
+    def test_stream_is_hedged_on_first_chunk(self) -> None:
+        """Test that a stream slow to start is served by the backup."""
+        primary = DelayedChatModel(name="primary", delays=[0.3])
+        secondary = DelayedChatModel(name="secondary")
+        model = HedgedChatModel(primary=primary, secondary=secondary, initial_delay=0.05)
+
+        start = time.perf_counter()
+        chunks = list(model.stream("Claim"))
+        elapsed = time.perf_counter() - start
+
+        assert "".join(chunk.content for chunk in chunks) == "secondary"
+        assert elapsed < 0.25
+        assert model.stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_astream_is_hedged_on_first_chunk(self) -> None:
+        """Test that the async stream cancels the model that started late."""
+        primary = DelayedChatModel(name="primary", delays=[1.0])
+        model = HedgedChatModel(
+            primary=primary, secondary=DelayedChatModel(name="secondary"), initial_delay=0.05,
+        )
+
+        chunks = await asyncio.wait_for(self._collect(model.astream("Claim")), 0.5)
+
+        assert "".join(chunk.content for chunk in chunks) == "secondary"
+        assert primary.cancelled == 1
+
+    def test_callbacks_reach_the_wrapped_models(self) -> None:
+        """Test that the calls of the wrapped models are reported to callbacks."""
+        recorder = RunRecorder()
+        model = HedgedChatModel(primary=DelayedChatModel(name="primary"))
+
+        model.invoke("Claim", {"callbacks": [recorder], "tags": ["verify"]})
+
+        assert len(recorder.runs) == 2
+        assert "verify" in recorder.runs[1]
+        assert "nostream" in recorder.runs[1]
+
+    @staticmethod
+    async def _collect(chunks: Any) -> list:
+        return [chunk async for chunk in chunks]
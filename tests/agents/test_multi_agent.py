@@ -0,0 +1,420 @@
+"""Tests for the multi_agent module."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+from langchain_core.tools import tool
+
+from agents.cache.verdict_cache import chatbot_fingerprint
+from agents.chatbot.multi_agent import AgentSpec, MultiAgentChatbot
+from agents.chatbot.streaming import AgentEvent
+from agents.models.detector_model import DetectorModel
+
+
+def make_agent(label: str, delay: float = 0.0) -> MagicMock:
+    """Create a mocked agent graph answering with a label after a delay."""
+    result = {
+        "structured_response": DetectorModel(label=label, explanation=f"{label} because"),
+    }
+
+    def invoke(*args, **kwargs) -> dict:
+        time.sleep(delay)
+        return result
+
+    async def ainvoke(*args, **kwargs) -> dict:
+        await asyncio.sleep(delay)
+        return result
+
+    async def astream(*args, **kwargs):
+        yield "messages", (AIMessageChunk(content=f"Thinking about {label}"), {})
+        await asyncio.sleep(delay)
+        yield "values", result
+
+    agent = MagicMock()
+    agent.invoke.side_effect = invoke
+    agent.ainvoke.side_effect = ainvoke
+    agent.astream.side_effect = astream
+    return agent
+
+
+@pytest.fixture
+def build_chatbot():
+    """Create a factory building MultiAgentChatbots on mocked agent graphs."""
+    with patch("agents.chatbot.multi_agent.create_agent") as mock_create_agent, \
+            patch("agents.chatbot.multi_agent.InMemorySaver"):
+
+        def build(
+            agents: list[MagicMock], prompts: list | None = None, **kwargs,
+        ) -> MultiAgentChatbot:
+            mock_create_agent.side_effect = agents
+            return MultiAgentChatbot(
+                model=MagicMock(),
+                prompts=prompts or ["Fact checker", "Bias detector", "Context analyst"],
+                schema=DetectorModel,
+                id_="test-id",
+                **kwargs,
+            )
+
+        build.create_agent = mock_create_agent
+        yield build
+
+
+def make_research_tools(calls: list[str]) -> list:
+    """Create research tools recording the claims they were called with."""
+
+    @tool
+    def retrieve_context(query: str) -> str:
+        """Retrieve information to help answer a query."""
+        calls.append(f"retrieve_context:{query}")
+        return "knowledge base says no"
+
+    @tool
+    def verify_claim_sources(claim: str) -> str:
+        """Search for credible sources to verify a claim."""
+        calls.append(f"verify_claim_sources:{claim}")
+        return "fact checkers say no"
+
+    @tool
+    def web_search(query: str) -> str:
+        """Search the web."""
+        calls.append(f"web_search:{query}")
+        return "web results"
+
+    return [retrieve_context, verify_claim_sources, web_search]
+
+
+class TestMultiAgentChatbot:
+    """Test cases for the MultiAgentChatbot class."""
+
+    def test_chat_runs_agents_concurrently(self, build_chatbot) -> None:
+        """Test that the latency is that of the slowest agent, not the sum."""
+        chatbot = build_chatbot([
+            make_agent("False", 0.2), make_agent("False", 0.2), make_agent("True", 0.2),
+        ])
+
+        start = time.perf_counter()
+        response = chatbot.chat("Test claim")
+        elapsed = time.perf_counter() - start
+
+        assert response.label == "False"
+        assert elapsed < 0.5
+
+    def test_chat_drops_agents_that_time_out(self, build_chatbot) -> None:
+        """Test that a slow agent is left out of the vote."""
+        chatbot = build_chatbot(
+            [make_agent("True", 1.0), make_agent("False"), make_agent("False")],
+            timeout=0.2,
+        )
+
+        start = time.perf_counter()
+        response = chatbot.chat("Test claim")
+
+        assert response.label == "False"
+        assert time.perf_counter() - start < 0.8
+
+    def test_chat_cancels_agents_that_did_not_start(self, build_chatbot) -> None:
+        """Test that agents still queued for a thread at the timeout never run."""
+        queued = [make_agent("False"), make_agent("False")]
+        chatbot = build_chatbot([make_agent("True", 0.4), *queued], timeout=0.1)
+
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                patch("agents.chatbot.multi_agent._executor", executor):
+            with pytest.raises(RuntimeError, match="Failed to get responses"):
+                chatbot.chat("Test claim")
+
+        assert all(agent.invoke.call_count == 0 for agent in queued)
+
+    def test_chat_ignores_failing_agent(self, build_chatbot) -> None:
+        """Test that a failing agent does not abort the consensus."""
+        failing = MagicMock()
+        failing.invoke.side_effect = RuntimeError("boom")
+        chatbot = build_chatbot([failing, make_agent("True"), make_agent("True")])
+
+        assert chatbot.chat("Test claim").label == "True"
+
+    @pytest.mark.asyncio
+    async def test_achat_runs_agents_concurrently(self, build_chatbot) -> None:
+        """Test that the async agents run concurrently and time out."""
+        chatbot = build_chatbot(
+            [make_agent("True", 0.2), make_agent("True", 0.2), make_agent("False", 1.0)],
+            timeout=0.5,
+        )
+
+        start = time.perf_counter()
+        response = await chatbot.achat("Test claim")
+        elapsed = time.perf_counter() - start
+
+        assert response.label == "True"
+        assert elapsed < 0.8
+
+    @pytest.mark.asyncio
+    async def test_quorum_cancels_remaining_agents(self, build_chatbot) -> None:
+        """Test that agents still running after the quorum is reached are cancelled."""
+        slow = make_agent("True", 5.0)
+        chatbot = build_chatbot(
+            [make_agent("False", 0.05), make_agent("False", 0.1), slow], quorum=2,
+        )
+
+        start = time.perf_counter()
+        response = await chatbot.achat("Test claim")
+
+        assert response.label == "False"
+        assert time.perf_counter() - start < 1.0
+        assert chatbot.stats()["quorum_exits"] == 1
+        assert chatbot.stats()["cancelled_agents"] == 1
+
+    @pytest.mark.asyncio
+    async def test_quorum_chat_inside_running_loop(self, build_chatbot) -> None:
+        """Test that sync quorum votes work when an event loop is running."""
+        chatbot = build_chatbot(
+            [make_agent("False", 0.05), make_agent("False", 0.1), make_agent("True", 1.0)],
+            quorum=2,
+        )
+
+        start = time.perf_counter()
+        response = chatbot.chat("Test claim")
+
+        assert response.label == "False"
+        assert time.perf_counter() - start < 0.5
+        assert chatbot.stats()["quorum_exits"] == 1
+
+    def test_quorum_chat_stops_running_agents(self, build_chatbot) -> None:
+        """Test that a sync quorum vote cancels an agent that is already running."""
+        started, cancelled = [], []
+        slow = make_agent("True", 5.0)
+        ainvoke = slow.ainvoke.side_effect
+
+        async def cancellable(*args, **kwargs) -> dict:
+            started.append(True)
+            try:
+                return await ainvoke(*args, **kwargs)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        slow.ainvoke.side_effect = cancellable
+        chatbot = build_chatbot(
+            [make_agent("False", 0.05), make_agent("False", 0.1), slow], quorum=2,
+        )
+
+        start = time.perf_counter()
+        response = chatbot.chat("Test claim")
+
+        assert response.label == "False"
+        assert time.perf_counter() - start < 1.0
+        assert started == cancelled == [True]
+        assert chatbot.stats()["cancelled_agents"] == 1
+
+    def test_quorum_chat_raises_when_no_agent_answers(self, build_chatbot) -> None:
+        """Test that errors of a sync quorum vote reach the caller."""
+        chatbot = build_chatbot(
+            [make_agent("True", 1.0), make_agent("True", 1.0)],
+            prompts=["A", "B"],
+            timeout=0.1,
+            quorum=2,
+        )
+
+        with pytest.raises(RuntimeError, match="Failed to get responses"):
+            chatbot.chat("Test claim")
+
+    def test_quorum_waits_for_tie_breaker(self, build_chatbot) -> None:
+        """Test that all agents vote when the first votes disagree."""
+        chatbot = build_chatbot(
+            [make_agent("False", 0.05), make_agent("True", 0.1), make_agent("True", 0.2)],
+            quorum=2,
+        )
+
+        response = chatbot.chat("Test claim")
+
+        assert response.label == "True"
+        assert chatbot.stats()["cancelled_agents"] == 0
+
+    def test_invalid_quorum_raises_error(self, build_chatbot) -> None:
+        """Test that a quorum larger than the ensemble is rejected."""
+        with pytest.raises(ValueError, match="quorum"):
+            build_chatbot([make_agent("True")] * 3, quorum=4)
+
+    def test_ensemble_of_any_size(self, build_chatbot) -> None:
+        """Test that ensembles are not limited to three agents."""
+        labels = ["True", "False", "False", "True", "True"]
+        chatbot = build_chatbot(
+            [make_agent(label) for label in labels],
+            prompts=[f"Prompt {i}" for i in range(5)],
+        )
+
+        assert len(chatbot.agents) == 5
+        assert chatbot.chat("Test claim").label == "True"
+
+    def test_weighted_vote(self, build_chatbot) -> None:
+        """Test that a heavier agent can outvote lighter ones."""
+        pro_model = MagicMock()
+        chatbot = build_chatbot(
+            [make_agent("False"), make_agent("False"), make_agent("True")],
+            prompts=[
+                AgentSpec("Fact checker"),
+                AgentSpec("Bias detector"),
+                AgentSpec("Context analyst", model=pro_model, weight=3.0),
+            ],
+        )
+
+        assert chatbot.chat("Test claim").label == "True"
+        assert build_chatbot.create_agent.call_args_list[2].args[0] is pro_model
+
+    def test_step_budget_per_agent(self, build_chatbot) -> None:
+        """Test that each agent runs with its own recursion limit."""
+        agents = [make_agent("True") for _ in range(2)]
+        chatbot = build_chatbot(
+            agents, prompts=[AgentSpec("Quick", recursion_limit=10), "Default"],
+        )
+
+        chatbot.chat("Test claim")
+
+        assert agents[0].invoke.call_args.args[1]["recursion_limit"] == 10
+        assert agents[1].invoke.call_args.args[1]["recursion_limit"] == 50
+
+    def test_fingerprint_depends_on_weights(self, build_chatbot) -> None:
+        """Test that reweighting an ensemble changes its cache fingerprint."""
+        equal = build_chatbot(
+            [make_agent("True")] * 2, prompts=[AgentSpec("A"), AgentSpec("B")],
+        )
+        weighted = build_chatbot(
+            [make_agent("True")] * 2, prompts=[AgentSpec("A"), AgentSpec("B", weight=2)],
+        )
+
+        assert chatbot_fingerprint(equal) != chatbot_fingerprint(weighted)
+
+    def test_shared_evidence_gathers_once(self, build_chatbot) -> None:
+        """Test that research runs once and the agents judge it without tools."""
+        calls = []
+        agents = [make_agent("False") for _ in range(3)]
+        chatbot = build_chatbot(
+            agents, tools=make_research_tools(calls), shared_evidence=True,
+        )
+
+        response = chatbot.chat("Vaccines contain microchips")
+
+        assert response.label == "False"
+        assert sorted(calls) == [
+            "retrieve_context:Vaccines contain microchips",
+            "verify_claim_sources:Vaccines contain microchips",
+        ]
+        assert chatbot.stats()["tool_calls"] == 2
+        for call in build_chatbot.create_agent.call_args_list:
+            assert call.kwargs["tools"] == []
+        message = agents[0].invoke.call_args.args[0]["messages"][0]["content"]
+        assert "Vaccines contain microchips" in message
+        assert "knowledge base says no" in message
+        assert "fact checkers say no" in message
+
+    @pytest.mark.asyncio
+    async def test_shared_evidence_async(self, build_chatbot) -> None:
+        """Test that the async path also gathers the evidence once."""
+        calls = []
+        chatbot = build_chatbot(
+            [make_agent("True") for _ in range(3)],
+            tools=make_research_tools(calls),
+            shared_evidence=True,
+            quorum=2,
+        )
+
+        response = await chatbot.achat("Water is wet")
+
+        assert response.label == "True"
+        assert len(calls) == 2
+
+    def test_shared_evidence_requires_research_tools(self, build_chatbot) -> None:
+        """Test that shared evidence mode needs at least one research tool."""
+        with pytest.raises(ValueError, match="shared_evidence"):
+            build_chatbot([make_agent("True")] * 3, shared_evidence=True)
+
+
+class TestMultiAgentStreaming:
+    """Test cases for streaming the MultiAgentChatbot."""
+
+    def test_stream_events_tags_agents(self, build_chatbot) -> None:
+        """Test that all agents stream and the tally grows as they finish."""
+        chatbot = build_chatbot([
+            make_agent("False", 0.1), make_agent("True", 0.2), make_agent("False", 0.3),
+        ])
+
+        events = list(chatbot.stream_events("Test claim"))
+
+        tokens = [event for event in events if event.kind == "token"]
+        votes = [event for event in events if event.kind == "vote"]
+        assert {event.agent for event in tokens} == {1, 2, 3}
+        assert [event.agent for event in votes] == [1, 2, 3]
+        assert votes[0].tally == {"False": 1.0}
+        assert votes[1].tally == {"False": 1.0, "True": 1.0}
+        assert votes[2].tally == {"False": 2.0, "True": 1.0}
+        assert events[-1].kind == "consensus"
+        assert events[-1].text == "False"
+        assert events[-1].response.label == "False"
+
+    def test_stream_events_cancels_agents_when_closed(self, build_chatbot) -> None:
+        """Test that agents stop when the consumer stops reading early."""
+        cancelled = []
+        agents = [make_agent("False", 5.0) for _ in range(3)]
+        for agent in agents:
+            stream = agent.astream.side_effect
+
+            async def astream(*args, stream=stream, **kwargs):
+                try:
+                    async for item in stream(*args, **kwargs):
+                        yield item
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            agent.astream.side_effect = astream
+        chatbot = build_chatbot(agents)
+
+        start = time.perf_counter()
+        events = chatbot.stream_events("Test claim")
+        assert next(events).kind == "token"
+        events.close()
+
+        assert time.perf_counter() - start < 1.0
+        assert len(cancelled) == 3
+
+    def test_stream_chat_yields_text(self, build_chatbot) -> None:
+        """Test that stream_chat reports the vote and the consensus as text."""
+        chatbot = build_chatbot([make_agent("True"), make_agent("True")], prompts=["A", "B"])
+
+        text = "".join(chatbot.stream_chat("Test claim"))
+
+        assert "Agent 1 voted True" in text
+        assert "Agent 2 voted True (tally: True: 2)" in text
+        assert text.endswith("Consensus: True\nTrue because")
+
+    @pytest.mark.asyncio
+    async def test_astream_events_reports_timeouts(self, build_chatbot) -> None:
+        """Test that a slow agent is reported as an error and left out."""
+        chatbot = build_chatbot(
+            [make_agent("True", 1.0), make_agent("False"), make_agent("False")],
+            timeout=0.2,
+        )
+
+        events = [event async for event in chatbot.astream_events("Test claim")]
+
+        assert AgentEvent("error", 1, "TimeoutError()") in events
+        assert events[-1].text == "False"
+        assert events[-1].tally == {"False": 2.0}
+
+    @pytest.mark.asyncio
+    async def test_astream_events_stops_at_quorum(self, build_chatbot) -> None:
+        """Test that streaming cancels the agents still running at quorum."""
+        chatbot = build_chatbot(
+            [make_agent("False", 0.05), make_agent("False", 0.1), make_agent("True", 5.0)],
+            quorum=2,
+        )
+
+        start = time.perf_counter()
+        events = [event async for event in chatbot.astream_events("Test claim")]
+
+        assert time.perf_counter() - start < 1.0
+        assert [event.agent for event in events if event.kind == "vote"] == [1, 2]
+        assert events[-1].text == "False"
+        assert chatbot.stats()["cancelled_agents"] == 1
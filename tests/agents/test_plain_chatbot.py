@@ -0,0 +1,233 @@
+"""Tests for the plain chatbot module."""
+import json
+import time
+from typing import Any
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+from agents.chatbot.llms.prompts.prompts import get_detector_prompt
+from agents.chatbot.plain_chatbot import PlainChatbot
+from agents.models.detector_model import DetectorModel
+
+
+class RecordingChatModel(GenericFakeChatModel):
+    """A fake chat model recording the messages of every call."""
+
+    calls: list = Field(default_factory=list)
+
+    def _generate(self, messages: list[BaseMessage], *args, **kwargs):
+        self.calls.append(messages)
+        return super()._generate(messages, *args, **kwargs)
+
+
+class EchoChatModel(GenericFakeChatModel):
+    """A fake chat model answering with the last message it was sent."""
+
+    messages: object = None
+    max_in_flight: int = 0
+    in_flight: int = 0
+
+    def _generate(self, messages: list[BaseMessage], *args, **kwargs) -> ChatResult:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        self.in_flight -= 1
+        if "fail" in messages[-1].text:
+            msg = "model error"
+            raise RuntimeError(msg)
+        message = AIMessage(content=f"Echo: {messages[-1].text}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class ToolCallStreamingChatModel(BaseChatModel):
+    """A fake chat model answering with a streamed DetectorModel tool call."""
+
+    verdict: dict = {"label": "False", "explanation": "Not supported."}
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-call-streaming"
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> "ToolCallStreamingChatModel":
+        return self
+
+    def _generate(self, messages: list, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message = AIMessage(
+            content="",
+            tool_calls=[{"name": "DetectorModel", "args": self.verdict, "id": "call-1"}],
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: list, stop: Any = None, run_manager: Any = None, **kwargs: Any) -> Any:
+        args = json.dumps(self.verdict)
+        for start in range(0, len(args), 5):
+            chunk = AIMessageChunk(
+                content="",
+                tool_call_chunks=[{
+                    "name": "DetectorModel" if start == 0 else None,
+                    "args": args[start:start + 5],
+                    "id": "call-1" if start == 0 else None,
+                    "index": 0,
+                }],
+            )
+            yield ChatGenerationChunk(message=chunk)
+
+
+class TestPlainChatbot:
+    """Test cases for the PlainChatbot class."""
+
+    @pytest.fixture
+    def fake_model(self) -> GenericFakeChatModel:
+        """Create a fake chat model returning canned responses."""
+        return GenericFakeChatModel(
+            messages=iter([AIMessage(content="First"), AIMessage(content="Second")]),
+        )
+
+    def test_plain_chatbot_chat(self, fake_model, sample_prompt) -> None:
+        """Test that PlainChatbot returns the model's message."""
+        chatbot = PlainChatbot(model=fake_model, prompt=sample_prompt, id_="test-id")
+
+        response = chatbot.chat("Test input")
+
+        assert response.content == "First"
+
+    @pytest.mark.asyncio
+    async def test_plain_chatbot_achat(self, fake_model, sample_prompt) -> None:
+        """Test that PlainChatbot.achat runs the graph asynchronously."""
+        chatbot = PlainChatbot(model=fake_model, prompt=sample_prompt, id_="test-id")
+
+        first = await chatbot.achat("Test input")
+        second = await chatbot.achat("Another input")
+
+        assert first.content == "First"
+        assert second.content == "Second"
+
+    def test_plain_chatbot_stream_chat_yields_text(self, sample_prompt) -> None:
+        """Test that PlainChatbot.stream_chat yields text, not message chunks."""
+        model = GenericFakeChatModel(messages=iter([AIMessage(content="Hello World")]))
+        chatbot = PlainChatbot(model=model, prompt=sample_prompt, id_="test-id")
+
+        chunks = list(chatbot.stream_chat("Test input"))
+
+        assert all(isinstance(chunk, str) for chunk in chunks)
+        assert "".join(chunks) == "Hello World"
+
+    def test_plain_chatbot_stream_chat_with_schema(self, sample_prompt) -> None:
+        """Test that a schema-bound chatbot streams the explanation of its verdict."""
+        chatbot = PlainChatbot(
+            model=ToolCallStreamingChatModel(), prompt=sample_prompt, schema=DetectorModel,
+        )
+
+        chunks = list(chatbot.stream_chat("Test input"))
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == "Not supported."
+
+    @pytest.mark.asyncio
+    async def test_plain_chatbot_astream_chat_with_schema(self, sample_prompt) -> None:
+        """Test that astream_chat streams the explanation of a structured verdict."""
+        chatbot = PlainChatbot(
+            model=ToolCallStreamingChatModel(), prompt=sample_prompt, schema=DetectorModel,
+        )
+
+        chunks = [chunk async for chunk in chatbot.astream_chat("Test input")]
+
+        assert "".join(chunks) == "Not supported."
+
+    def test_plain_chatbot_stream_verdict(self, sample_prompt) -> None:
+        """Test that the label is streamed before the explanation."""
+        model = GenericFakeChatModel(
+            messages=iter([
+                AIMessage(
+                    content='{"label": "False", "explanation": "Not supported."}',
+                ),
+            ]),
+        )
+        chatbot = PlainChatbot(model=model, prompt=sample_prompt, id_="test-id")
+
+        events = list(chatbot.stream_verdict("Test input"))
+
+        assert (events[0].field, events[0].text) == ("label", "False")
+        assert "".join(e.text for e in events[1:]) == "Not supported."
+
+    def test_plain_chatbot_trims_history_by_tokens(self, sample_prompt) -> None:
+        """Test that a long pasted article is dropped from the history by tokens."""
+        model = RecordingChatModel(
+            messages=iter([AIMessage(content="First"), AIMessage(content="Second")]),
+        )
+        chatbot = PlainChatbot(
+            model=model, prompt=sample_prompt, id_="test-id", max_history_tokens=100,
+        )
+
+        chatbot.chat("An article " * 100)
+        chatbot.chat("Short claim")
+
+        sent = " ".join(message.text for message in model.calls[1])
+        assert "Short claim" in sent
+        assert "An article" not in sent
+
+    def test_plain_chatbot_keeps_message_over_budget(self, sample_prompt) -> None:
+        """Test that a single message over the budget is still sent."""
+        model = RecordingChatModel(messages=iter([AIMessage(content="First")]))
+        chatbot = PlainChatbot(
+            model=model, prompt=sample_prompt, id_="test-id", max_history_tokens=10,
+        )
+
+        chatbot.chat("An article " * 100)
+
+        assert "An article" in " ".join(message.text for message in model.calls[0])
+
+    def test_stateless_plain_chatbot_keeps_no_history(self, sample_prompt) -> None:
+        """Test that repeated stateless calls each send only their own claim."""
+        model = RecordingChatModel(
+            messages=iter([AIMessage(content=f"Answer {i}") for i in range(5)]),
+        )
+        chatbot = PlainChatbot(model=model, prompt=sample_prompt, stateless=True)
+
+        for i in range(5):
+            assert chatbot.chat(f"Claim {i}").content == f"Answer {i}"
+
+        assert len({len(messages) for messages in model.calls}) == 1
+        assert "Claim 0" not in " ".join(message.text for message in model.calls[-1])
+        assert chatbot.checkpoint_threads() == []
+        assert chatbot.with_id("session").checkpoint_threads() == []
+
+    def test_plain_chatbot_chat_batch(self) -> None:
+        """Test that a batch is answered in order with bounded concurrency."""
+        model = EchoChatModel()
+        chatbot = PlainChatbot(model=model, prompt=get_detector_prompt(), id_="test-id")
+        claims = [f"Claim {i}" for i in range(8)]
+
+        responses = chatbot.chat_batch(claims, max_concurrency=2)
+
+        assert [response.content for response in responses] == [
+            f"Echo: Claim {i}" for i in range(8)
+        ]
+        assert model.max_in_flight == 2
+        assert chatbot.checkpoint_threads()[0][0].storage == {}
+
+    def test_plain_chatbot_chat_batch_keeps_failures(self) -> None:
+        """Test that a failing claim does not abort the batch."""
+        chatbot = PlainChatbot(model=EchoChatModel(), prompt=get_detector_prompt(), id_="test-id")
+
+        responses = chatbot.chat_batch(["Claim", "fail", "Other claim"])
+
+        assert responses[0].content == "Echo: Claim"
+        assert isinstance(responses[1], RuntimeError)
+        assert responses[2].content == "Echo: Other claim"
+
+    @pytest.mark.asyncio
+    async def test_plain_chatbot_achat_batch(self) -> None:
+        """Test that the async batch answers every claim."""
+        chatbot = PlainChatbot(model=EchoChatModel(), prompt=get_detector_prompt(), id_="test-id")
+
+        responses = await chatbot.achat_batch(["First", "Second"])
+
+        assert [response.content for response in responses] == [
+            "Echo: First", "Echo: Second",
+        ]
@@ -0,0 +1,131 @@
+"""Tests for the priority module."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.chatbot.llms.priority import (
+    Priority,
+    PriorityGate,
+    current_priority,
+    priority_class,
+)
+
+
+class TestPriorityClass:
+    """Test cases for the priority_class context manager."""
+
+    def test_default_priority_is_api(self) -> None:
+        """Test that calls outside of a block belong to the API class."""
+        assert current_priority() is Priority.API
+
+    def test_priority_class_is_restored(self) -> None:
+        """Test that nested blocks restore the outer class on exit."""
+        with priority_class(Priority.BULK):
+            with priority_class(Priority.INTERACTIVE):
+                assert current_priority() is Priority.INTERACTIVE
+            assert current_priority() is Priority.BULK
+        assert current_priority() is Priority.API
+
+    @pytest.mark.asyncio
+    async def test_priority_class_follows_tasks(self) -> None:
+        """Test that tasks and worker threads inherit the class."""
+        with priority_class(Priority.BULK):
+            in_task = await asyncio.create_task(asyncio.sleep(0, current_priority()))
+            in_thread = await asyncio.to_thread(current_priority)
+
+        assert in_task is Priority.BULK
+        assert in_thread is Priority.BULK
+
+
+class TestPriorityGate:
+    """Test cases for the PriorityGate class."""
+
+    def test_limit_applies_to_its_class_only(self) -> None:
+        """Test that a full class does not hold back other classes."""
+        gate = PriorityGate({"bulk": 1})
+        release = threading.Event()
+
+        def bulk_call() -> None:
+            with gate.slot(Priority.BULK):
+                release.wait()
+
+        threads = [threading.Thread(target=bulk_call) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+
+        assert gate.stats()["bulk_in_flight"] == 1
+        assert gate.stats()["bulk_waiting"] == 1
+        with gate.slot(Priority.INTERACTIVE):
+            assert gate.stats()["interactive_in_flight"] == 1
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert gate.stats()["bulk_in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_async_slots_respect_limit(self) -> None:
+        """Test that async calls beyond the limit wait for a slot."""
+        gate = PriorityGate({"bulk": 2})
+        running = 0
+        peak = 0
+
+        async def call() -> None:
+            nonlocal running, peak
+            async with gate.aslot(Priority.BULK):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.02)
+                running -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert gate.stats()["bulk_waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_async_waiter_is_woken_by_release(self) -> None:
+        """Test that a slot released by a thread wakes an async waiter at once."""
+        gate = PriorityGate({"bulk": 1})
+        held, release = threading.Event(), threading.Event()
+
+        def hold() -> None:
+            with gate.slot(Priority.BULK):
+                held.set()
+                release.wait()
+
+        async def acquire() -> float:
+            async with gate.aslot(Priority.BULK):
+                return time.perf_counter()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        waiter = asyncio.ensure_future(acquire())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        released = time.perf_counter()
+        release.set()
+        acquired = await asyncio.wait_for(waiter, 1.0)
+        thread.join()
+
+        assert acquired - released < 0.02
+        assert gate.stats()["bulk_waiting"] == 0
+
+    def test_slot_uses_current_priority(self) -> None:
+        """Test that the class defaults to the one of the context."""
+        gate = PriorityGate({})
+
+        with priority_class(Priority.BULK), gate.slot():
+            assert gate.stats()["bulk_in_flight"] == 1
+
+    def test_invalid_limits_raise_error(self) -> None:
+        """Test that unknown classes and non-positive limits are rejected."""
+        with pytest.raises(ValueError, match="Unknown priority class"):
+            PriorityGate({"batch": 1})
+        with pytest.raises(ValueError, match="at least 1"):
+            PriorityGate({"bulk": 0})
@@ -0,0 +1,160 @@
+"""Tests for the rate_limiter module."""
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from agents.chatbot.llms.priority import Priority, priority_class
+from agents.chatbot.llms.rate_limiter import ProviderRateLimiter, get_rate_limiter
+
+
+def drained(limiter: ProviderRateLimiter) -> ProviderRateLimiter:
+    """Empty the request bucket of a limiter."""
+    limiter.requests.level = 0
+    return limiter
+
+
+class TestProviderRateLimiter:
+    """Test cases for the ProviderRateLimiter class."""
+
+    def test_requests_per_minute_are_enforced(self) -> None:
+        """Test that requests beyond the budget wait for the refill."""
+        limiter = drained(ProviderRateLimiter(requests_per_minute=600))
+
+        assert limiter.acquire(blocking=False) is False
+        start = time.perf_counter()
+        assert limiter.acquire() is True
+        assert time.perf_counter() - start >= 0.08
+
+    def test_token_debt_delays_requests(self) -> None:
+        """Test that requests wait while the token budget is overspent."""
+        limiter = ProviderRateLimiter(requests_per_minute=6_000, tokens_per_minute=6_000)
+
+        limiter.record_usage(6_010)
+        start = time.perf_counter()
+        limiter.acquire()
+
+        assert time.perf_counter() - start >= 0.08
+        assert limiter.stats()["tokens"] == 6_010
+
+    def test_waiting_requests_are_served_in_order(self) -> None:
+        """Test that queued requests are admitted first in, first out."""
+        limiter = drained(ProviderRateLimiter(requests_per_minute=600))
+        admitted = []
+
+        def request(number: int) -> None:
+            limiter.acquire()
+            admitted.append(number)
+
+        threads = []
+        for number in range(3):
+            threads.append(threading.Thread(target=request, args=(number,)))
+            threads[-1].start()
+            time.sleep(0.01)
+        assert limiter.stats()["queue_depth"] == 3
+        for thread in threads:
+            thread.join()
+
+        assert admitted == [0, 1, 2]
+        assert limiter.stats()["queue_depth"] == 0
+        assert limiter.stats()["max_wait"] > 0
+
+    @pytest.mark.asyncio
+    async def test_async_waiting_requests_are_served_in_order(self) -> None:
+        """Test that queued async requests are admitted first in, first out."""
+        limiter = drained(ProviderRateLimiter(requests_per_minute=600))
+        admitted = []
+
+        async def request(number: int) -> None:
+            await limiter.aacquire()
+            admitted.append(number)
+
+        await asyncio.wait_for(asyncio.gather(*(request(n) for n in range(3))), 1.0)
+
+        assert admitted == [0, 1, 2]
+        assert limiter.stats()["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self) -> None:
+        """Test that a cancelled request does not block the ones behind it."""
+        limiter = drained(ProviderRateLimiter(requests_per_minute=600))
+        waiter = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0.01)
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert await asyncio.wait_for(limiter.aacquire(), 1.0) is True
+        assert limiter.stats()["queue_depth"] == 0
+
+    def test_interactive_requests_overtake_bulk(self) -> None:
+        """Test that a higher class is served before lower ones queued earlier."""
+        limiter = drained(ProviderRateLimiter(requests_per_minute=600, reserve={}))
+        admitted = []
+
+        def request(priority: Priority) -> None:
+            with priority_class(priority):
+                limiter.acquire()
+            admitted.append(priority)
+
+        threads = []
+        for priority in (Priority.BULK, Priority.BULK, Priority.INTERACTIVE):
+            threads.append(threading.Thread(target=request, args=(priority,)))
+            threads[-1].start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+
+        assert admitted == [Priority.INTERACTIVE, Priority.BULK, Priority.BULK]
+        assert limiter.stats()["interactive_requests"] == 1
+        assert limiter.stats()["bulk_requests"] == 2
+
+    def test_bulk_requests_leave_reserve(self) -> None:
+        """Test that bulk requests do not spend the reserved budget."""
+        limiter = ProviderRateLimiter(requests_per_minute=10, reserve={"bulk": 0.5})
+        limiter.requests.level = 5
+
+        with priority_class(Priority.BULK):
+            assert limiter.acquire(blocking=False) is False
+        assert limiter.acquire(blocking=False) is True
+
+    def test_usage_callback_charges_tokens(self) -> None:
+        """Test that the token usage reported by the model is charged."""
+        limiter = ProviderRateLimiter(requests_per_minute=60, tokens_per_minute=1_000)
+        message = AIMessage(
+            content="Answer",
+            usage_metadata={"input_tokens": 20, "output_tokens": 10, "total_tokens": 30},
+        )
+
+        limiter.usage_callback.on_llm_end(
+            LLMResult(generations=[[ChatGeneration(message=message)]]),
+        )
+
+        assert limiter.stats()["tokens"] == 30
+
+    def test_chat_model_acquires_budget(self) -> None:
+        """Test that a chat model with the limiter takes a request per call."""
+        limiter = ProviderRateLimiter(requests_per_minute=60)
+        model = GenericFakeChatModel(
+            messages=iter([AIMessage(content="Answer")]), rate_limiter=limiter,
+        )
+
+        model.invoke("Claim")
+
+        assert limiter.stats()["requests"] == 1
+
+    def test_invalid_budget_raises_error(self) -> None:
+        """Test that budgets must be positive."""
+        with pytest.raises(ValueError, match="requests_per_minute"):
+            ProviderRateLimiter(requests_per_minute=0)
+        with pytest.raises(ValueError, match="reserve"):
+            ProviderRateLimiter(requests_per_minute=60, reserve={"bulk": 1.0})
+
+    def test_limiter_is_shared_per_provider(self) -> None:
+        """Test that all models of a provider share one limiter."""
+        assert get_rate_limiter("google") is get_rate_limiter("google")
+        assert get_rate_limiter("unknown") is None
@@ -0,0 +1,118 @@
+"""Tests for the semantic_cache module."""
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from agents.cache.semantic_cache import SemanticVerdictCache
+from agents.models.detector_model import DetectorModel
+
+
+class BagOfWordsEmbeddings(Embeddings):
+    """Embed text as word counts over a fixed vocabulary."""
+
+    vocabulary = ["vaccines", "cause", "autism", "moon", "landing", "fake", "do"]
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls += 1
+        words = text.split()
+        return [float(words.count(word)) for word in self.vocabulary]
+
+
+@pytest.fixture
+def chatbot() -> MagicMock:
+    """Create a mock chatbot with a structured output schema."""
+    chatbot = MagicMock()
+    chatbot.model.model = "gemini-2.5-flash"
+    chatbot.prompt = "Test prompt"
+    chatbot.prompts = None
+    chatbot.tools = []
+    chatbot.schema = DetectorModel
+    return chatbot
+
+
+class TestSemanticVerdictCache:
+    """Test cases for the SemanticVerdictCache class."""
+
+    def test_paraphrase_hits(self, chatbot) -> None:
+        """Test that a near-duplicate claim returns the cached verdict."""
+        cache = SemanticVerdictCache(BagOfWordsEmbeddings(), threshold=0.8)
+        verdict = DetectorModel(label="False", explanation="No link found")
+        cache.put(chatbot, "vaccines cause autism", verdict)
+
+        cached = cache.get(chatbot, "do vaccines cause autism")
+
+        assert cached == verdict
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert len(stats["hit_similarities"]) == 1
+        assert 0.8 <= stats["hit_similarities"][0] < 1.0
+
+    def test_unrelated_claim_misses(self, chatbot) -> None:
+        """Test that a dissimilar claim falls back to the chatbot."""
+        cache = SemanticVerdictCache(BagOfWordsEmbeddings(), threshold=0.8)
+        cache.put(chatbot, "vaccines cause autism", "verdict")
+
+        assert cache.get(chatbot, "moon landing fake") is None
+        assert cache.stats()["hit_rate"] == 0.0
+
+    def test_other_configuration_misses(self, chatbot) -> None:
+        """Test that verdicts are not shared between chatbot configurations."""
+        cache = SemanticVerdictCache(BagOfWordsEmbeddings(), threshold=0.8)
+        cache.put(chatbot, "vaccines cause autism", "verdict")
+        other = MagicMock()
+        other.model.model = "gemini-2.5-pro"
+        other.prompt = "Test prompt"
+        other.prompts = None
+        other.tools = []
+
+        assert cache.get(other, "vaccines cause autism") is None
+
+    def test_miss_then_put_embeds_once(self, chatbot) -> None:
+        """Test that a miss followed by a put reuses the claim embedding."""
+        embeddings = BagOfWordsEmbeddings()
+        cache = SemanticVerdictCache(embeddings, threshold=0.8)
+
+        cache.get(chatbot, "vaccines cause autism")
+        cache.put(chatbot, "vaccines cause autism", "verdict")
+
+        assert embeddings.calls == 1
+
+    def test_max_size_drops_oldest(self, chatbot) -> None:
+        """Test that the oldest verified claims are dropped first."""
+        cache = SemanticVerdictCache(BagOfWordsEmbeddings(), threshold=0.99, max_size=1)
+        cache.put(chatbot, "vaccines cause autism", "first")
+        cache.put(chatbot, "moon landing fake", "second")
+
+        assert cache.get(chatbot, "vaccines cause autism") is None
+        assert cache.get(chatbot, "moon landing fake") == "second"
+
+    def test_puts_do_not_rebuild_the_matrix(self, chatbot) -> None:
+        """Test that stores write in place instead of rebuilding the vectors."""
+        cache = SemanticVerdictCache(BagOfWordsEmbeddings(), threshold=0.99, max_size=64)
+        words = BagOfWordsEmbeddings.vocabulary
+
+        for i in range(1_000):
+            claim = " ".join(words[j] for j in range(len(words)) if (i + 1) >> j & 1)
+            cache.get(chatbot, claim)
+            cache.put(chatbot, claim, f"verdict {i}")
+
+        partition = next(iter(cache._partitions.values()))
+        assert partition.resizes <= 3
+        assert partition.size == 64
+        assert cache.stats()["size"] == 64
+
+    def test_invalidate(self, chatbot) -> None:
+        """Test that invalidation drops the configuration's verdicts."""
+        cache = SemanticVerdictCache(BagOfWordsEmbeddings(), threshold=0.8)
+        cache.put(chatbot, "vaccines cause autism", "verdict")
+
+        cache.invalidate(chatbot)
+
+        assert cache.get(chatbot, "vaccines cause autism") is None
@@ -0,0 +1,151 @@
+"""Tests for the session_manager module."""
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from agents.chatbot.plain_chatbot import PlainChatbot
+from agents.chatbot.session_manager import (
+    SessionManager,
+    _sweeper,
+    checkpoint_sizes,
+)
+
+
+def wait_for_sweeps() -> None:
+    """Wait until the sweeps scheduled so far have finished."""
+    _sweeper.submit(lambda: None).result()
+
+
+@pytest.fixture
+def chatbot(sample_prompt) -> PlainChatbot:
+    """Create a PlainChatbot answering with canned messages."""
+    model = GenericFakeChatModel(
+        messages=iter([AIMessage(content=f"Answer {i}") for i in range(10)]),
+    )
+    return PlainChatbot(model=model, prompt=sample_prompt)
+
+
+class TestSessionManager:
+    """Test cases for the SessionManager class."""
+
+    def test_chatbots_get_unique_default_ids(self, sample_prompt) -> None:
+        """Test that chatbots created without an id do not share a thread."""
+        model = GenericFakeChatModel(messages=iter([]))
+
+        first = PlainChatbot(model=model, prompt=sample_prompt)
+        second = PlainChatbot(model=model, prompt=sample_prompt)
+
+        assert first.id != second.id
+
+    def test_open_issues_session_ids(self, chatbot) -> None:
+        """Test that each opened session gets its own conversation id."""
+        manager = SessionManager()
+
+        first = manager.open(chatbot)
+        second = manager.open(chatbot)
+
+        assert first.id != second.id
+        assert first.id in manager
+        assert second.id in manager
+        assert manager.open(chatbot, first.id) is first
+
+    def test_idle_session_is_deleted(self, chatbot) -> None:
+        """Test that sessions idle for longer than the TTL lose their history."""
+        manager = SessionManager(ttl=60)
+        with patch("agents.chatbot.session_manager.time.monotonic", return_value=0):
+            idle = manager.open(chatbot, "idle")
+            idle.chat("First claim")
+        assert checkpoint_sizes(chatbot.memory)["idle"] > 0
+
+        with patch("agents.chatbot.session_manager.time.monotonic", return_value=61):
+            manager.open(chatbot, "active")
+            wait_for_sweeps()
+
+        assert "idle" not in manager
+        assert "idle" not in checkpoint_sizes(chatbot.memory)
+        assert manager.stats()["expired"] == 1
+
+    def test_least_recently_used_session_is_evicted(self, chatbot) -> None:
+        """Test that the session limit evicts the least recently used one."""
+        manager = SessionManager(max_sessions=2)
+
+        manager.open(chatbot, "a")
+        manager.open(chatbot, "b")
+        manager.touch("a")
+        manager.open(chatbot, "c")
+        wait_for_sweeps()
+
+        assert "a" in manager
+        assert "b" not in manager
+        assert "c" in manager
+        assert manager.stats()["evicted"] == 1
+
+    def test_memory_limit_evicts_sessions(self, chatbot) -> None:
+        """Test that sessions are evicted when their history is too large."""
+        manager = SessionManager(max_memory_bytes=1, sweep_interval=0)
+
+        manager.open(chatbot, "old").chat("First claim")
+        manager.open(chatbot, "new").chat("Second claim")
+        manager.touch("new")
+        wait_for_sweeps()
+
+        assert "old" not in manager
+        assert "new" in manager
+        assert "old" not in checkpoint_sizes(chatbot.memory)
+
+    def test_touch_measures_memory_once_per_interval(self, chatbot) -> None:
+        """Test that touching sessions under the limits does not size them."""
+        manager = SessionManager(sweep_interval=60)
+        for session_id in ("a", "b", "c"):
+            manager.open(chatbot, session_id)
+
+        with patch.object(manager, "memory_usage", wraps=manager.memory_usage) as usage:
+            for _ in range(100):
+                manager.touch("a")
+            wait_for_sweeps()
+
+        assert usage.call_count == 0
+        assert len(manager) == 3
+
+    def test_touch_does_not_wait_for_sweep(self, chatbot) -> None:
+        """Test that a slow sweep runs in the background, not in touch."""
+        manager = SessionManager(sweep_interval=0)
+        manager.open(chatbot, "session")
+        wait_for_sweeps()
+
+        def slow_usage() -> dict[str, int]:
+            time.sleep(0.3)
+            return {}
+
+        with patch.object(manager, "memory_usage", side_effect=slow_usage) as usage:
+            start = time.perf_counter()
+            manager.touch("session")
+            elapsed = time.perf_counter() - start
+            wait_for_sweeps()
+
+        assert elapsed < 0.1
+        assert usage.call_count == 1
+
+    def test_close_deletes_history(self, chatbot) -> None:
+        """Test that closing a session deletes its checkpoints."""
+        manager = SessionManager()
+        session = manager.open(chatbot, "closed")
+        session.chat("A claim")
+
+        manager.close("closed")
+
+        assert len(manager) == 0
+        assert "closed" not in checkpoint_sizes(chatbot.memory)
+
+    def test_stats_report_memory_usage(self, chatbot) -> None:
+        """Test that stats include the estimated checkpoint memory."""
+        manager = SessionManager()
+        manager.open(chatbot, "session").chat("A claim")
+
+        stats = manager.stats()
+
+        assert stats["sessions"] == 1
+        assert stats["memory_bytes"] == manager.memory_usage()["session"] > 0
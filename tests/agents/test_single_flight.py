@@ -0,0 +1,180 @@
+"""Tests for the single_flight module."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from agents.agent_api import _coalescing_key, get_response
+from agents.cache.single_flight import SingleFlight
+from agents.chatbot.plain_chatbot import PlainChatbot
+
+
+class TestSingleFlight:
+    """Test cases for the SingleFlight class."""
+
+    def test_do_coalesces_concurrent_calls(self) -> None:
+        """Test that concurrent calls with one key share one execution."""
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = 0
+
+        def slow() -> str:
+            nonlocal calls
+            calls += 1
+            started.set()
+            release.wait()
+            return "verdict"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(single_flight.do, "key", slow)
+            started.wait()
+            followers = [executor.submit(single_flight.do, "key", slow) for _ in range(4)]
+            while single_flight.coalesced < 4:
+                time.sleep(0.001)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["verdict"] * 5
+        assert calls == 1
+        assert single_flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_do_shares_errors_and_forgets_key(self) -> None:
+        """Test that errors reach the caller and the key is not cached."""
+        single_flight = SingleFlight()
+
+        with pytest.raises(RuntimeError, match="boom"):
+            single_flight.do("key", MagicMock(side_effect=RuntimeError("boom")))
+
+        assert single_flight.do("key", lambda: "retried") == "retried"
+
+    @pytest.mark.asyncio
+    async def test_ado_coalesces_concurrent_calls(self) -> None:
+        """Test that concurrent coroutines with one key share one execution."""
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def slow() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "verdict"
+
+        results = await asyncio.gather(
+            *(single_flight.ado("key", slow) for _ in range(5)),
+        )
+
+        assert results == ["verdict"] * 5
+        assert calls == 1
+
+    def test_ado_in_separate_event_loops(self) -> None:
+        """Test that concurrent calls from two event loops do not share tasks."""
+        single_flight = SingleFlight()
+        barrier = threading.Barrier(2)
+
+        async def call() -> str:
+            await asyncio.sleep(0.02)
+            return "verdict"
+
+        def run() -> str:
+            barrier.wait()
+            return asyncio.run(single_flight.ado("key", call))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda _: run(), range(2)))
+
+        assert results == ["verdict"] * 2
+        assert single_flight.stats()["executions"] == 2
+        assert single_flight.stats()["in_flight"] == 0
+
+    def test_stream_late_subscriber_replays_chunks(self) -> None:
+        """Test that a late stream subscriber receives all chunks."""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        streams = 0
+
+        def produce():
+            nonlocal streams
+            streams += 1
+            yield "Hello"
+            release.wait()
+            yield " World"
+
+        first = single_flight.stream("key", produce)
+        assert next(first) == "Hello"
+        second = single_flight.stream("key", produce)
+        assert next(second) == "Hello"
+        release.set()
+
+        assert list(first) == [" World"]
+        assert list(second) == [" World"]
+        assert streams == 1
+
+    @pytest.mark.asyncio
+    async def test_astream_coalesces_subscribers(self) -> None:
+        """Test that concurrent async subscribers share one stream."""
+        single_flight = SingleFlight()
+        streams = 0
+
+        async def produce():
+            nonlocal streams
+            streams += 1
+            for chunk in ["a", "b", "c"]:
+                await asyncio.sleep(0)
+                yield chunk
+
+        async def collect() -> list[str]:
+            return [chunk async for chunk in single_flight.astream("key", produce)]
+
+        results = await asyncio.gather(collect(), collect())
+
+        assert results == [["a", "b", "c"], ["a", "b", "c"]]
+        assert streams == 1
+
+
+class TestGetResponseCoalescing:
+    """Test cases for get_response with request coalescing."""
+
+    def test_get_response_coalesce(self) -> None:
+        """Test that identical concurrent requests run the chatbot once."""
+        release = threading.Event()
+        chatbot = MagicMock()
+        chatbot.model.model = "gemini-2.5-flash"
+        chatbot.prompt = "Test prompt"
+        chatbot.prompts = None
+        chatbot.tools = []
+
+        def chat(user_input: str) -> str:
+            release.wait()
+            return "verdict"
+
+        chatbot.chat.side_effect = chat
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(get_response, chatbot, claim, coalesce=True)
+                for claim in ["Viral claim", "viral  claim", "VIRAL CLAIM"]
+            ]
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ["verdict"] * 3
+        chatbot.chat.assert_called_once()
+
+    def test_stateful_sessions_are_not_merged(self, sample_prompt) -> None:
+        """Test that one claim sent to two conversations is answered twice."""
+        chatbot = PlainChatbot(
+            model=GenericFakeChatModel(messages=iter([AIMessage("verdict")])),
+            prompt=sample_prompt,
+        )
+
+        first = _coalescing_key(chatbot.with_id("first"), "Viral claim")
+        second = _coalescing_key(chatbot.with_id("second"), "Viral claim")
+
+        assert first != second
@@ -0,0 +1,108 @@
+"""Tests for the streaming module."""
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from agents.chatbot.streaming import VerdictEvent, VerdictStreamParser, verdict_events
+from agents.models.detector_model import DetectorModel
+
+VERDICT = '{"label": "False", "explanation": "The claim is not supported."}'
+
+
+def tool_chunks(text: str, name: str = "DetectorModel", size: int = 5) -> list:
+    """Split a tool call into streamed chunks carrying its arguments."""
+    return [
+        AIMessageChunk(
+            content="",
+            id="run-1",
+            tool_call_chunks=[{
+                "name": name if start == 0 else None,
+                "args": text[start:start + size],
+                "id": "call-1" if start == 0 else None,
+                "index": 0,
+            }],
+        )
+        for start in range(0, len(text), size)
+    ]
+
+
+class TestVerdictStreamParser:
+    """Test cases for the VerdictStreamParser class."""
+
+    def test_label_is_emitted_before_explanation_ends(self) -> None:
+        """Test that the label is emitted once the explanation starts."""
+        parser = VerdictStreamParser(DetectorModel)
+        chunks = tool_chunks(VERDICT)
+        label_position = None
+        events = []
+        for position, chunk in enumerate(chunks):
+            new_events = parser.feed(chunk)
+            if label_position is None and any(e.field == "label" for e in new_events):
+                label_position = position
+            events += new_events
+        events += parser.close()
+
+        assert events[0] == VerdictEvent("label", "False")
+        assert label_position < len(chunks) // 2
+        assert "".join(e.text for e in events[1:]) == "The claim is not supported."
+        assert all(e.field == "explanation" for e in events[1:])
+
+    def test_parses_json_content(self) -> None:
+        """Test that verdicts given as fenced JSON text are parsed."""
+        parser = VerdictStreamParser(DetectorModel)
+        text = f"```json\n{VERDICT}\n```"
+
+        events = []
+        for start in range(0, len(text), 7):
+            events += parser.feed(AIMessageChunk(content=text[start:start + 7], id="run-1"))
+        events += parser.close()
+
+        assert events[0] == VerdictEvent("label", "False")
+        assert "".join(e.text for e in events[1:]) == "The claim is not supported."
+
+    def test_ignores_other_tool_calls(self) -> None:
+        """Test that arguments of research tools are not taken as the verdict."""
+        parser = VerdictStreamParser(DetectorModel)
+
+        events = []
+        for chunk in tool_chunks('{"label": "query"}', name="web_search"):
+            events += parser.feed(chunk)
+        events += parser.close()
+
+        assert events == []
+
+    def test_uses_complete_message_when_not_streamed(self) -> None:
+        """Test that a model which does not stream still yields a verdict."""
+        parser = VerdictStreamParser(DetectorModel)
+        message = AIMessage(
+            content="",
+            tool_calls=[{
+                "name": "DetectorModel",
+                "args": {"label": "True", "explanation": "Confirmed."},
+                "id": "call-1",
+            }],
+        )
+
+        events = parser.feed(message) + parser.close()
+
+        assert events == [
+            VerdictEvent("label", "True"),
+            VerdictEvent("explanation", "Confirmed."),
+        ]
+
+
+class TestVerdictEvents:
+    """Test cases for the verdict_events function."""
+
+    def test_verdict_events_from_model(self) -> None:
+        """Test that a complete verdict is split into events."""
+        response = DetectorModel(label="True", explanation="Confirmed.")
+
+        assert list(verdict_events(response)) == [
+            VerdictEvent("label", "True"),
+            VerdictEvent("explanation", "Confirmed."),
+        ]
+
+    def test_verdict_events_from_plain_text(self) -> None:
+        """Test that text that is not a verdict becomes the explanation."""
+        assert list(verdict_events(AIMessage(content="No idea."))) == [
+            VerdictEvent("explanation", "No idea."),
+        ]
@@ -0,0 +1,59 @@
+"""Tests for the token_counter module."""
+from unittest.mock import MagicMock
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import HumanMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from agents.chatbot.llms.token_counter import MessageTokenCounter, get_token_counter
+
+
+class TestMessageTokenCounter:
+    """Test cases for the MessageTokenCounter class."""
+
+    def test_counts_are_memoized_per_message(self) -> None:
+        """Test that only new messages are tokenized on the next turn."""
+        tokenizer = MagicMock(side_effect=count_tokens_approximately)
+        counter = MessageTokenCounter(tokenizer)
+        history = [HumanMessage(content="First claim", id="1")]
+
+        first = counter(history)
+        history.append(HumanMessage(content="Second claim", id="2"))
+        second = counter(history)
+
+        assert second == first + count_tokens_approximately(history[1:])
+        assert tokenizer.call_count == 2
+
+    def test_messages_without_id_are_not_cached(self) -> None:
+        """Test that messages without an id cannot share a cached count."""
+        tokenizer = MagicMock(return_value=5)
+        counter = MessageTokenCounter(tokenizer)
+
+        counter([HumanMessage(content="Claim")])
+        counter([HumanMessage(content="Claim")])
+
+        assert tokenizer.call_count == 2
+
+
+class TestGetTokenCounter:
+    """Test cases for the get_token_counter function."""
+
+    def test_estimate_depends_on_provider(self) -> None:
+        """Test that providers with denser tokenizers are estimated higher."""
+        message = [HumanMessage(content="word " * 200)]
+        google = get_token_counter(ChatGoogleGenerativeAI(model="gemini-2.5-flash"))
+        anthropic = get_token_counter(
+            ChatAnthropic(model_name="claude-3-7-sonnet-latest", api_key="test-key"),
+        )
+
+        assert google(message) == count_tokens_approximately(message, chars_per_token=4.0)
+        assert anthropic(message) > google(message)
+
+    def test_unknown_provider_uses_default_estimate(self) -> None:
+        """Test that unknown models fall back to the character estimate."""
+        counter = get_token_counter(GenericFakeChatModel(messages=iter([])))
+        message = [HumanMessage(content="word " * 200)]
+
+        assert counter(message) == count_tokens_approximately(message)
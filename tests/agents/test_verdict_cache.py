@@ -0,0 +1,138 @@
+"""Tests for the verdict_cache module."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from agents.agent_api import get_response
+from agents.cache.verdict_cache import VerdictCache, chatbot_fingerprint, normalize_claim
+from agents.models.detector_model import DetectorModel
+
+
+@pytest.fixture
+def chatbot() -> MagicMock:
+    """Create a mock chatbot with a structured output schema."""
+    chatbot = MagicMock()
+    chatbot.model.model = "gemini-2.5-flash"
+    chatbot.prompt = "Test prompt"
+    chatbot.prompts = None
+    chatbot.tools = []
+    chatbot.schema = DetectorModel
+    return chatbot
+
+
+class TestNormalizeClaim:
+    """Test cases for the normalize_claim function."""
+
+    def test_normalize_claim(self) -> None:
+        """Test that case and whitespace differences are ignored."""
+        assert normalize_claim("  The Earth\tis  FLAT ") == "the earth is flat"
+
+
+class TestChatbotFingerprint:
+    """Test cases for the chatbot_fingerprint function."""
+
+    def test_fingerprint_changes_with_prompt(self, chatbot) -> None:
+        """Test that changing the prompt changes the fingerprint."""
+        before = chatbot_fingerprint(chatbot)
+        chatbot.prompt = "Another prompt"
+
+        assert chatbot_fingerprint(chatbot) != before
+
+    def test_fingerprint_changes_with_model(self, chatbot) -> None:
+        """Test that changing the model changes the fingerprint."""
+        before = chatbot_fingerprint(chatbot)
+        chatbot.model.model = "gemini-2.5-pro"
+
+        assert chatbot_fingerprint(chatbot) != before
+
+
+class TestVerdictCache:
+    """Test cases for the VerdictCache class."""
+
+    def test_put_and_get_structured_verdict(self, chatbot) -> None:
+        """Test that a structured verdict round-trips through the cache."""
+        cache = VerdictCache(max_size=10, ttl=60)
+        verdict = DetectorModel(label="False", explanation="Debunked")
+
+        assert cache.get(chatbot, "The Earth is flat") is None
+        cache.put(chatbot, "The Earth is flat", verdict)
+
+        assert cache.get(chatbot, "the earth  is flat") == verdict
+        assert cache.stats()["memory_hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_message_verdict_round_trip(self, chatbot) -> None:
+        """Test that message verdicts are returned as AI messages."""
+        cache = VerdictCache(max_size=10, ttl=60)
+        cache.put(chatbot, "claim", AIMessage(content='{"label": "True"}'))
+
+        cached = cache.get(chatbot, "claim")
+
+        assert isinstance(cached, AIMessage)
+        assert cached.content == '{"label": "True"}'
+
+    def test_expired_verdict_is_a_miss(self, chatbot) -> None:
+        """Test that verdicts older than the TTL are not returned."""
+        cache = VerdictCache(max_size=10, ttl=60)
+        with patch("agents.cache.verdict_cache.time.time", return_value=1000.0):
+            cache.put(chatbot, "claim", "verdict")
+        with patch("agents.cache.verdict_cache.time.time", return_value=1061.0):
+            assert cache.get(chatbot, "claim") is None
+
+    def test_lru_eviction(self, chatbot) -> None:
+        """Test that the least recently used verdict is evicted."""
+        cache = VerdictCache(max_size=2, ttl=60)
+        cache.put(chatbot, "a", "A")
+        cache.put(chatbot, "b", "B")
+        cache.get(chatbot, "a")
+        cache.put(chatbot, "c", "C")
+
+        assert cache.get(chatbot, "b") is None
+        assert cache.get(chatbot, "a") == "A"
+
+    def test_disk_tier_survives_restart(self, chatbot, tmp_path) -> None:
+        """Test that verdicts are read back from SQLite by a new cache."""
+        db_path = tmp_path / "cache.sqlite"
+        VerdictCache(max_size=10, ttl=60, db_path=db_path).put(
+            chatbot, "claim", DetectorModel(label="True", explanation="ok"),
+        )
+
+        cache = VerdictCache(max_size=10, ttl=60, db_path=db_path)
+
+        assert cache.get(chatbot, "claim").label == "True"
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.get(chatbot, "claim").label == "True"
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_invalidate_chatbot(self, chatbot, tmp_path) -> None:
+        """Test that invalidation drops verdicts of one configuration only."""
+        other = MagicMock()
+        other.model.model = "gemini-2.5-pro"
+        other.prompt = "Test prompt"
+        other.prompts = None
+        other.tools = []
+        cache = VerdictCache(max_size=10, ttl=60, db_path=tmp_path / "cache.sqlite")
+        cache.put(chatbot, "claim", "first")
+        cache.put(other, "claim", "second")
+
+        cache.invalidate(chatbot)
+
+        assert cache.get(chatbot, "claim") is None
+        assert cache.get(other, "claim") == "second"
+
+
+class TestGetResponseWithCache:
+    """Test cases for get_response with a verdict cache."""
+
+    def test_get_response_uses_cache(self, chatbot) -> None:
+        """Test that a cached verdict skips the chatbot."""
+        cache = VerdictCache(max_size=10, ttl=60)
+        chatbot.chat.return_value = DetectorModel(label="True", explanation="ok")
+
+        first = get_response(chatbot, "claim", cache=cache)
+        second = get_response(chatbot, "Claim", cache=cache)
+
+        assert first == second
+        chatbot.chat.assert_called_once_with("claim")
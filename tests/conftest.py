@@ -7,10 +7,20 @@ import pytest
 from langchain_core.messages import AIMessage
 from langchain_core.prompts import ChatPromptTemplate
 
+from agents.chatbot.llms.client_registry import client_registry
+
 os.environ["GOOGLE_API_KEY"] = "test-google-api-key"
 os.environ["OPENAI_API_KEY"] = "test-openai-api-key"
 
 
+@pytest.fixture(autouse=True)
+def clear_client_registry() -> None:
+    """Keep shared model clients from leaking between tests."""
+    client_registry.clear()
+    yield
+    client_registry.clear()
+
+
 @pytest.fixture
 def mock_google_api_key() -> None:
     original_key = os.environ.get("GOOGLE_API_KEY")